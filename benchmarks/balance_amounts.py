@@ -0,0 +1,82 @@
+"""Compare Decimal and integer cents arithmetic in balance hot loops.
+
+Run with `poetry run python benchmarks/balance_amounts.py`.
+"""
+import random
+import timeit
+from decimal import Decimal
+from functools import partial
+
+from wallet.core.ledger import MonthLedger
+from wallet.core.tools import to_cents
+
+
+OPERATIONS = 50_000
+MONTHS = 120
+REPEAT = 5
+
+
+def generate(seed: int = 42):
+    rnd = random.Random(seed)
+
+    for _ in range(OPERATIONS):
+        amount = Decimal(rnd.randint(1, 10_000_000)).scaleb(-2)
+        yield rnd.randrange(MONTHS), amount, rnd.random() > 0.7
+
+
+def register(operations) -> None:
+    ledger = MonthLedger(opening=operations[0][1] * 0)
+
+    for month, amount, income in operations:
+        if income:
+            ledger.register(month, incomes=amount)
+        else:
+            ledger.register(month, expenses=amount)
+
+    list(ledger.months())
+
+
+def register_many(operations) -> None:
+    zero = operations[0][1] * 0
+    changes = {}
+
+    for month, amount, income in operations:
+        incomes, expenses = changes.get(month, (zero, zero))
+        if income:
+            incomes += amount
+        else:
+            expenses += amount
+        changes[month] = (incomes, expenses)
+
+    ledger = MonthLedger(opening=zero)
+    ledger.register_many(changes)
+
+    list(ledger.months())
+
+
+def total(operations) -> None:
+    rest = operations[0][1] * 0
+
+    for _, amount, income in operations:
+        rest = rest + amount if income else rest - amount
+
+
+def main() -> None:
+    decimals = list(generate())
+    cents = [(month, to_cents(amount), income) for month, amount, income in decimals]
+
+    print(f"{OPERATIONS} operations over {MONTHS} months, best of {REPEAT}")
+    print(f"{'benchmark':<16}{'Decimal, ms':>14}{'cents, ms':>14}{'speedup':>10}")
+
+    for func in (register, register_many, total):
+        decimal_time = min(timeit.repeat(partial(func, decimals), number=1, repeat=REPEAT))
+        cents_time = min(timeit.repeat(partial(func, cents), number=1, repeat=REPEAT))
+
+        print(
+            f"{func.__name__:<16}{decimal_time * 1000:>14.1f}{cents_time * 1000:>14.1f}"
+            f"{decimal_time / cents_time:>9.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
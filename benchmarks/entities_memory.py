@@ -0,0 +1,90 @@
+"""Measure memory held by operations loaded for a search.
+
+Slotted entities are compared with plain dataclasses of the same fields, the
+layout entities had before `slotted` was introduced.
+
+Run with `poetry run python benchmarks/entities_memory.py`.
+"""
+import gc
+import random
+import tracemalloc
+from dataclasses import field, fields, make_dataclass, MISSING
+from datetime import datetime, timedelta
+
+from passport.domain import User
+
+from wallet.core.entities import Account, Category, Operation, OperationType
+
+
+OPERATIONS = 100_000
+
+
+def plain(cls):
+    """Build dataclass with the same fields as `cls` but without slots."""
+    spec = []
+    for item in fields(cls):
+        if item.default_factory is not MISSING:  # type: ignore
+            declared = field(default_factory=item.default_factory, init=item.init)  # type: ignore
+        elif item.default is not MISSING:
+            declared = field(default=item.default, init=item.init)
+        else:
+            declared = field(init=item.init)
+
+        spec.append((item.name, item.type, declared))
+
+    return make_dataclass(cls.__name__, spec)
+
+
+def load(operation_cls, account_cls, category_cls):
+    rnd = random.Random(42)
+    user = User(key=1, email="user@example.com")  # type: ignore
+
+    accounts = [account_cls(name=f"account {key}", user=user) for key in range(5)]
+    categories = [category_cls(name=f"category {key}", user=user) for key in range(50)]
+
+    origin = datetime(2015, 1, 1)
+
+    result = []
+    for key in range(OPERATIONS):
+        operation = operation_cls(
+            amount=rnd.randint(1, 10_000_000),
+            description="",
+            user=user,
+            account=rnd.choice(accounts),
+            category=rnd.choice(categories),
+            operation_type=OperationType.expense,
+        )
+        operation.key = key
+        operation.created_on = origin + timedelta(minutes=key)
+
+        result.append(operation)
+
+    return result
+
+
+def measure(operation_cls, account_cls, category_cls) -> float:
+    gc.collect()
+    tracemalloc.start()
+
+    operations = load(operation_cls, account_cls, category_cls)
+    size, _ = tracemalloc.get_traced_memory()
+
+    tracemalloc.stop()
+    del operations
+
+    return size / OPERATIONS
+
+
+def main() -> None:
+    before = measure(plain(Operation), plain(Account), plain(Category))
+    after = measure(Operation, Account, Category)
+
+    print(f"{OPERATIONS} operations")
+    print(f"{'layout':<12}{'bytes/operation':>18}")
+    print(f"{'dataclass':<12}{before:>18.1f}")
+    print(f"{'slotted':<12}{after:>18.1f}")
+    print(f"saved {1 - after / before:.0%}")
+
+
+if __name__ == "__main__":
+    main()
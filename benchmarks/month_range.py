@@ -0,0 +1,75 @@
+"""Compare pendulum based month arithmetic with integer month ordinals.
+
+Run with `poetry run python benchmarks/month_range.py`.
+"""
+import random
+import timeit
+from datetime import datetime, timedelta
+from functools import partial
+
+import pendulum  # type: ignore
+
+from wallet.core.tools import month_range, month_start
+
+
+OPERATIONS = 50_000
+RANGES = 2_000
+REPEAT = 5
+
+
+def pendulum_month_range(start, to=None):
+    start_month = pendulum.instance(datetime(start.year, start.month, start.day)).start_of("month").date()
+    end_month = pendulum.instance(datetime.today()).start_of("month").date()
+    if to:
+        end_month = pendulum.instance(datetime(to.year, to.month, to.day)).start_of("month").date()
+
+    if end_month < start_month:
+        raise ValueError("to must be later than start")
+
+    current_month = start_month
+    while current_month <= end_month:
+        yield current_month
+
+        current_month = current_month.add(months=1)
+
+
+def pendulum_month_start(value):
+    return pendulum.instance(value).start_of("month").date()
+
+
+def generate(seed: int = 42):
+    rnd = random.Random(seed)
+    origin = datetime(2010, 1, 1)
+
+    return [origin + timedelta(days=rnd.randrange(3650), seconds=rnd.randrange(86400)) for _ in range(OPERATIONS)]
+
+
+def starts(func, values) -> None:
+    for value in values:
+        func(value)
+
+
+def ranges(func, values) -> None:
+    for start, to in values:
+        list(func(start, to))
+
+
+def main() -> None:
+    created = generate()
+    periods = [(value, value + timedelta(days=365)) for value in created[:RANGES]]
+
+    print(f"best of {REPEAT}")
+    print(f"{'benchmark':<28}{'pendulum, ms':>14}{'ordinals, ms':>14}{'speedup':>10}")
+
+    for name, benchmark, old, new, values in (
+        (f"month start x{OPERATIONS}", starts, pendulum_month_start, month_start, created),
+        (f"month range x{RANGES}", ranges, pendulum_month_range, month_range, periods),
+    ):
+        old_time = min(timeit.repeat(partial(benchmark, old, values), number=1, repeat=REPEAT))
+        new_time = min(timeit.repeat(partial(benchmark, new, values), number=1, repeat=REPEAT))
+
+        print(f"{name:<28}{old_time * 1000:>14.1f}{new_time * 1000:>14.1f}{old_time / new_time:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
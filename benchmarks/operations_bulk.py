@@ -0,0 +1,100 @@
+"""Compare bulk import paths of operations against local Postgres.
+
+Uses the same database as `operations_search.py`.
+
+Run with `poetry run python benchmarks/operations_bulk.py`.
+"""
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from databases import Database
+from operations_search import cleanup, create_schema, DSN
+from passport.domain import User
+
+from wallet.core.entities import Account, Category, Operation, OperationType
+from wallet.storage import DBStorage
+from wallet.storage.accounts import accounts
+from wallet.storage.categories import categories
+
+
+SIZE = 20_000
+ROW_SIZE = 2_000
+
+
+async def build(database: Database, user: User, size: int) -> List[Operation]:
+    rnd = random.Random(size)
+    now = datetime.now()
+
+    account = Account(name="account", user=user)
+    account.key = await database.execute(
+        accounts.insert().returning(accounts.c.id),
+        values={"name": account.name, "user": user.key, "enabled": True, "created_on": now},
+    )
+
+    category = Category(name="category", user=user)
+    category.key = await database.execute(
+        categories.insert().returning(categories.c.id),
+        values={"name": category.name, "user": user.key, "enabled": True, "created_on": now},
+    )
+
+    result = []
+    for index in range(size):
+        operation = Operation(
+            amount=rnd.randint(1, 10_000_000),
+            description="",
+            user=user,
+            account=account,
+            category=category,
+            operation_type=OperationType.expense,
+        )
+        operation.created_on = now - timedelta(hours=index)
+
+        result.append(operation)
+
+    return result
+
+
+async def save(storage: DBStorage, entities: List[Operation]) -> None:
+    for entity in entities:
+        await storage.operations.save(entity)
+
+
+async def save_many(storage: DBStorage, entities: List[Operation]) -> None:
+    await storage.operations.save_many(entities)
+
+
+async def copy_many(storage: DBStorage, entities: List[Operation]) -> None:
+    await storage.operations.copy_many(entities)
+
+
+async def main() -> None:
+    database = Database(DSN)
+    await database.connect()
+
+    try:
+        await create_schema(database)
+        storage = DBStorage(database)
+
+        print(f"{'path':<12}{'rows':>8}{'rows/sec':>12}")
+
+        for func, size in ((save, ROW_SIZE), (save_many, SIZE), (copy_many, SIZE)):
+            user = User(key=-size, email="benchmark@example.com")  # type: ignore
+            entities = await build(database, user, size)
+
+            try:
+                started = time.perf_counter()
+                await func(storage, entities)
+                elapsed = time.perf_counter() - started
+            finally:
+                await cleanup(database, user)
+
+            print(f"{func.__name__:<12}{size:>8}{size / elapsed:>12.0f}")
+    finally:
+        await database.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,45 @@
+"""Compare processed rows and raw asyncpg records when fetching operations against local Postgres.
+
+Uses the same database as `operations_search.py`.
+
+Run with `poetry run python benchmarks/operations_records.py`.
+"""
+import asyncio
+
+from databases import Database
+from operations_search import cleanup, create_schema, DSN, measure, REPEAT, seed
+from passport.domain import User
+
+from wallet.storage import DBStorage
+
+
+SIZE = 100_000
+
+
+async def main() -> None:
+    database = Database(DSN)
+    await database.connect()
+
+    try:
+        await create_schema(database)
+
+        user = User(key=-SIZE, email="benchmark@example.com")  # type: ignore
+
+        await seed(database, user, SIZE)
+        try:
+            print(f"{SIZE} operations, best of {REPEAT}")
+            print(f"{'query':<16}{'rows, ms':>12}{'records, ms':>14}{'speedup':>10}")
+
+            for name in ("fetch", "fetch_detailed"):
+                rows = await measure(getattr(DBStorage(database).operations, name), user)
+                records = await measure(getattr(DBStorage(database, raw_records=True).operations, name), user)
+
+                print(f"{name:<16}{rows * 1000:>12.1f}{records * 1000:>14.1f}{rows / records:>9.2f}x")
+        finally:
+            await cleanup(database, user)
+    finally:
+        await database.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
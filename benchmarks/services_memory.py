@@ -0,0 +1,130 @@
+"""Measure service and balance logic on in-memory storage, without database I/O.
+
+Run with `poetry run python benchmarks/services_memory.py`.
+"""
+import asyncio
+import random
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, AsyncGenerator, List
+
+from passport.domain import User
+
+from wallet.core.entities import (
+    Account,
+    BalanceFilters,
+    BalanceKind,
+    BulkOperationsPayload,
+    Category,
+    OperationFilters,
+    OperationPayload,
+    OperationType,
+)
+from wallet.core.services.accounts import AccountService
+from wallet.core.services.operations import OperationService
+from wallet.storage.memory import MemoryStorage
+
+
+SIZE = 50_000
+CATEGORIES = 20
+PAGE = 50
+
+
+class Logger:
+    def __getattr__(self, name: str) -> Any:
+        return lambda *args, **kwargs: None
+
+
+async def stream(entities: List) -> AsyncGenerator:
+    for entity in entities:
+        yield entity
+
+
+def build(user: User, account: Account, categories: List[Category]) -> BulkOperationsPayload:
+    rnd = random.Random(SIZE)
+    now = datetime.now()
+
+    operations = [
+        OperationPayload(
+            user=user,
+            amount=rnd.randint(1, 10_000_000),
+            account=account.key,
+            category=rnd.choice(categories).key,
+            operation_type=OperationType.expense if rnd.random() > 0.3 else OperationType.income,
+            created_on=now - timedelta(hours=index),
+        )
+        for index in range(SIZE)
+    ]
+
+    return BulkOperationsPayload(
+        user=user,
+        account_keys={account.key},
+        category_keys={category.key for category in categories},
+        category_names=set(),
+        operations=operations,
+    )
+
+
+async def measure(name: str, count: int, coro) -> None:
+    started = time.perf_counter()
+    await coro
+    elapsed = time.perf_counter() - started
+
+    print(f"{name:<16}{count:>8}{count / elapsed:>12.0f}")
+
+
+async def add_bulk(
+    service: OperationService, payload: BulkOperationsPayload, account: Account, categories: List[Category]
+) -> None:
+    async for _ in service.add_bulk(payload, stream([account]), stream(categories)):
+        pass
+
+
+async def find(service: OperationService, user: User, categories: List[Category]) -> None:
+    for page in range(SIZE // PAGE // 10):
+        filters = OperationFilters(user=user, category=categories[page % CATEGORIES].key, limit=PAGE)
+        async for _ in service.find(filters):
+            pass
+
+
+async def find_balance(service: AccountService, account: Account) -> None:
+    start = date.today() - timedelta(days=SIZE // 24)
+    for _ in range(1000):
+        async for _ in service.find_balance(account, start, date.today()):
+            pass
+
+
+async def fetch_balance(storage: MemoryStorage, user: User, categories: List[Category]) -> None:
+    filters = BalanceFilters(user=user, keys=[category.key for category in categories], kind=BalanceKind.category)
+    for _ in range(1000):
+        async for _ in storage.operations.fetch_balance(filters):
+            pass
+
+
+async def main() -> None:
+    user = User(key=1, email="benchmark@example.com")  # type: ignore
+    storage = MemoryStorage()
+    logger = Logger()
+
+    account = Account(name="account", user=user)
+    account.key = await storage.accounts.save(account)
+
+    categories = []
+    for index in range(CATEGORIES):
+        category = Category(name=f"category {index}", user=user)
+        category.key = await storage.categories.save(category)
+        categories.append(category)
+
+    operations = OperationService(storage, logger)
+    accounts = AccountService(storage, logger)
+
+    print(f"{'path':<16}{'count':>8}{'per sec':>12}")
+
+    await measure("add_bulk", SIZE, add_bulk(operations, build(user, account, categories), account, categories))
+    await measure("find", SIZE // PAGE // 10, find(operations, user, categories))
+    await measure("find_balance", 1000, find_balance(accounts, account))
+    await measure("fetch_balance", 1000, fetch_balance(storage, user, categories))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -8,6 +8,7 @@ from aiohttp_storage.management.storage import storage  # type: ignore
 from config import EnvValueProvider, load  # type: ignore
 
 from wallet.app import AppConfig, init
+from wallet.management.partitions import partitions
 
 
 @click.group()
@@ -38,6 +39,7 @@ def cli(ctx, debug: bool = False) -> None:
 
 cli.add_command(server, name="server")
 cli.add_command(storage, name="storage")
+cli.add_command(partitions, name="partitions")
 
 
 if __name__ == "__main__":
@@ -9,18 +9,20 @@ from aiohttp_micro import (  # type: ignore
     setup_metrics,
     setup_openapi,
 )
-from aiohttp_storage import (  # type: ignore
-    setup as setup_storage,
-    StorageConfig,
-)
 from passport.client import PassportConfig, setup as setup_passport
 
+from wallet.storage.cache import CacheConfig, setup as setup_cache
+from wallet.storage.pool import setup as setup_pool, StorageConfig
+from wallet.storage.replica import ReplicaConfig, setup as setup_replica
 from wallet.web import accounts, categories, operations
 
 
 class AppConfig(BaseConfig):
     db = config.NestedField[StorageConfig](StorageConfig)
+    replica = config.NestedField[ReplicaConfig](ReplicaConfig)
+    cache = config.NestedField[CacheConfig](CacheConfig)
     passport = config.NestedField[PassportConfig](PassportConfig)
+    raw_records = config.BoolField(default=False, env="RAW_RECORDS")
 
 
 def init(app_name: str, config: AppConfig) -> web.Application:
@@ -29,13 +31,17 @@ def init(app_name: str, config: AppConfig) -> web.Application:
     app["app_root"] = os.path.dirname(__file__)
 
     setup_micro(app, app_name=app_name, config=config)
-    setup_storage(
-        app, root=os.path.join(app["app_root"], "storage"), config=app["config"].db,
-    )
+    # Migrations live in storage root, primary database is connected by pool setup below.
+    app["storage_root"] = os.path.join(app["app_root"], "storage")
+    setup_replica(app, config=app["config"].replica)
 
     setup_metrics(app)
     setup_logging(app)
 
+    setup_pool(app, config=app["config"].db)
+
+    setup_cache(app, config=app["config"].cache)
+
     setup_passport(app)
 
     # Account endpoints
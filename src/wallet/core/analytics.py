@@ -0,0 +1,135 @@
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np  # type: ignore
+
+from wallet.core.entities import Balance, EntityWithBalance, Operation, OperationType
+from wallet.core.tools import month_ordinal, ordinal_month
+
+
+MISSING = -1
+
+
+class BalanceMatrix:
+    """Incomes, expenses and rest of several entities by months.
+
+    Rows are entities, columns are consecutive months starting from
+    `first_month` ordinal, values are in cents.
+    """
+
+    def __init__(
+        self,
+        keys: np.ndarray,
+        first_month: int,
+        started: np.ndarray,
+        incomes: np.ndarray,
+        expenses: np.ndarray,
+    ) -> None:
+        self.keys = keys
+        self.first_month = first_month
+        self.started = started
+        self.incomes = incomes
+        self.expenses = expenses
+        self.rest = np.cumsum(incomes - expenses, axis=1)
+
+        self._rows = {int(key): row for row, key in enumerate(keys)}
+
+    def __contains__(self, key: int) -> bool:
+        return key in self._rows
+
+    def balance(self, key: int) -> Dict[date, Balance]:
+        row = self._rows[key]
+
+        balance = {}
+        for column in range(self.started[row], self.incomes.shape[1]):
+            month = ordinal_month(self.first_month + column)
+
+            balance[month] = Balance(
+                month=month,
+                incomes=int(self.incomes[row, column]),
+                expenses=int(self.expenses[row, column]),
+                rest=int(self.rest[row, column]),
+            )
+
+        return balance
+
+    def apply(self, entity: EntityWithBalance) -> None:
+        if entity.key in self:
+            entity.balance = self.balance(entity.key)
+
+
+class BalanceEngine:
+    """Vectorized balances for all accounts, categories and tags of a user.
+
+    Operations are loaded once into columnar arrays and balances of every
+    entity for every month are computed with a handful of numpy calls instead
+    of per operation arithmetic in `EntityWithBalance`.
+    """
+
+    def __init__(self, operations: Iterable[Operation], until: Optional[date] = None) -> None:
+        amounts: List[int] = []
+        months: List[int] = []
+        accounts: List[int] = []
+        categories: List[int] = []
+        signs: List[int] = []
+
+        tag_operations: List[int] = []
+        tag_keys: List[int] = []
+
+        for index, operation in enumerate(operations):
+            amounts.append(operation.amount)
+            months.append(month_ordinal(operation.created_on))
+            accounts.append(operation.account.key if operation.account else MISSING)
+            categories.append(operation.category.key if operation.category else MISSING)
+            signs.append(1 if operation.operation_type == OperationType.income else -1)
+
+            for tag in operation.tags:
+                tag_operations.append(index)
+                tag_keys.append(tag.key)
+
+        self.amounts = np.array(amounts, dtype=np.int64)
+        self.months = np.array(months, dtype=np.int64)
+        self.accounts = np.array(accounts, dtype=np.int64)
+        self.categories = np.array(categories, dtype=np.int64)
+        self.signs = np.array(signs, dtype=np.int64)
+
+        self.tag_operations = np.array(tag_operations, dtype=np.int64)
+        self.tag_keys = np.array(tag_keys, dtype=np.int64)
+
+        self.last_month = month_ordinal(until or date.today())
+        if len(self.months):
+            self.first_month = min(int(self.months.min()), self.last_month)
+            self.last_month = max(int(self.months.max()), self.last_month)
+        else:
+            self.first_month = self.last_month
+
+    def _compute(self, entities: np.ndarray, operations: np.ndarray) -> BalanceMatrix:
+        present = entities != MISSING
+        entities, operations = entities[present], operations[present]
+
+        keys, rows = np.unique(entities, return_inverse=True)
+        columns = self.months[operations] - self.first_month
+        shape = (len(keys), self.last_month - self.first_month + 1)
+
+        amounts = self.amounts[operations]
+        signs = self.signs[operations]
+
+        incomes = np.zeros(shape, dtype=np.int64)
+        np.add.at(incomes, (rows, columns), np.where(signs > 0, amounts, 0))
+
+        expenses = np.zeros(shape, dtype=np.int64)
+        np.add.at(expenses, (rows, columns), np.where(signs < 0, amounts, 0))
+
+        started = np.full(len(keys), shape[1] - 1, dtype=np.int64)
+        np.minimum.at(started, rows, columns)
+
+        return BalanceMatrix(keys, self.first_month, started, incomes, expenses)
+
+    def accounts_balance(self) -> BalanceMatrix:
+        return self._compute(self.accounts, np.arange(len(self.accounts)))
+
+    def categories_balance(self) -> BalanceMatrix:
+        return self._compute(self.categories, np.arange(len(self.categories)))
+
+    def tags_balance(self) -> BalanceMatrix:
+        return self._compute(self.tag_keys, self.tag_operations)
@@ -1,15 +1,15 @@
 from dataclasses import dataclass, field
 from datetime import date, datetime
-from decimal import Decimal
 from enum import Enum
 from typing import AsyncGenerator, Dict, Iterable, List, Optional, Tuple, Union
 
-import pendulum  # type: ignore
 from passport.domain import User
 
-from wallet.core.tools import month_range
+from wallet.core.ledger import MonthLedger, ZERO
+from wallet.core.tools import Cents, month_ordinal, ordinal_month, slotted
 
 
+@slotted
 @dataclass
 class Entity:
     key: int = field(default=0, init=False)
@@ -29,12 +29,13 @@ class Filters:
     keys: List[int] = field(default_factory=list)
 
 
+@slotted
 @dataclass
 class Balance(Entity):
     month: date
-    expenses: Decimal = field(default=Decimal("0.0"))
-    incomes: Decimal = field(default=Decimal("0.0"))
-    rest: Decimal = field(default=Decimal("0.0"))
+    expenses: Cents = 0
+    incomes: Cents = 0
+    rest: Cents = 0
 
 
 class OperationType(Enum):
@@ -42,69 +43,108 @@ class OperationType(Enum):
     expense = "expense"
 
 
+BalanceItem = Tuple[Cents, OperationType, datetime]
+
+
+@slotted
 @dataclass
 class EntityWithBalance(Entity):
-    balance: Dict[date, Balance] = field(default_factory=dict, init=False)
+    """Entity with monthly balance.
 
-    def __post_init__(self):
-        super().__post_init__()
+    Ledger is allocated on first registered operation, so accounts, categories
+    and tags loaded only to be referenced by operations stay cheap to build.
+    """
+
+    _ledger: Optional[MonthLedger] = field(default=None, init=False, repr=False)
+    _projection: Optional[Tuple[int, Dict[date, Balance]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def ledger(self) -> MonthLedger:
+        if self._ledger is None:
+            self._ledger = MonthLedger()
+
+        return self._ledger
+
+    @property
+    def balance(self) -> Dict[date, Balance]:
+        current_month = month_ordinal(date.today())
+
+        if self._projection is None or self._projection[0] != current_month:
+            self._projection = current_month, self._project_balance(until=current_month)
+
+        return self._projection[1]
+
+    @balance.setter
+    def balance(self, value: Dict[date, Balance]) -> None:
+        self._ledger = None
+        self._projection = None
+
+        if not value:
+            return
+
+        ledger = MonthLedger()
+        ledger.register_many(
+            {month_ordinal(month): (balance.incomes, balance.expenses) for month, balance in value.items()}
+        )
+
+        first = value[min(value)]
+        ledger.opening = first.rest - first.incomes + first.expenses
+
+        self._ledger = ledger
+
+    def _project_balance(self, until: int) -> Dict[date, Balance]:
+        if not self._ledger:
+            month = ordinal_month(until)
 
-        if not self.balance:
-            month = pendulum.today().start_of("month").date()
+            return {month: Balance(month=month)}
 
-            self.balance[month] = Balance(month=month)
+        balance = {}
+        for ordinal, incomes, expenses, rest in self._ledger.months(until=until):
+            month = ordinal_month(ordinal)
 
-    def add_operation(self, amount: Decimal, operation_type: OperationType, created_on: datetime,) -> None:
-        operation_month = pendulum.instance(created_on).start_of("month").date()
+            balance[month] = Balance(month=month, expenses=expenses, incomes=incomes, rest=rest)
 
-        rest = None
-        for month in month_range(operation_month):
-            if month in self.balance:
-                balance = self.balance[month]
-            else:
-                balance = Balance(month=month)
+        return balance
 
-            if rest is None:
-                rest = balance.rest
+    def rest(self, month: date) -> Cents:
+        if self._ledger is None:
+            return ZERO
 
-            if month == operation_month:
-                if operation_type == OperationType.expense:
-                    balance.expenses += amount
-                elif operation_type == OperationType.income:
-                    balance.incomes += amount
+        return self._ledger.rest(month_ordinal(month))
 
-            rest = rest + balance.incomes - balance.expenses
-            balance.rest = rest
+    def add_operation(self, amount: Cents, operation_type: OperationType, created_on: datetime,) -> None:
+        if operation_type == OperationType.expense:
+            self.ledger.register(month_ordinal(created_on), expenses=amount)
+        elif operation_type == OperationType.income:
+            self.ledger.register(month_ordinal(created_on), incomes=amount)
 
-            self.balance[month] = balance
+        self._projection = None
 
-    def drop_operation(self, amount: Decimal, operation_type: OperationType, created_on: datetime,) -> None:
-        operation_month = pendulum.instance(created_on).start_of("month").date()
+    def drop_operation(self, amount: Cents, operation_type: OperationType, created_on: datetime,) -> None:
+        self.add_operation(-amount, operation_type, created_on)
 
-        rest = None
-        for month in month_range(operation_month):
-            if month in self.balance:
-                balance = self.balance[month]
-            else:
-                balance = Balance(month=month)
+    def apply_operations(self, operations: Iterable[BalanceItem]) -> None:
+        changes: Dict[int, Tuple[Cents, Cents]] = {}
 
-            if rest is None:
-                rest = balance.rest
+        for amount, operation_type, created_on in operations:
+            ordinal = month_ordinal(created_on)
+            incomes, expenses = changes.get(ordinal, (ZERO, ZERO))
 
-            if month == operation_month:
-                if operation_type == OperationType.expense:
-                    balance.expenses -= amount
-                    rest += amount
-                elif operation_type == OperationType.income:
-                    balance.incomes -= amount
-                    rest -= amount
+            if operation_type == OperationType.expense:
+                expenses += amount
+            elif operation_type == OperationType.income:
+                incomes += amount
 
-            rest = rest + balance.incomes - balance.expenses
-            balance.rest = rest
+            changes[ordinal] = (incomes, expenses)
 
-            self.balance[month] = balance
+        if changes:
+            self.ledger.register_many(changes)
+        self._projection = None
 
 
+@slotted
 @dataclass
 class Account(EntityWithBalance):
     name: str
@@ -124,6 +164,7 @@ class AccountFilters(Filters):
     name: Optional[str] = None
 
 
+@slotted
 @dataclass
 class Tag(EntityWithBalance):
     name: str
@@ -140,6 +181,7 @@ class TagFilters(Filters):
     name: Optional[str] = None
 
 
+@slotted
 @dataclass
 class Category(EntityWithBalance):
     name: str
@@ -162,9 +204,25 @@ class CategoryFilters(Filters):
     names: Iterable[str] = field(default_factory=list)
 
 
+class BalanceKind(Enum):
+    account = "account"
+    category = "category"
+
+
+@dataclass
+class BalanceFilters(Filters):
+    kind: BalanceKind = BalanceKind.account
+    start: Optional[date] = None
+    end: Optional[date] = None
+
+
+EntityBalanceStream = AsyncGenerator[Tuple[int, Balance], None]
+
+
+@slotted
 @dataclass
 class Operation(Entity):
-    amount: Decimal
+    amount: Cents
     description: str
     user: User
     account: Optional[Account] = None
@@ -185,7 +243,7 @@ OperationStream = AsyncGenerator[Tuple[Operation, OperationDependencies], None]
 
 @dataclass
 class OperationPayload(Payload):
-    amount: Decimal
+    amount: Cents
     account: int
     category: Union[int, str]
     operation_type: OperationType
@@ -202,9 +260,20 @@ class BulkOperationsPayload(Payload):
     operations: List[OperationPayload]
 
 
+@dataclass
+class OperationCursor:
+    """Position of operation in list ordered by creation date."""
+
+    created_on: datetime
+    key: int
+
+
 @dataclass
 class OperationFilters(Filters):
     month: Optional[date] = None
-    account: Optional[Account] = None
-    category: Optional[Category] = None
+    # Keys, operations of other users never match, so ownership needs no separate check.
+    account: Optional[int] = None
+    category: Optional[int] = None
     tags: List[Tag] = field(default_factory=list)
+    cursor: Optional[OperationCursor] = None
+    limit: Optional[int] = None
@@ -36,6 +36,12 @@ class CategoriesNotFound(EntityNotFound):
         self._keys = keys
 
 
+class TagsNotFound(EntityNotFound):
+    def __init__(self, user: User, keys: Iterable[int]) -> None:
+        self._user = user
+        self._keys = keys
+
+
 class UnprocessableOperations(Exception):
     def __init__(self, user: User, operations: Iterable[OperationPayload]) -> None:
         self._user = user
@@ -0,0 +1,189 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from wallet.core.tools import Cents
+
+
+ZERO: Cents = 0
+
+
+MonthSummary = Tuple[int, Cents, Cents, Cents]
+
+
+class MonthLedger:
+    """Monthly incomes and expenses of an entity indexed by month ordinal.
+
+    Net flow of each month is kept in a Fenwick tree, so registering an
+    operation in any month and computing rest for any month are O(log months)
+    instead of rewriting every month up to today.
+    """
+
+    __slots__ = ("_start", "_first", "_last", "_incomes", "_expenses", "_tree", "opening")
+
+    def __init__(self, opening: Cents = ZERO) -> None:
+        self._start = 0
+        self._first: Optional[int] = None
+        self._last: Optional[int] = None
+
+        self._incomes: List[Cents] = []
+        self._expenses: List[Cents] = []
+        self._tree: List[Cents] = [ZERO]
+
+        self.opening = opening
+
+    def __bool__(self) -> bool:
+        return self._first is not None
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, MonthLedger):
+            return NotImplemented
+
+        return list(self.months()) == list(other.months())
+
+    @property
+    def first(self) -> Optional[int]:
+        return self._first
+
+    @property
+    def last(self) -> Optional[int]:
+        return self._last
+
+    def _build(self) -> None:
+        size = len(self._incomes)
+
+        tree = [ZERO] * (size + 1)
+        for index in range(1, size + 1):
+            tree[index] += self._incomes[index - 1] - self._expenses[index - 1]
+
+            parent = index + (index & -index)
+            if parent <= size:
+                tree[parent] += tree[index]
+
+        self._tree = tree
+
+    def _reserve(self, low: int, high: int) -> bool:
+        """Make room for months from `low` to `high` inclusive.
+
+        Returns True when storage was resized and the tree has to be rebuilt.
+        """
+        size = len(self._incomes)
+        resized = False
+
+        if not size:
+            self._start = low
+            self._incomes = [ZERO] * (high - low + 1)
+            self._expenses = [ZERO] * (high - low + 1)
+            resized = True
+        else:
+            if low < self._start:
+                # Grow at least twice to the past, so backdating month by month
+                # does not rebuild the tree on every call.
+                grow = max(self._start - low, size)
+
+                self._start -= grow
+                self._incomes = [ZERO] * grow + self._incomes
+                self._expenses = [ZERO] * grow + self._expenses
+                resized = True
+
+            size = len(self._incomes)
+            if high >= self._start + size:
+                grow = max(high - self._start - size + 1, size)
+
+                self._incomes.extend([ZERO] * grow)
+                self._expenses.extend([ZERO] * grow)
+                resized = True
+
+        if self._first is None or low < self._first:
+            self._first = low
+
+        if self._last is None or high > self._last:
+            self._last = high
+
+        return resized
+
+    def register(self, ordinal: int, incomes: Cents = ZERO, expenses: Cents = ZERO) -> None:
+        """Change incomes and expenses of the month by given amounts."""
+        resized = self._reserve(ordinal, ordinal)
+        index = ordinal - self._start
+
+        self._incomes[index] += incomes
+        self._expenses[index] += expenses
+
+        if resized:
+            self._build()
+            return
+
+        delta = incomes - expenses
+        if delta:
+            index += 1
+            while index < len(self._tree):
+                self._tree[index] += delta
+                index += index & -index
+
+    def register_many(self, changes: Dict[int, Tuple[Cents, Cents]]) -> None:
+        """Change incomes and expenses of several months at once.
+
+        Storage grows once to cover all given months and the tree is rebuilt
+        with a single cumulative sweep afterwards.
+        """
+        if not changes:
+            return
+
+        self._reserve(min(changes), max(changes))
+
+        for ordinal, (incomes, expenses) in changes.items():
+            index = ordinal - self._start
+
+            self._incomes[index] += incomes
+            self._expenses[index] += expenses
+
+        self._build()
+
+    def incomes(self, ordinal: int) -> Cents:
+        index = ordinal - self._start
+        if self._first is None or index < 0 or index >= len(self._incomes):
+            return ZERO
+
+        return self._incomes[index]
+
+    def expenses(self, ordinal: int) -> Cents:
+        index = ordinal - self._start
+        if self._first is None or index < 0 or index >= len(self._expenses):
+            return ZERO
+
+        return self._expenses[index]
+
+    def rest(self, ordinal: int) -> Cents:
+        """Get rest at the end of the month."""
+        if self._first is None or ordinal < self._start:
+            return self.opening
+
+        index = min(ordinal - self._start, len(self._incomes) - 1) + 1
+
+        rest = self.opening
+        while index > 0:
+            rest += self._tree[index]
+            index -= index & -index
+
+        return rest
+
+    def months(self, until: Optional[int] = None) -> Iterator[MonthSummary]:
+        """Iterate over months from the first registered one.
+
+        Yields month ordinal, incomes, expenses and rest for every month
+        up to `until` or the last registered month, whichever is later.
+        """
+        if self._first is None or self._last is None:
+            return
+
+        end = self._last
+        if until is not None and until > end:
+            end = until
+
+        rest = self.opening
+        for ordinal in range(self._first, end + 1):
+            incomes = self.incomes(ordinal)
+            expenses = self.expenses(ordinal)
+
+            rest = rest + incomes - expenses
+
+            yield ordinal, incomes, expenses, rest
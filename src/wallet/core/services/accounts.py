@@ -1,3 +1,4 @@
+from datetime import date
 from typing import AsyncGenerator
 
 from passport.domain import User
@@ -6,6 +7,9 @@ from wallet.core.entities import (
     Account,
     AccountFilters,
     AccountPayload,
+    Balance,
+    BalanceFilters,
+    BalanceKind,
     OperationFilters,
 )
 from wallet.core.exceptions import AccountAlreadyExist
@@ -31,7 +35,7 @@ class AccountService(Service[Account, AccountFilters, AccountPayload]):
         return account
 
     async def remove(self, entity: Account, dry_run: bool = False) -> None:
-        filters = OperationFilters(user=entity.user, account=entity)
+        filters = OperationFilters(user=entity.user, account=entity.key)
         has_operations = await self._storage.operations.exists(filters)
         if has_operations:
             raise Exception
@@ -49,3 +53,11 @@ class AccountService(Service[Account, AccountFilters, AccountPayload]):
 
     async def find_by_key(self, user: User, key: int) -> Account:
         return await self._storage.accounts.fetch_by_key(user, key=key)
+
+    async def find_balance(self, account: Account, start: date, end: date) -> AsyncGenerator[Balance, None]:
+        filters = BalanceFilters(
+            user=account.user, keys=[account.key], kind=BalanceKind.account, start=start, end=end,
+        )
+
+        async for balance in self._storage.balances.fetch(filters=filters):
+            yield balance
@@ -9,9 +9,12 @@ from wallet.core.entities import (
 )
 from wallet.core.exceptions import CategoriesNotFound, CategoryAlreadyExist
 from wallet.core.services import Service
+from wallet.core.tools import paginate
 
 
 class CategoryService(Service[Category, CategoryFilters, CategoryPayload]):
+    tags_page_size = 1000
+
     async def add(self, payload: CategoryPayload, dry_run: bool = False) -> Category:
         category = Category(name=payload.name, user=payload.user)
 
@@ -30,7 +33,7 @@ class CategoryService(Service[Category, CategoryFilters, CategoryPayload]):
         return category
 
     async def remove(self, entity: Category, dry_run: bool = False) -> None:
-        filters = OperationFilters(user=entity.user, category=entity)
+        filters = OperationFilters(user=entity.user, category=entity.key)
         has_operations = await self._storage.operations.exists(filters)
         if has_operations:
             raise Exception
@@ -56,18 +59,29 @@ class CategoryService(Service[Category, CategoryFilters, CategoryPayload]):
             yield category
 
         if missing_names:
-            for name in missing_names:
-                payload = CategoryPayload(user=filters.user, name=name)
-                category = await self.add(payload)
-
+            async for category in self._storage.categories.save_many_by_name(filters.user, missing_names):
                 yield category
 
+            self._logger.info("Add new categories", user=filters.user.key, names=len(missing_names))
+
         if missing_keys:
             raise CategoriesNotFound(user=filters.user, keys=missing_keys)
 
-    async def find(self, filters: CategoryFilters) -> CategoryStream:
-        async for category in self._storage.categories.fetch(filters=filters):
-            yield category
+    async def find(self, filters: CategoryFilters, with_tags: bool = False) -> CategoryStream:
+        stream = self._storage.categories.fetch(filters=filters)
+
+        if not with_tags:
+            async for category in stream:
+                yield category
+            return
+
+        async for page in paginate(stream, self.tags_page_size):
+            tags = await self._storage.tags.fetch_for_categories(filters.user, [category.key for category in page])
+
+            for category in page:
+                category.tags = tags.get(category.key, [])
+
+                yield category
 
     async def find_by_key(self, user: User, key: int) -> Category:
         return await self._storage.categories.fetch_by_key(user, key=key)
@@ -1,4 +1,4 @@
-from typing import Dict, Set
+from typing import AsyncGenerator, Dict, List, Optional, Set, Tuple
 
 from passport.domain import User
 
@@ -6,22 +6,34 @@ from wallet.core.entities import (
     Account,
     AccountFilters,
     AccountStream,
+    BalanceItem,
     BulkOperationsPayload,
     Category,
     CategoryFilters,
     CategoryStream,
+    EntityWithBalance,
     Operation,
     OperationFilters,
     OperationPayload,
     OperationStream,
+    Tag,
+    TagFilters,
 )
-from wallet.core.exceptions import CategoriesNotFound, UnprocessableOperations
+from wallet.core.exceptions import CategoriesNotFound, TagsNotFound, UnprocessableOperations
 from wallet.core.services import Service
+from wallet.core.tools import paginate
+
+
+BalanceChanges = Dict[int, Tuple[EntityWithBalance, List[BalanceItem]]]
 
 
 class OperationService(Service[Operation, OperationFilters, OperationPayload]):
-    async def create(
-        self, payload: OperationPayload, account: Account, category: Category, dry_run: bool = False,
+    # Imports of at least this size are loaded through storage bulk load path.
+    copy_threshold = 5000
+    tags_page_size = 1000
+
+    def _build(
+        self, payload: OperationPayload, account: Account, category: Category, tags: Optional[List[Tag]] = None
     ) -> Operation:
         operation = Operation(
             amount=payload.amount,
@@ -29,10 +41,23 @@ class OperationService(Service[Operation, OperationFilters, OperationPayload]):
             account=account,
             category=category,
             operation_type=payload.operation_type,
+            tags=tags or [],
             user=payload.user,
         )
         operation.created_on = payload.created_on
 
+        return operation
+
+    async def create(
+        self,
+        payload: OperationPayload,
+        account: Account,
+        category: Category,
+        tags: Optional[List[Tag]] = None,
+        dry_run: bool = False,
+    ) -> Operation:
+        operation = self._build(payload, account, category, tags)
+
         if not dry_run:
             operation.key = await self._storage.operations.save(operation)
 
@@ -42,7 +67,15 @@ class OperationService(Service[Operation, OperationFilters, OperationPayload]):
         account = await self._storage.accounts.fetch_by_key(user=payload.user, key=payload.account)
         category = await self._storage.categories.fetch_by_key(user=payload.user, key=payload.category)
 
-        operation = await self.create(payload, account, category, dry_run=dry_run)
+        tags = []
+        if payload.tags:
+            tags = [tag async for tag in self._storage.tags.fetch(TagFilters(user=payload.user, keys=payload.tags))]
+
+            missing_keys = set(payload.tags) - {tag.key for tag in tags}
+            if missing_keys:
+                raise TagsNotFound(user=payload.user, keys=missing_keys)
+
+        operation = await self.create(payload, account, category, tags, dry_run=dry_run)
 
         self._logger.info(
             "Add operation", operation=operation.key, dry_run=dry_run,
@@ -50,6 +83,37 @@ class OperationService(Service[Operation, OperationFilters, OperationPayload]):
 
         return operation
 
+    def _track_balance_changes(self, changes: BalanceChanges, operation: Operation) -> None:
+        for entity in (operation.account, operation.category):
+            if entity is None:
+                continue
+
+            _, items = changes.setdefault(id(entity), (entity, []))
+            items.append((operation.amount, operation.operation_type, operation.created_on))
+
+    def _apply_balance_changes(self, changes: BalanceChanges) -> None:
+        for entity, items in changes.values():
+            entity.apply_operations(items)
+
+    def _resolve_category(
+        self, payload: OperationPayload, by_key: Dict[int, Category], by_name: Dict[str, Category]
+    ) -> Optional[Category]:
+        if isinstance(payload.category, int):
+            return by_key.get(payload.category, None)
+        elif isinstance(payload.category, str):
+            return by_name.get(payload.category, None)
+
+        return None
+
+    async def _save_many(self, operations: List[Operation]) -> None:
+        if len(operations) >= self.copy_threshold:
+            keys = await self._storage.operations.copy_many(operations)
+        else:
+            keys = await self._storage.operations.save_many(operations)
+
+        for operation, key in zip(operations, keys):
+            operation.key = key
+
     async def add_bulk(
         self,
         payload: BulkOperationsPayload,
@@ -70,6 +134,7 @@ class OperationService(Service[Operation, OperationFilters, OperationPayload]):
             pass
 
         unprocessable_operations = []
+        created: List[Operation] = []
 
         for item in payload.operations:
             account = accounts.get(item.account, None)
@@ -78,24 +143,28 @@ class OperationService(Service[Operation, OperationFilters, OperationPayload]):
                 unprocessable_operations.append(item)
                 continue
 
-            category = None
-            if isinstance(item.category, int):
-                category = category_by_key.get(item.category, None)
-            elif isinstance(item.category, str):
-                category = category_by_name.get(item.category, None)
-
+            category = self._resolve_category(item, category_by_key, category_by_name)
             if not category:
                 unprocessable_operations.append(item)
                 continue
 
-            operation = await self.create(item, account, category, dry_run=dry_run)
+            created.append(self._build(item, account, category))
+
+        if created and not dry_run:
+            await self._save_many(created)
 
+        balance_changes: BalanceChanges = {}
+        for operation in created:
             self._logger.info(
                 "Add operation", operation=operation.key, bulk=True, dry_run=dry_run,
             )
 
+            self._track_balance_changes(balance_changes, operation)
+
             yield operation
 
+        self._apply_balance_changes(balance_changes)
+
         if unprocessable_operations:
             raise UnprocessableOperations(user=payload.user, operations=unprocessable_operations)
 
@@ -107,7 +176,25 @@ class OperationService(Service[Operation, OperationFilters, OperationPayload]):
             "Remove operation", operation=entity.key, dry_run=dry_run,
         )
 
-    async def find(self, filters: OperationFilters) -> OperationStream:
+    async def find(self, filters: OperationFilters, with_tags: bool = False) -> AsyncGenerator[Operation, None]:
+        stream = self._storage.operations.fetch_detailed(filters=filters)
+
+        if not with_tags:
+            async for operation in stream:
+                yield operation
+            return
+
+        # Tags are loaded with one query per page of operations.
+        async for page in paginate(stream, self.tags_page_size):
+            tags = await self._storage.tags.fetch_for_operations(filters.user, [operation.key for operation in page])
+
+            for operation in page:
+                operation.tags = tags.get(operation.key, [])
+
+                yield operation
+
+    async def find_with_lookups(self, filters: OperationFilters) -> AsyncGenerator[Operation, None]:
+        """Find operations and attach accounts and categories fetched by separate queries."""
         account_keys: Set[int] = set()
         category_keys: Set[int] = set()
 
@@ -16,7 +16,7 @@ class TagService(Service[Tag, TagFilters, TagPayload]):
     async def add(self, payload: TagPayload, dry_run: bool = False) -> Tag:
         tag = Tag(name=payload.name, user=payload.user)
 
-        exists = await self._storage.tags.fetch_by_name(user=tag.user, name=tag.name)
+        exists = await self._storage.tags.exists(TagFilters(user=tag.user, name=tag.name))
         if exists:
             raise EntityAlreadyExist()
 
@@ -43,7 +43,8 @@ class TagService(Service[Tag, TagFilters, TagPayload]):
         )
 
     async def find(self, filters: TagFilters) -> AsyncGenerator[Tag, None]:
-        return await self._storage.tags.fetch(filters=filters)
+        async for tag in self._storage.tags.fetch(filters=filters):
+            yield tag
 
     async def find_by_key(self, user: User, key: int) -> Tag:
         return await self._storage.tags.fetch_by_key(user, key=key)
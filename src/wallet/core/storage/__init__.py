@@ -1,4 +1,5 @@
 from wallet.core.storage.accounts import AccountRepo
+from wallet.core.storage.balances import BalanceRepo
 from wallet.core.storage.categories import CategoryRepo
 from wallet.core.storage.operations import OperationRepo
 from wallet.core.storage.tags import TagRepo
@@ -6,6 +7,7 @@ from wallet.core.storage.tags import TagRepo
 
 class Storage:
     accounts: AccountRepo
+    balances: BalanceRepo
     categories: CategoryRepo
     operations: OperationRepo
     tags: TagRepo
@@ -0,0 +1,6 @@
+from wallet.core.entities import Balance, BalanceFilters
+from wallet.core.storage.base import Repo
+
+
+class BalanceRepo(Repo[Balance, BalanceFilters]):
+    pass
@@ -1,9 +1,14 @@
+from typing import Iterable
+
 from passport.domain import User
 
-from wallet.core.entities import Category, CategoryFilters
+from wallet.core.entities import Category, CategoryFilters, CategoryStream
 from wallet.core.storage.base import Repo
 
 
 class CategoryRepo(Repo[Category, CategoryFilters]):
     async def fetch_by_name(self, user: User, name: str) -> Category:
         pass
+
+    async def save_many_by_name(self, user: User, names: Iterable[str]) -> CategoryStream:
+        pass
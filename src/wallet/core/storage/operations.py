@@ -1,6 +1,19 @@
-from wallet.core.entities import Operation, OperationFilters
+from typing import AsyncGenerator, List
+
+from wallet.core.entities import BalanceFilters, EntityBalanceStream, Operation, OperationFilters
 from wallet.core.storage.base import Repo
 
 
 class OperationRepo(Repo[Operation, OperationFilters]):
-    pass
+    async def fetch_detailed(self, filters: OperationFilters) -> AsyncGenerator[Operation, None]:
+        pass
+
+    async def save_many(self, entities: List[Operation]) -> List[int]:
+        pass
+
+    async def copy_many(self, entities: List[Operation]) -> List[int]:
+        """Bulk load large batches, storages without faster path insert them as usual."""
+        return await self.save_many(entities)
+
+    async def fetch_balance(self, filters: BalanceFilters) -> EntityBalanceStream:
+        pass
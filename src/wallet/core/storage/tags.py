@@ -1,3 +1,5 @@
+from typing import Dict, List
+
 from passport.domain import User
 
 from wallet.core.entities import Tag, TagFilters
@@ -7,3 +9,10 @@ from wallet.core.storage.base import Repo
 class TagRepo(Repo[Tag, TagFilters]):
     async def fetch_by_name(self, user: User, name: str) -> Tag:
         pass
+
+    async def fetch_for_operations(self, user: User, keys: List[int]) -> Dict[int, List[Tag]]:
+        """Tags of operations by operation key, for the whole page at once."""
+        pass
+
+    async def fetch_for_categories(self, user: User, keys: List[int]) -> Dict[int, List[Tag]]:
+        pass
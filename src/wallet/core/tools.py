@@ -1,20 +1,104 @@
-from datetime import date, datetime
-from typing import Generator, Optional
+from dataclasses import fields, MISSING
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache, wraps
+from typing import AsyncGenerator, AsyncIterable, Generator, List, Optional, Type, TypeVar
 
-import pendulum  # type: ignore
+
+T = TypeVar("T")
+
+
+# Amounts are stored in database as NUMERIC(20, 2), so every amount is exactly
+# representable as integer number of cents.
+Cents = int
+
+
+def to_cents(value: Decimal) -> Cents:
+    return int((value * 100).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def to_decimal(value: Cents) -> Decimal:
+    return Decimal(int(value)).scaleb(-2)
+
+
+def month_ordinal(value: date) -> int:
+    """Number of months since year zero, works for `date` and `datetime`."""
+    return value.year * 12 + value.month - 1
+
+
+@lru_cache(maxsize=None)
+def ordinal_month(ordinal: int) -> date:
+    """First day of month by its ordinal.
+
+    Results are memoized, so balance projections reuse the same `date`
+    instances instead of building new ones for every month of every entity.
+    """
+    year, month = divmod(ordinal, 12)
+
+    return date(year, month + 1, 1)
+
+
+def month_start(value: date) -> date:
+    return ordinal_month(month_ordinal(value))
 
 
 def month_range(start: date, to: Optional[date] = None) -> Generator[date, None, None]:
-    start_month = pendulum.instance(datetime(start.year, start.month, start.day)).start_of("month").date()
-    end_month = pendulum.instance(datetime.today()).start_of("month").date()
-    if to:
-        end_month = pendulum.instance(datetime(to.year, to.month, to.day)).start_of("month").date()
+    start_month = month_ordinal(start)
+    end_month = month_ordinal(to or date.today())
 
     if end_month < start_month:
         raise ValueError("to must be later than start")
 
-    current_month = start_month
-    while current_month <= end_month:
-        yield current_month
+    for ordinal in range(start_month, end_month + 1):
+        yield ordinal_month(ordinal)
+
+
+async def paginate(stream: AsyncIterable[T], size: int) -> AsyncGenerator[List[T], None]:
+    """Group items of stream into lists of at most `size` items."""
+    page: List[T] = []
+
+    async for item in stream:
+        page.append(item)
+
+        if len(page) == size:
+            yield page
+            page = []
+
+    if page:
+        yield page
+
+
+def slotted(cls: Type[T]) -> Type[T]:
+    """Rebuild dataclass with `__slots__` for its own fields.
+
+    `dataclass(slots=True)` is not available before Python 3.10. Instances of
+    slotted class hierarchy have no per-instance `__dict__`, which matters for
+    entities kept in memory by thousands. Field defaults are already captured
+    by generated `__init__`, so they are dropped from class namespace to not
+    clash with slot descriptors. Generated `__init__` relies on class attributes
+    for non-init fields, so those are assigned explicitly instead.
+    """
+    own = cls.__dict__.get("__annotations__", {})
+    names = tuple(field.name for field in fields(cls) if field.name in own)
+    defaults = tuple(
+        (field.name, field.default) for field in fields(cls) if not field.init and field.default is not MISSING
+    )
+
+    namespace = dict(cls.__dict__)
+    for name in names + ("__dict__", "__weakref__"):
+        namespace.pop(name, None)
+    namespace["__slots__"] = names
+
+    if defaults and "__init__" in namespace:
+        init = namespace["__init__"]
+
+        @wraps(init)
+        def __init__(self, *args, **kwargs):
+            for name, value in defaults:
+                setattr(self, name, value)
+
+            init(self, *args, **kwargs)
+
+        namespace["__init__"] = __init__
 
-        current_month = current_month.add(months=1)
+    return type(cls)(cls.__name__, cls.__bases__, namespace)  # type: ignore
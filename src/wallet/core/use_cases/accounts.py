@@ -1,9 +1,10 @@
+from datetime import date
 from logging import Logger
 from typing import AsyncGenerator
 
 from passport.domain import User
 
-from wallet.core.entities import Account, AccountFilters, AccountPayload
+from wallet.core.entities import Account, AccountFilters, AccountPayload, Balance
 from wallet.core.services.accounts import AccountService
 from wallet.core.storage import Storage
 
@@ -14,7 +15,7 @@ class AccountUseCase:
         self._service: AccountService = AccountService(storage=self.storage, logger=logger)
 
     async def get_by_key(self, user: User, key: int) -> Account:
-        return self._service.find_by_key(user, key=key)
+        return await self._service.find_by_key(user, key=key)
 
 
 class AddUseCase(AccountUseCase):
@@ -33,3 +34,11 @@ class SearchUseCase(AccountUseCase):
     async def execute(self, filters: AccountFilters) -> AsyncGenerator[Account, None]:
         async for account in self._service.find(filters=filters):
             yield account
+
+
+class BalanceUseCase(AccountUseCase):
+    async def execute(self, user: User, key: int, start: date, end: date) -> AsyncGenerator[Balance, None]:
+        account = await self.get_by_key(user, key=key)
+
+        async for balance in self._service.find_balance(account, start=start, end=end):
+            yield balance
@@ -34,6 +34,6 @@ class RemoveUseCase(CategoryUseCase):
 
 
 class SearchUseCase(CategoryUseCase):
-    async def execute(self, filters: CategoryFilters) -> CategoryStream:
-        async for category in self.service.find(filters=filters):
+    async def execute(self, filters: CategoryFilters, with_tags: bool = False) -> CategoryStream:
+        async for category in self.service.find(filters=filters, with_tags=with_tags):
             yield category
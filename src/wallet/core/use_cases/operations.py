@@ -58,6 +58,6 @@ class AddBulkUseCase(OperationUseCase):
 
 
 class SearchUseCase(OperationUseCase):
-    async def execute(self, filters: OperationFilters) -> OperationStream:
-        async for operation in self.service.find(filters=filters):
+    async def execute(self, filters: OperationFilters, with_tags: bool = False) -> OperationStream:
+        async for operation in self.service.find(filters=filters, with_tags=with_tags):
             yield operation
@@ -0,0 +1,56 @@
+from datetime import date
+
+import click
+from databases import Database
+
+from wallet.core.tools import month_ordinal, ordinal_month
+from wallet.storage.partitions import create_partitions, drop_partitions
+
+
+@click.group()
+def partitions() -> None:
+    """Manage monthly partitions of operations."""
+
+
+@partitions.command()
+@click.option("--ahead", default=3, show_default=True, help="Number of months after current one")
+@click.pass_context
+def create(ctx, ahead: int) -> None:
+    """Create partitions for current and next months."""
+
+    async def run() -> None:
+        database = Database(ctx.obj["config"].db.uri)
+        await database.connect()
+
+        try:
+            today = date.today()
+            names = await create_partitions(database, today, ordinal_month(month_ordinal(today) + ahead))
+        finally:
+            await database.disconnect()
+
+        for name in names:
+            click.echo(name)
+
+    ctx.obj["loop"].run_until_complete(run())
+
+
+@partitions.command()
+@click.option("--before", type=click.DateTime(formats=["%Y-%m"]), required=True, help="First month to keep")
+@click.confirmation_option(prompt="Operations of dropped months can't be restored, continue?")
+@click.pass_context
+def drop(ctx, before) -> None:
+    """Drop partitions of months before given one."""
+
+    async def run() -> None:
+        database = Database(ctx.obj["config"].db.uri)
+        await database.connect()
+
+        try:
+            names = await drop_partitions(database, before.date())
+        finally:
+            await database.disconnect()
+
+        for name in names:
+            click.echo(name)
+
+    ctx.obj["loop"].run_until_complete(run())
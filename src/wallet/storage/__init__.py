@@ -1,13 +1,34 @@
+from typing import Optional
+
 from databases import Database
 
 from wallet.core.storage import Storage
 from wallet.storage.accounts import AccountDBRepo
+from wallet.storage.balances import BalanceDBRepo
+from wallet.storage.base import DatabaseRouter
+from wallet.storage.cache import CachedRepo, StorageCache
 from wallet.storage.categories import CategoryDBRepo
 from wallet.storage.operations import OperationDBRepo
+from wallet.storage.tags import TagDBRepo
 
 
 class DBStorage(Storage):
-    def __init__(self, database: Database) -> None:
-        self.accounts = AccountDBRepo(database=database)
-        self.categories = CategoryDBRepo(database=database)
-        self.operations = OperationDBRepo(database=database)
+    def __init__(
+        self,
+        database: Database,
+        cache: Optional[StorageCache] = None,
+        raw_records: bool = False,
+        replica: Optional[Database] = None,
+    ) -> None:
+        # Shared by all repositories, so a write through any of them sends later reads to primary.
+        router = DatabaseRouter(database, replica)
+
+        self.accounts = AccountDBRepo(database=database, router=router)
+        self.balances = BalanceDBRepo(database=database, router=router)
+        self.categories = CategoryDBRepo(database=database, router=router)
+        self.operations = OperationDBRepo(database=database, router=router, raw_records=raw_records)
+        self.tags = TagDBRepo(database=database, router=router)
+
+        if cache:
+            self.accounts = CachedRepo(self.accounts, cache.accounts, self.accounts._loader)
+            self.categories = CachedRepo(self.categories, cache.categories, self.categories._loader)
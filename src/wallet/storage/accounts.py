@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import AsyncGenerator
+from typing import AsyncGenerator, List, Optional
 
 import sqlalchemy  # type: ignore
 from aiohttp_storage.storage import metadata  # type: ignore
@@ -9,6 +9,8 @@ from sqlalchemy.orm import Query  # type: ignore
 
 from wallet.core.entities import Account, AccountFilters
 from wallet.core.storage.accounts import AccountRepo
+from wallet.storage.base import any_of, DatabaseRouter, DBRepo
+from wallet.storage.loader import Loader
 
 
 accounts = sqlalchemy.Table(
@@ -19,15 +21,20 @@ accounts = sqlalchemy.Table(
     sqlalchemy.Column("user", sqlalchemy.Integer),
     sqlalchemy.Column("enabled", sqlalchemy.Boolean, default=True),
     sqlalchemy.Column("created_on", sqlalchemy.DateTime, default=datetime.utcnow),
+    # Removed rows are kept disabled, only enabled ones take part in lookups and keep names unique.
+    sqlalchemy.Index("accounts_name_idx", "user", "name", unique=True, postgresql_where=sqlalchemy.text("enabled")),
 )
 
 
-class AccountDBRepo(AccountRepo):
-    def __init__(self, database: Database) -> None:
-        self._database = database
+class AccountDBRepo(DBRepo, AccountRepo):
+    def __init__(self, database: Database, router: Optional[DatabaseRouter] = None) -> None:
+        super().__init__(database=database, router=router)
+        self._loader: Loader[Account] = Loader(self._fetch_many)
 
     def _get_query(self, *, user: User) -> Query:
-        query = sqlalchemy.select([accounts.c.id, accounts.c.name]).where(accounts.c.user == user.key)
+        query = sqlalchemy.select([accounts.c.id, accounts.c.name]).where(
+            sqlalchemy.and_(accounts.c.user == user.key, accounts.c.enabled == True)  # noqa:E712
+        )
 
         return query
 
@@ -43,27 +50,47 @@ class AccountDBRepo(AccountRepo):
         if filters.keys:
             query = query.where(accounts.c.id.in_(filters.keys))
 
-        async for row in self._database.iterate(query=query):
-            yield self._process_row(row, user=filters.user)
+        async for row in self._reader.iterate(query=query):
+            yield self._loader.prime(filters.user, self._process_row(row, user=filters.user))
+
+    async def _fetch_many(self, user: User, keys: List[int]) -> List[Account]:
+        statement = self._prepare(
+            "fetch_many",
+            lambda: sqlalchemy.select([accounts.c.id, accounts.c.name]).where(
+                sqlalchemy.and_(
+                    accounts.c.user == sqlalchemy.bindparam("user"),
+                    accounts.c.enabled == True,  # noqa:E712
+                    any_of(accounts.c.id, "keys"),
+                )
+            ),
+        )
 
-    async def fetch_by_key(self, user: User, key: int) -> Account:
-        row = await self._database.fetch_one(query=self._get_query(user=user).where(accounts.c.id == key))
+        rows = await self._fetch_all(statement, {"user": user.key, "keys": keys})
 
-        return self._process_row(row, user=user)
+        return [self._process_row(row, user=user) for row in rows]
+
+    async def fetch_by_key(self, user: User, key: int) -> Account:
+        return await self._loader.load(user, key)
 
     async def exists(self, filters: AccountFilters) -> bool:
         query = (
             sqlalchemy.select([sqlalchemy.func.count(accounts.c.id)])
             .select_from(accounts)
-            .where(sqlalchemy.and_(accounts.c.user == filters.user.key, accounts.c.name == filters.name))
+            .where(
+                sqlalchemy.and_(
+                    accounts.c.user == filters.user.key,
+                    accounts.c.name == filters.name,
+                    accounts.c.enabled == True,  # noqa:E712
+                )
+            )
         )
 
-        exists = await self._database.fetch_val(query=query)
+        exists = await self._reader.fetch_val(query=query)
 
         return exists > 0
 
     async def save(self, entity: Account) -> int:
-        key = await self._database.execute(
+        key = await self._writer().execute(
             accounts.insert().returning(accounts.c.id),
             values={"name": entity.name, "user": entity.user.key, "enabled": True, "created_on": datetime.now()},
         )
@@ -71,9 +98,24 @@ class AccountDBRepo(AccountRepo):
         return key
 
     async def remove(self, entity: Account) -> bool:
-        pass
+        """Disable account, its row stays for operations referencing it."""
+        key = await self._writer().fetch_val(
+            accounts.update()
+            .where(
+                sqlalchemy.and_(
+                    accounts.c.id == entity.key,
+                    accounts.c.user == entity.user.key,
+                    accounts.c.enabled == True,  # noqa:E712
+                )
+            )
+            .values(enabled=False)
+            .returning(accounts.c.id)
+        )
+        self._loader.forget(entity.user, entity.key)
+
+        return key is not None
 
     async def fetch_by_name(self, user: User, name: str) -> Account:
-        row = await self._database.fetch_one(query=self._get_query(user=user).where(accounts.c.name == name))
+        row = await self._reader.fetch_one(query=self._get_query(user=user).where(accounts.c.name == name))
 
         return self._process_row(row, user=user)
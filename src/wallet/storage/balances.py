@@ -0,0 +1,146 @@
+from datetime import date
+from typing import AsyncGenerator
+
+import sqlalchemy  # type: ignore
+from aiohttp_storage.storage import metadata  # type: ignore
+from passport.domain import User
+from sqlalchemy.dialects.postgresql import insert  # type: ignore
+from sqlalchemy.orm import Query  # type: ignore
+
+from wallet.core.entities import Balance, BalanceFilters, BalanceKind
+from wallet.core.storage.balances import BalanceRepo
+from wallet.core.tools import Cents, month_range, month_start, to_decimal
+from wallet.storage.base import cents, DBRepo
+
+
+balances = sqlalchemy.Table(
+    "balances",
+    metadata,
+    sqlalchemy.Column("kind", sqlalchemy.Enum(BalanceKind), primary_key=True),
+    sqlalchemy.Column("entity_id", sqlalchemy.Integer, primary_key=True),
+    sqlalchemy.Column("month", sqlalchemy.Date, primary_key=True),
+    sqlalchemy.Column("user", sqlalchemy.Integer),
+    sqlalchemy.Column("incomes", sqlalchemy.Numeric(20, 2), nullable=False, default=0),
+    sqlalchemy.Column("expenses", sqlalchemy.Numeric(20, 2), nullable=False, default=0),
+    sqlalchemy.Column("rest", sqlalchemy.Numeric(20, 2), nullable=False, default=0),
+)
+
+
+class BalanceDBRepo(DBRepo, BalanceRepo):
+    def _get_query(self, *, user: User, kind: BalanceKind, entity_id: int) -> Query:
+        query = (
+            sqlalchemy.select(
+                [
+                    balances.c.month,
+                    cents(balances.c.incomes).label("incomes"),
+                    cents(balances.c.expenses).label("expenses"),
+                    cents(balances.c.rest).label("rest"),
+                ]
+            )
+            .where(
+                sqlalchemy.and_(
+                    balances.c.kind == kind, balances.c.entity_id == entity_id, balances.c.user == user.key,
+                )
+            )
+            .order_by(balances.c.month)
+        )
+
+        return query
+
+    def _process_row(self, row, *, month: date) -> Balance:
+        return Balance(month=month, incomes=row["incomes"], expenses=row["expenses"], rest=row["rest"])
+
+    async def fetch(self, filters: BalanceFilters) -> AsyncGenerator[Balance, None]:
+        if len(filters.keys) != 1:
+            raise ValueError("Balance could be fetched only for single entity")
+
+        kind, entity_id = filters.kind, filters.keys[0]
+
+        end = month_start(filters.end or date.today())
+        start = month_start(filters.start or end)
+
+        # Latest row before requested period holds the opening rest.
+        anchor = (
+            sqlalchemy.select([sqlalchemy.func.max(balances.c.month)])
+            .where(
+                sqlalchemy.and_(
+                    balances.c.kind == kind, balances.c.entity_id == entity_id, balances.c.month < start,
+                )
+            )
+            .as_scalar()
+        )
+
+        query = self._get_query(user=filters.user, kind=kind, entity_id=entity_id).where(
+            sqlalchemy.and_(
+                balances.c.month >= sqlalchemy.func.coalesce(anchor, start),
+                balances.c.month <= end,
+            )
+        )
+
+        rest = 0
+        rows = {}
+        async for row in self._reader.iterate(query=query):
+            if row["month"] < start:
+                rest = row["rest"]
+            else:
+                rows[row["month"]] = row
+
+        for month in month_range(start, end):
+            if month in rows:
+                balance = self._process_row(rows[month], month=month)
+                rest = balance.rest
+            else:
+                balance = Balance(month=month, rest=rest)
+
+            yield balance
+
+    async def register(
+        self, user: User, kind: BalanceKind, entity_id: int, month: date, incomes: Cents, expenses: Cents,
+    ) -> None:
+        """Apply changes of month incomes and expenses to stored balance.
+
+        Should be called inside the same transaction which changes operations.
+        """
+        delta = to_decimal(incomes - expenses)
+
+        previous_rest = (
+            sqlalchemy.select([balances.c.rest])
+            .where(
+                sqlalchemy.and_(
+                    balances.c.kind == kind, balances.c.entity_id == entity_id, balances.c.month < month,
+                )
+            )
+            .order_by(balances.c.month.desc())
+            .limit(1)
+            .as_scalar()
+        )
+
+        query = insert(balances).values(
+            kind=kind,
+            entity_id=entity_id,
+            month=month,
+            user=user.key,
+            incomes=to_decimal(incomes),
+            expenses=to_decimal(expenses),
+            rest=sqlalchemy.func.coalesce(previous_rest, 0) + delta,
+        )
+        query = query.on_conflict_do_update(
+            index_elements=[balances.c.kind, balances.c.entity_id, balances.c.month],
+            set_={
+                "incomes": balances.c.incomes + query.excluded.incomes,
+                "expenses": balances.c.expenses + query.excluded.expenses,
+                "rest": balances.c.rest + delta,
+            },
+        )
+        await self._writer().execute(query)
+
+        if delta:
+            await self._writer().execute(
+                balances.update()
+                .where(
+                    sqlalchemy.and_(
+                        balances.c.kind == kind, balances.c.entity_id == entity_id, balances.c.month > month,
+                    )
+                )
+                .values(rest=balances.c.rest + delta)
+            )
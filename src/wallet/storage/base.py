@@ -1,12 +1,135 @@
 from abc import ABCMeta, abstractmethod
+from typing import Any, AsyncGenerator, Callable, ClassVar, Dict, Hashable, List, Mapping, Optional, Tuple
 
+import sqlalchemy  # type: ignore
 from databases import Database
+from sqlalchemy.engine.interfaces import Dialect  # type: ignore
 from sqlalchemy.orm import Query  # type: ignore
+from sqlalchemy.sql import ColumnElement  # type: ignore
+from sqlalchemy.sql.elements import BindParameter  # type: ignore
+
+
+Row = Dict[str, Any]
+
+
+def cents(column: ColumnElement) -> ColumnElement:
+    """Convert NUMERIC(20, 2) amount to integer cents on database side."""
+    return sqlalchemy.cast(column * sqlalchemy.literal_column("100"), sqlalchemy.BigInteger)
+
+
+def any_of(column: ColumnElement, name: str, item_type=sqlalchemy.Integer) -> ColumnElement:
+    """`column = ANY(:name)`, unlike `IN` keeps the same SQL for any number of values."""
+    return column == sqlalchemy.func.any(sqlalchemy.bindparam(name, type_=sqlalchemy.ARRAY(item_type)))
+
+
+Processor = Callable[[Any], Any]
+
+
+class CompiledQuery:
+    """Query compiled for dialect, with processors SQLAlchemy applies to parameters and results.
+
+    SQLAlchemy 1.3 has no public API for processors, this is the only place
+    relying on compiler internals.
+    """
+
+    __slots__ = ("_compiled", "_dialect")
+
+    def __init__(self, query: Query, dialect: Dialect) -> None:
+        self._compiled = query.compile(dialect=dialect)
+        self._dialect = dialect
+
+    @property
+    def string(self) -> str:
+        return self._compiled.string
+
+    def binds(self) -> List[Tuple[str, BindParameter, Optional[Processor]]]:
+        """Bind parameters sorted by name."""
+        processors = self._compiled._bind_processors
+
+        return [(name, bind, processors.get(name)) for name, bind in sorted(self._compiled.binds.items())]
+
+    def columns(self) -> List[Tuple[str, Optional[Processor]]]:
+        """Result columns in order of query."""
+        return [
+            (name, type_._cached_result_processor(self._dialect, None))
+            for name, _, _, type_ in self._compiled._result_columns
+        ]
+
+
+class Statement:
+    """SQL of query compiled once for asyncpg with named parameters bound on execution.
+
+    Every parameter must be created with `sqlalchemy.bindparam(name)` and
+    provided on execution. Anonymous ones would keep values of the first
+    compiled query forever, so they are rejected, constants should be
+    rendered with `sqlalchemy.literal_column`.
+    """
+
+    __slots__ = ("sql", "_params", "_columns")
+
+    def __init__(self, query: Query, dialect: Dialect) -> None:
+        compiled = CompiledQuery(query, dialect)
+        binds = compiled.binds()
+
+        anonymous = [name for name, bind, _ in binds if bind.unique]
+        if anonymous:
+            raise ValueError(f"Anonymous parameters {', '.join(anonymous)} in prepared query")
+
+        self.sql = compiled.string % {name: f"${position}" for position, (name, _, _) in enumerate(binds, start=1)}
+        self._params = [(name, processor) for name, _, processor in binds]
+        self._columns = compiled.columns()
+
+    def args(self, values: Mapping[str, Any]) -> List[Any]:
+        return [processor(values[name]) if processor else values[name] for name, processor in self._params]
+
+    def process(self, record) -> Row:
+        return {
+            name: processor(value) if processor else value
+            for (name, processor), value in zip(self._columns, record.values())
+        }
+
+
+class DatabaseRouter:
+    """Databases of one storage, writes go to primary and reads to replica if any.
+
+    After the first write reads go to primary too, so the rest of request
+    sees its own changes whatever replication lag is.
+    """
+
+    __slots__ = ("_primary", "_replica", "_written")
+
+    def __init__(self, primary: Database, replica: Optional[Database] = None) -> None:
+        self._primary = primary
+        self._replica = replica
+        self._written = False
+
+    def for_write(self) -> Database:
+        self._written = True
+
+        return self._primary
+
+    def for_read(self) -> Database:
+        if self._replica is None or self._written:
+            return self._primary
+
+        return self._replica
 
 
 class DBRepo(metaclass=ABCMeta):
-    def __init__(self, database: Database):
-        self._database = database
+    # Shared by repositories of all requests, shapes of queries are finite.
+    _statements: ClassVar[Dict[Tuple[type, Hashable], Statement]] = {}
+
+    def __init__(self, database: Database, router: Optional[DatabaseRouter] = None):
+        self._router = router or DatabaseRouter(database)
+        self._dialect = database._backend._dialect
+
+    def _writer(self) -> Database:
+        """Primary database for a write, reads of the storage go to primary from now on."""
+        return self._router.for_write()
+
+    @property
+    def _reader(self) -> Database:
+        return self._router.for_read()
 
     @abstractmethod
     def _get_query(self, *args, **kwargs) -> Query:
@@ -15,3 +138,41 @@ class DBRepo(metaclass=ABCMeta):
     @abstractmethod
     def _process_row(self, row, *args, **kwargs):
         raise NotImplementedError()
+
+    def _prepare(self, shape: Hashable, build: Callable[[], Query]) -> Statement:
+        """Get statement for query shape, building and compiling query only once.
+
+        asyncpg keeps prepared statements per connection by SQL text, so
+        stable SQL also means server-side prepare once per connection.
+        """
+        key = (type(self), shape)
+
+        statement = self._statements.get(key)
+        if statement is None:
+            statement = Statement(build(), self._dialect)
+            self._statements[key] = statement
+
+        return statement
+
+    async def _fetch_all(self, statement: Statement, values: Mapping[str, Any]) -> List[Row]:
+        async with self._reader.connection() as connection:
+            records = await connection.raw_connection.fetch(statement.sql, *statement.args(values))
+
+        return [statement.process(record) for record in records]
+
+    async def _fetch_one(self, statement: Statement, values: Mapping[str, Any]) -> Optional[Row]:
+        async with self._reader.connection() as connection:
+            record = await connection.raw_connection.fetchrow(statement.sql, *statement.args(values))
+
+        return statement.process(record) if record else None
+
+    async def _iterate_records(self, statement: Statement, values: Mapping[str, Any]) -> AsyncGenerator[Any, None]:
+        """Stream asyncpg records as is, values keep database types and column order of query."""
+        async with self._reader.connection() as connection:
+            async with connection.transaction():
+                async for record in connection.raw_connection.cursor(statement.sql, *statement.args(values)):
+                    yield record
+
+    async def _iterate(self, statement: Statement, values: Mapping[str, Any]) -> AsyncGenerator[Row, None]:
+        async for record in self._iterate_records(statement, values):
+            yield statement.process(record)
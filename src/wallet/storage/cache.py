@@ -0,0 +1,155 @@
+import copy
+import time
+from collections import OrderedDict
+from typing import Any, AsyncGenerator, Dict, Generic, Optional, Tuple
+
+import config  # type: ignore
+from aiohttp import web
+from passport.domain import User
+from prometheus_client import Counter  # type: ignore
+
+from wallet.core.storage.base import E, F, Repo
+from wallet.storage.loader import Loader
+
+
+# Shared by caches of all applications in the process, registering again would fail.
+CACHE_HITS = Counter("wallet_storage_cache_hits", "Entities served from cache", ["repo"])
+CACHE_MISSES = Counter("wallet_storage_cache_misses", "Entities missed in cache", ["repo"])
+
+
+def snapshot(entity: E) -> E:
+    """Copy of entity not sharing tags, ledger or any other mutable state, user is shared as is."""
+    return copy.deepcopy(entity, {id(entity.user): entity.user})  # type: ignore
+
+
+class CacheConfig(config.Config):
+    enabled = config.BoolField(default=False, env="CACHE_ENABLED")
+    size = config.IntField(default=1024, env="CACHE_SIZE")
+    ttl = config.IntField(default=60, env="CACHE_TTL")
+
+
+class EntityCache(Generic[E]):
+    """Entities of recently active users, bounded by users count and age.
+
+    Each user has own bucket, so writes of the user drop only that user's
+    entities. Entities are stored and returned as copies, callers are free to
+    change instances they get.
+    """
+
+    def __init__(self, name: str, size: int, ttl: float, hits: Counter, misses: Counter) -> None:
+        self._size = size
+        self._ttl = ttl
+
+        self._buckets: "OrderedDict[int, Tuple[float, Dict[int, E]]]" = OrderedDict()
+
+        self._hits = hits.labels(repo=name)
+        self._misses = misses.labels(repo=name)
+
+    def _bucket(self, user: User) -> Optional[Dict[int, E]]:
+        item = self._buckets.get(user.key)
+        if item is None:
+            return None
+
+        expires, entities = item
+        if expires < time.monotonic():
+            del self._buckets[user.key]
+            return None
+
+        self._buckets.move_to_end(user.key)
+
+        return entities
+
+    def get(self, user: User, key: int) -> Optional[E]:
+        bucket = self._bucket(user)
+
+        if bucket is None or key not in bucket:
+            self._misses.inc()
+            return None
+
+        self._hits.inc()
+
+        return snapshot(bucket[key])
+
+    def put(self, user: User, entity: E) -> None:
+        bucket = self._bucket(user)
+
+        if bucket is None:
+            bucket = {}
+            self._buckets[user.key] = (time.monotonic() + self._ttl, bucket)
+
+            while len(self._buckets) > self._size:
+                self._buckets.popitem(last=False)
+
+        bucket[entity.key] = snapshot(entity)
+
+    def invalidate(self, user: User) -> None:
+        self._buckets.pop(user.key, None)
+
+
+class CachedRepo(Repo[E, F]):
+    """Read-through cache around repository, shares entities between requests of worker.
+
+    Entities served from cache are registered in identity map of repository,
+    so one storage still gets one instance per key. Other repository methods
+    are passed through as is.
+    """
+
+    def __init__(self, repo: Repo[E, F], cache: EntityCache[E], loader: Loader[E]) -> None:
+        self._repo = repo
+        self._cache = cache
+        self._loader = loader
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._repo, name)
+
+    async def fetch(self, filters: F) -> AsyncGenerator[E, None]:
+        # Only lookups by keys could be answered from cache.
+        if filters.keys and not getattr(filters, "name", None) and not getattr(filters, "names", None):
+            entities = [self._cache.get(filters.user, key) for key in filters.keys]
+
+            if all(entity is not None for entity in entities):
+                for entity in entities:
+                    yield self._loader.prime(filters.user, entity)  # type: ignore
+                return
+
+        async for entity in self._repo.fetch(filters):
+            self._cache.put(filters.user, entity)
+
+            yield entity
+
+    async def fetch_by_key(self, user: User, key: int) -> E:
+        entity = self._cache.get(user, key)
+
+        if entity is None:
+            entity = await self._repo.fetch_by_key(user, key)
+            self._cache.put(user, entity)
+
+            return entity
+
+        return self._loader.prime(user, entity)
+
+    async def exists(self, filters: F) -> bool:
+        return await self._repo.exists(filters)
+
+    async def save(self, entity: E) -> int:
+        key = await self._repo.save(entity)
+        self._cache.invalidate(entity.user)  # type: ignore
+
+        return key
+
+    async def remove(self, entity: E) -> bool:
+        removed = await self._repo.remove(entity)
+        self._cache.invalidate(entity.user)  # type: ignore
+
+        return removed
+
+
+class StorageCache:
+    def __init__(self, config: CacheConfig, hits: Counter = CACHE_HITS, misses: Counter = CACHE_MISSES) -> None:
+        self.accounts: EntityCache = EntityCache("accounts", config.size, config.ttl, hits, misses)
+        self.categories: EntityCache = EntityCache("categories", config.size, config.ttl, hits, misses)
+
+
+def setup(app: web.Application, config: CacheConfig) -> None:
+    if config.enabled:
+        app["storage_cache"] = StorageCache(config)
@@ -1,13 +1,17 @@
 from datetime import datetime
+from typing import Iterable, List, Optional
 
 import sqlalchemy  # type: ignore
 from aiohttp_storage.storage import metadata  # type: ignore
 from databases import Database
 from passport.domain import User
+from sqlalchemy.dialects.postgresql import insert  # type: ignore
 from sqlalchemy.orm import Query  # type: ignore
 
 from wallet.core.entities import Category, CategoryFilters, CategoryStream
 from wallet.core.storage.categories import CategoryRepo
+from wallet.storage.base import any_of, DatabaseRouter, DBRepo
+from wallet.storage.loader import Loader
 
 
 categories = sqlalchemy.Table(
@@ -18,6 +22,8 @@ categories = sqlalchemy.Table(
     sqlalchemy.Column("user", sqlalchemy.Integer),
     sqlalchemy.Column("enabled", sqlalchemy.Boolean, default=True),
     sqlalchemy.Column("created_on", sqlalchemy.DateTime, default=datetime.utcnow),
+    # Removed rows are kept disabled, only enabled ones take part in lookups and keep names unique.
+    sqlalchemy.Index("categories_name_idx", "user", "name", unique=True, postgresql_where=sqlalchemy.text("enabled")),
 )
 
 
@@ -38,15 +44,19 @@ category_tags = sqlalchemy.Table(
         nullable=False,
         primary_key=True,
     ),
+    sqlalchemy.Index("category_tags_tag_idx", "tag_id"),
 )
 
 
-class CategoryDBRepo(CategoryRepo):
-    def __init__(self, database: Database) -> None:
-        self._database = database
+class CategoryDBRepo(DBRepo, CategoryRepo):
+    def __init__(self, database: Database, router: Optional[DatabaseRouter] = None) -> None:
+        super().__init__(database=database, router=router)
+        self._loader: Loader[Category] = Loader(self._fetch_many)
 
     def _get_query(self, *, user: User) -> Query:
-        query = sqlalchemy.select([categories.c.id, categories.c.name]).where(categories.c.user == user.key)
+        query = sqlalchemy.select([categories.c.id, categories.c.name]).where(
+            sqlalchemy.and_(categories.c.user == user.key, categories.c.enabled == True)  # noqa:E712
+        )
 
         return query
 
@@ -59,19 +69,39 @@ class CategoryDBRepo(CategoryRepo):
     async def fetch(self, filters: CategoryFilters) -> CategoryStream:
         query = self._get_query(user=filters.user)
 
-        if filters.keys:
+        if filters.keys and filters.names:
+            query = query.where(
+                sqlalchemy.or_(categories.c.id.in_(filters.keys), categories.c.name.in_(list(filters.names)))
+            )
+        elif filters.keys:
             query = query.where(categories.c.id.in_(filters.keys))
+        elif filters.names:
+            query = query.where(categories.c.name.in_(list(filters.names)))
+
+        async for row in self._reader.iterate(query=query):
+            yield self._loader.prime(filters.user, self._process_row(row, user=filters.user))
+
+    async def _fetch_many(self, user: User, keys: List[int]) -> List[Category]:
+        statement = self._prepare(
+            "fetch_many",
+            lambda: sqlalchemy.select([categories.c.id, categories.c.name]).where(
+                sqlalchemy.and_(
+                    categories.c.user == sqlalchemy.bindparam("user"),
+                    categories.c.enabled == True,  # noqa:E712
+                    any_of(categories.c.id, "keys"),
+                )
+            ),
+        )
 
-        async for row in self._database.iterate(query=query):
-            yield self._process_row(row, user=filters.user)
+        rows = await self._fetch_all(statement, {"user": user.key, "keys": keys})
 
-    async def fetch_by_key(self, user: User, key: int) -> Category:
-        row = await self._database.fetch_one(query=self._get_query(user=user).where(categories.c.id == key))
+        return [self._process_row(row, user=user) for row in rows]
 
-        return self._process_row(row, user=user)
+    async def fetch_by_key(self, user: User, key: int) -> Category:
+        return await self._loader.load(user, key)
 
     async def fetch_by_name(self, user: User, name: str) -> Category:
-        row = await self._database.fetch_one(query=self._get_query(user=user).where(categories.c.name == name))
+        row = await self._reader.fetch_one(query=self._get_query(user=user).where(categories.c.name == name))
 
         return self._process_row(row, user=user)
 
@@ -79,20 +109,72 @@ class CategoryDBRepo(CategoryRepo):
         query = (
             sqlalchemy.select([sqlalchemy.func.count(categories.c.id)])
             .select_from(categories)
-            .where(sqlalchemy.and_(categories.c.user == filters.user.key, categories.c.name == filters.name,))
+            .where(
+                sqlalchemy.and_(
+                    categories.c.user == filters.user.key,
+                    categories.c.name == filters.name,
+                    categories.c.enabled == True,  # noqa:E712
+                )
+            )
         )
 
-        exists = await self._database.fetch_val(query=query)
+        exists = await self._reader.fetch_val(query=query)
 
         return exists > 0
 
     async def save(self, entity: Category) -> int:
-        key = await self._database.execute(
+        key = await self._writer().execute(
             categories.insert().returning(categories.c.id),
             values={"name": entity.name, "user": entity.user.key, "enabled": True, "created_on": datetime.now()},
         )
 
         return key
 
+    async def save_many_by_name(self, user: User, names: Iterable[str]) -> CategoryStream:
+        """Get or create categories by names with two queries.
+
+        Names taken by concurrent transaction are skipped by insert, which
+        waits for that transaction to finish, and then picked up by fetch.
+        """
+        names = set(names)
+        if not names:
+            return
+
+        now = datetime.now()
+        query = (
+            insert(categories)
+            .values([{"name": name, "user": user.key, "enabled": True, "created_on": now} for name in names])
+            .on_conflict_do_nothing(
+                index_elements=[categories.c.user, categories.c.name], index_where=sqlalchemy.text("enabled")
+            )
+            .returning(categories.c.id, categories.c.name)
+        )
+
+        for row in await self._writer().fetch_all(query=query):
+            names.discard(row["name"])
+
+            yield self._loader.prime(user, self._process_row(row, user=user))
+
+        if names:
+            query = self._get_query(user=user).where(categories.c.name.in_(list(names)))
+
+            async for row in self._reader.iterate(query=query):
+                yield self._loader.prime(user, self._process_row(row, user=user))
+
     async def remove(self, entity: Category) -> bool:
-        pass
+        """Soft delete, name of category becomes free for new one."""
+        key = await self._writer().fetch_val(
+            categories.update()
+            .where(
+                sqlalchemy.and_(
+                    categories.c.id == entity.key,
+                    categories.c.user == entity.user.key,
+                    categories.c.enabled == True,  # noqa:E712
+                )
+            )
+            .values(enabled=False)
+            .returning(categories.c.id)
+        )
+        self._loader.forget(entity.user, entity.key)
+
+        return key is not None
@@ -0,0 +1,93 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Iterable, List, Set, Tuple, TypeVar
+
+from aiohttp_micro.core.exceptions import EntityNotFound
+from passport.domain import User
+
+from wallet.core.entities import Entity
+
+
+E = TypeVar("E", bound=Entity)
+
+FetchMany = Callable[[User, List[int]], Awaitable[Iterable[E]]]
+
+
+class Loader(Generic[E]):
+    """Identity map with batched loading of entities by key.
+
+    Keys requested by coroutines running in the same event loop tick are
+    fetched together with one `fetch_many` call, already loaded entities are
+    returned without touching database. Lives as long as the storage which owns
+    it, so usually for one request.
+    """
+
+    def __init__(self, fetch_many: FetchMany) -> None:
+        self._fetch_many = fetch_many
+
+        self._entities: Dict[Tuple[int, int], E] = {}
+        self._pending: Dict[int, Dict[int, asyncio.Future]] = {}
+        self._users: Dict[int, User] = {}
+        self._scheduled = False
+
+        # Event loop keeps only weak references to tasks, running batches are held here.
+        self._tasks: Set[asyncio.Future] = set()
+
+    def prime(self, user: User, entity: E) -> E:
+        """Register entity in identity map and return canonical instance."""
+        return self._entities.setdefault((user.key, entity.key), entity)
+
+    def forget(self, user: User, key: int) -> None:
+        self._entities.pop((user.key, key), None)
+
+    async def load(self, user: User, key: int) -> E:
+        if (user.key, key) in self._entities:
+            return self._entities[(user.key, key)]
+
+        pending = self._pending.setdefault(user.key, {})
+        if key not in pending:
+            pending[key] = asyncio.get_event_loop().create_future()
+            self._users[user.key] = user
+
+            if not self._scheduled:
+                self._scheduled = True
+                asyncio.get_event_loop().call_soon(self._dispatch)
+
+        return await pending[key]
+
+    def _dispatch(self) -> None:
+        pending, self._pending = self._pending, {}
+        users, self._users = self._users, {}
+        self._scheduled = False
+
+        for user_key, futures in pending.items():
+            task = asyncio.ensure_future(self._load_batch(users[user_key], futures))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _load_batch(self, user: User, futures: Dict[int, asyncio.Future]) -> None:
+        """Resolve futures of batch, errors of fetch are passed to coroutines waiting for them."""
+        try:
+            entities = await self._fetch_many(user, list(futures))
+        except Exception as exc:
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        except BaseException:
+            for future in futures.values():
+                future.cancel()
+            raise
+
+        self._resolve(user, futures, entities)
+
+    def _resolve(self, user: User, futures: Dict[int, asyncio.Future], entities: Iterable[E]) -> None:
+        for entity in entities:
+            entity = self.prime(user, entity)
+
+            future = futures.pop(entity.key, None)
+            if future and not future.done():
+                future.set_result(entity)
+
+        for future in futures.values():
+            if not future.done():
+                future.set_exception(EntityNotFound())
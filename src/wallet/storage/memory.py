@@ -0,0 +1,477 @@
+"""Storage kept in process memory.
+
+Behaves like `DBStorage` without any I/O, so service and balance logic could
+be benchmarked and tested in isolation. Every read builds new instances, like
+rows read from database do, so callers never share state with the storage.
+"""
+import heapq
+import itertools
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import (
+    AsyncGenerator,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+from aiohttp_micro.core.exceptions import EntityNotFound
+from passport.domain import User
+
+from wallet.core.entities import (
+    Account,
+    AccountFilters,
+    Balance,
+    BalanceFilters,
+    BalanceKind,
+    Category,
+    CategoryFilters,
+    CategoryStream,
+    EntityBalanceStream,
+    Operation,
+    OperationDependencies,
+    OperationFilters,
+    OperationStream,
+    OperationType,
+    Tag,
+    TagFilters,
+)
+from wallet.core.storage import Storage
+from wallet.core.storage.accounts import AccountRepo
+from wallet.core.storage.balances import BalanceRepo
+from wallet.core.storage.categories import CategoryRepo
+from wallet.core.storage.operations import OperationRepo
+from wallet.core.storage.tags import TagRepo
+from wallet.core.tools import Cents, month_ordinal, month_range, month_start, ordinal_month
+
+
+N = TypeVar("N", Account, Category, Tag)
+
+
+class NamedMemoryRepo(Generic[N]):
+    """Entities with unique name per user, removed ones are kept disabled."""
+
+    def __init__(self) -> None:
+        self._keys = itertools.count(1)
+
+        self._entities: Dict[int, N] = {}
+        self._enabled: Dict[int, bool] = {}
+        self._by_user: Dict[int, Dict[str, int]] = defaultdict(dict)
+
+    def _build(self, entity: N) -> N:
+        # Tags of categories are loaded separately, like database repositories do.
+        built = type(entity)(name=entity.name, user=entity.user)
+        built.key = entity.key
+
+        return built
+
+    def _get(self, user: User, key: int) -> Optional[N]:
+        entity = self._entities.get(key)
+
+        if entity is None or entity.user.key != user.key or not self._enabled[key]:
+            return None
+
+        return entity
+
+    def _select(self, user: User, keys: Iterable[int] = (), names: Iterable[str] = ()) -> List[N]:
+        """Enabled entities of user with any of keys or names, all of them without both."""
+        by_name = self._by_user.get(user.key, {})
+
+        if not keys and not names:
+            selected = sorted(by_name.values())
+        else:
+            selected = sorted(set(keys) | {by_name[name] for name in names if name in by_name})
+
+        return [entity for entity in (self._get(user, key) for key in selected) if entity is not None]
+
+    async def fetch_by_key(self, user: User, key: int) -> N:
+        entity = self._get(user, key)
+        if entity is None:
+            raise EntityNotFound()
+
+        return self._build(entity)
+
+    async def fetch_by_name(self, user: User, name: str) -> N:
+        key = self._by_user.get(user.key, {}).get(name)
+        if key is None:
+            raise EntityNotFound()
+
+        return self._build(self._entities[key])
+
+    async def save(self, entity: N) -> int:
+        key = next(self._keys)
+
+        stored = type(entity)(name=entity.name, user=entity.user)
+        stored.key = key
+
+        self._entities[key] = stored
+        self._enabled[key] = True
+        self._by_user[entity.user.key][entity.name] = key
+
+        return key
+
+    async def remove(self, entity: N) -> bool:
+        stored = self._get(entity.user, entity.key)
+        if stored is None:
+            return False
+
+        self._enabled[entity.key] = False
+        del self._by_user[entity.user.key][stored.name]
+
+        return True
+
+
+class AccountMemoryRepo(NamedMemoryRepo[Account], AccountRepo):
+    async def fetch(self, filters: AccountFilters) -> AsyncGenerator[Account, None]:
+        names = [filters.name] if filters.name else []
+
+        for account in self._select(filters.user, filters.keys, names):
+            yield self._build(account)
+
+    async def exists(self, filters: AccountFilters) -> bool:
+        return filters.name in self._by_user.get(filters.user.key, {})
+
+
+class TagMemoryRepo(NamedMemoryRepo[Tag], TagRepo):
+    def __init__(self) -> None:
+        super().__init__()
+
+        # Links of tags, filled by operations and categories repositories.
+        self.operations: Dict[int, List[int]] = defaultdict(list)
+        self.categories: Dict[int, List[int]] = defaultdict(list)
+
+    async def fetch(self, filters: TagFilters) -> AsyncGenerator[Tag, None]:
+        names = [filters.name] if filters.name else []
+
+        for tag in self._select(filters.user, filters.keys, names):
+            yield self._build(tag)
+
+    async def exists(self, filters: TagFilters) -> bool:
+        return filters.name in self._by_user.get(filters.user.key, {})
+
+    def _fetch_owned(self, links: Dict[int, List[int]], user: User, keys: List[int]) -> Dict[int, List[Tag]]:
+        tags: Dict[int, Tag] = {}
+        result: Dict[int, List[Tag]] = defaultdict(list)
+
+        for owner in keys:
+            for key in links.get(owner, []):
+                if key not in tags:
+                    tag = self._get(user, key)
+                    if tag is None:
+                        continue
+                    tags[key] = self._build(tag)
+
+                result[owner].append(tags[key])
+
+            result[owner].sort(key=lambda tag: tag.name)
+
+        return result
+
+    async def fetch_for_operations(self, user: User, keys: List[int]) -> Dict[int, List[Tag]]:
+        return self._fetch_owned(self.operations, user, keys)
+
+    async def fetch_for_categories(self, user: User, keys: List[int]) -> Dict[int, List[Tag]]:
+        return self._fetch_owned(self.categories, user, keys)
+
+
+class CategoryMemoryRepo(NamedMemoryRepo[Category], CategoryRepo):
+    def __init__(self, tags: TagMemoryRepo) -> None:
+        super().__init__()
+
+        self._tags = tags
+
+    async def fetch(self, filters: CategoryFilters) -> CategoryStream:
+        names = list(filters.names)
+        if filters.name:
+            names.append(filters.name)
+
+        for category in self._select(filters.user, filters.keys, names):
+            yield self._build(category)
+
+    async def exists(self, filters: CategoryFilters) -> bool:
+        return filters.name in self._by_user.get(filters.user.key, {})
+
+    async def save(self, entity: Category) -> int:
+        key = await super().save(entity)
+        self._tags.categories[key] = [tag.key for tag in entity.tags]
+
+        return key
+
+    async def save_many_by_name(self, user: User, names: Iterable[str]) -> CategoryStream:
+        by_name = self._by_user.get(user.key, {})
+
+        for name in set(names):
+            if name not in by_name:
+                await self.save(Category(name=name, user=user))
+
+            yield self._build(self._entities[self._by_user[user.key][name]])
+
+
+class BalanceMemoryRepo(BalanceRepo):
+    """Incomes and expenses of entities by month, rests are summed up on read."""
+
+    def __init__(self) -> None:
+        self.monthly: Dict[Tuple[BalanceKind, int], Dict[int, List[Cents]]] = defaultdict(dict)
+
+    async def register(
+        self, user: User, kind: BalanceKind, entity_id: int, month: date, incomes: Cents, expenses: Cents,
+    ) -> None:
+        totals = self.monthly[(kind, entity_id)].setdefault(month_ordinal(month), [0, 0])
+
+        totals[0] += incomes
+        totals[1] += expenses
+
+        # Month without operations left, database would not aggregate it at all.
+        if totals == [0, 0]:
+            del self.monthly[(kind, entity_id)][month_ordinal(month)]
+
+    async def fetch(self, filters: BalanceFilters) -> AsyncGenerator[Balance, None]:
+        if len(filters.keys) != 1:
+            raise ValueError("Balance could be fetched only for single entity")
+
+        monthly = self.monthly.get((filters.kind, filters.keys[0]), {})
+
+        end = month_start(filters.end or date.today())
+        start = month_start(filters.start or end)
+
+        first = month_ordinal(start)
+        rest = sum(incomes - expenses for ordinal, (incomes, expenses) in monthly.items() if ordinal < first)
+
+        for month in month_range(start, end):
+            incomes, expenses = monthly.get(month_ordinal(month), (0, 0))
+            rest += incomes - expenses
+
+            yield Balance(month=month, incomes=incomes, expenses=expenses, rest=rest)
+
+
+@dataclass
+class OperationRow:
+    key: int
+    user: User
+    amount: Cents
+    operation_type: OperationType
+    description: str
+    account: int
+    category: Optional[int]
+    created_on: datetime
+    tags: List[int] = field(default_factory=list)
+    enabled: bool = True
+
+
+class OperationMemoryRepo(OperationRepo):
+    """Operations with secondary indexes by user, account, category and month.
+
+    Lookups start from the smallest index matching filters, rest of filters
+    is checked row by row.
+    """
+
+    def __init__(
+        self,
+        accounts: AccountMemoryRepo,
+        categories: CategoryMemoryRepo,
+        tags: TagMemoryRepo,
+        balances: BalanceMemoryRepo,
+    ) -> None:
+        self._accounts = accounts
+        self._categories = categories
+        self._tags = tags
+        self._balances = balances
+
+        self._keys = itertools.count(1)
+        self._rows: Dict[int, OperationRow] = {}
+
+        self._by_user: Dict[int, Set[int]] = defaultdict(set)
+        self._by_account: Dict[int, Set[int]] = defaultdict(set)
+        self._by_category: Dict[int, Set[int]] = defaultdict(set)
+        self._by_month: Dict[Tuple[int, int], Set[int]] = defaultdict(set)
+
+    def _process_row(self, row: OperationRow) -> Operation:
+        operation = Operation(
+            amount=row.amount, description=row.description, operation_type=row.operation_type, user=row.user,
+        )
+        operation.key = row.key
+        operation.created_on = row.created_on
+
+        return operation
+
+    def _candidates(self, filters: OperationFilters) -> Set[int]:
+        indexes = [self._by_user.get(filters.user.key, set())]
+
+        if filters.keys:
+            indexes.append(set(filters.keys))
+        if filters.account:
+            indexes.append(self._by_account.get(filters.account, set()))
+        if filters.category:
+            indexes.append(self._by_category.get(filters.category, set()))
+        if filters.month:
+            indexes.append(self._by_month.get((filters.user.key, month_ordinal(filters.month)), set()))
+
+        return min(indexes, key=len)
+
+    def _select(self, filters: OperationFilters) -> List[OperationRow]:
+        """Enabled rows matching filters, latest first, the same order database uses."""
+        conditions: List[Callable[[OperationRow], bool]] = [
+            lambda row: row.enabled,
+            lambda row: row.user.key == filters.user.key,
+        ]
+
+        if filters.keys:
+            keys = set(filters.keys)
+            conditions.append(lambda row: row.key in keys)
+        if filters.account:
+            account = filters.account
+            conditions.append(lambda row: row.account == account)
+        if filters.category:
+            category = filters.category
+            conditions.append(lambda row: row.category == category)
+        if filters.month:
+            month = month_ordinal(filters.month)
+            conditions.append(lambda row: month_ordinal(row.created_on) == month)
+        if filters.tags:
+            tags = {tag.key for tag in filters.tags}
+            conditions.append(lambda row: not tags.isdisjoint(row.tags))
+        if filters.cursor:
+            cursor = (filters.cursor.created_on, filters.cursor.key)
+            conditions.append(lambda row: (row.created_on, row.key) < cursor)
+
+        rows = (self._rows[key] for key in self._candidates(filters))
+        matched = (row for row in rows if all(condition(row) for condition in conditions))
+
+        def order(row: OperationRow) -> Tuple[datetime, int]:
+            return (row.created_on, row.key)
+
+        if filters.limit:
+            return heapq.nlargest(filters.limit, matched, key=order)
+
+        return sorted(matched, key=order, reverse=True)
+
+    async def fetch(self, filters: OperationFilters) -> OperationStream:
+        for row in self._select(filters):
+            yield self._process_row(row), OperationDependencies(account=row.account, category=row.category)
+
+    async def fetch_detailed(self, filters: OperationFilters) -> AsyncGenerator[Operation, None]:
+        accounts: Dict[int, Account] = {}
+        categories: Dict[int, Category] = {}
+
+        for row in self._select(filters):
+            operation = self._process_row(row)
+
+            if row.account not in accounts:
+                accounts[row.account] = self._accounts._build(self._accounts._entities[row.account])
+            operation.account = accounts[row.account]
+
+            if row.category is not None:
+                if row.category not in categories:
+                    categories[row.category] = self._categories._build(self._categories._entities[row.category])
+                operation.category = categories[row.category]
+
+            yield operation
+
+    async def fetch_by_key(self, user: User, key: int) -> Operation:
+        row = self._rows.get(key)
+        if row is None or row.user.key != user.key or not row.enabled:
+            raise EntityNotFound()
+
+        return self._process_row(row)
+
+    async def exists(self, filters: OperationFilters) -> bool:
+        return bool(self._select(filters))
+
+    async def _register(self, row: OperationRow, sign: int) -> None:
+        incomes, expenses = 0, 0
+        if row.operation_type == OperationType.income:
+            incomes = sign * row.amount
+        elif row.operation_type == OperationType.expense:
+            expenses = sign * row.amount
+
+        month = month_start(row.created_on)
+        for kind, key in ((BalanceKind.account, row.account), (BalanceKind.category, row.category)):
+            if key:
+                await self._balances.register(row.user, kind, key, month, incomes, expenses)
+
+    async def save(self, entity: Operation) -> int:
+        row = OperationRow(
+            key=next(self._keys),
+            user=entity.user,
+            amount=entity.amount,
+            operation_type=entity.operation_type,
+            description=entity.description,
+            account=entity.account.key,
+            category=entity.category.key if entity.category else None,
+            created_on=entity.created_on,
+            tags=[tag.key for tag in entity.tags],
+        )
+
+        self._rows[row.key] = row
+        self._by_user[row.user.key].add(row.key)
+        self._by_account[row.account].add(row.key)
+        if row.category is not None:
+            self._by_category[row.category].add(row.key)
+        self._by_month[(row.user.key, month_ordinal(row.created_on))].add(row.key)
+
+        if row.tags:
+            self._tags.operations[row.key] = row.tags
+
+        await self._register(row, 1)
+
+        return row.key
+
+    async def save_many(self, entities: List[Operation]) -> List[int]:
+        return [await self.save(entity) for entity in entities]
+
+    async def remove(self, entity: Operation) -> bool:
+        row = self._rows.get(entity.key)
+        if row is None or row.user.key != entity.user.key or not row.enabled:
+            return False
+
+        row.enabled = False
+        await self._register(row, -1)
+
+        return True
+
+    async def fetch_balance(self, filters: BalanceFilters) -> EntityBalanceStream:
+        end = month_ordinal(filters.end or date.today())
+
+        for key in filters.keys:
+            monthly = {
+                ordinal: totals
+                for ordinal, totals in self._balances.monthly.get((filters.kind, key), {}).items()
+                if ordinal <= end
+            }
+
+            start = end
+            if filters.start:
+                start = month_ordinal(filters.start)
+            elif monthly:
+                start = min(monthly)
+
+            rest = sum(incomes - expenses for ordinal, (incomes, expenses) in monthly.items() if ordinal < start)
+
+            for ordinal in range(start, end + 1):
+                month = ordinal_month(ordinal)
+
+                if ordinal in monthly:
+                    incomes, expenses = monthly[ordinal]
+                    rest += incomes - expenses
+
+                    yield key, Balance(month=month, incomes=incomes, expenses=expenses, rest=rest)
+                else:
+                    yield key, Balance(month=month, rest=rest)
+
+
+class MemoryStorage(Storage):
+    def __init__(self) -> None:
+        self.accounts = AccountMemoryRepo()
+        self.balances = BalanceMemoryRepo()
+        self.tags = TagMemoryRepo()
+        self.categories = CategoryMemoryRepo(tags=self.tags)
+        self.operations = OperationMemoryRepo(
+            accounts=self.accounts, categories=self.categories, tags=self.tags, balances=self.balances,
+        )
@@ -7,6 +7,7 @@ from alembic import context  # type: ignore
 from sqlalchemy import engine_from_config, pool  # type: ignore
 
 from wallet.storage.accounts import accounts  # noqa: F401
+from wallet.storage.balances import balances  # noqa: F401
 from wallet.storage.categories import categories, category_tags  # noqa: F401
 from wallet.storage.operations import operations  # noqa: F401
 from wallet.storage.tags import tags  # noqa: F401
@@ -0,0 +1,62 @@
+"""Balances
+
+Revision ID: 5b7c3a9e21d4
+Revises: 1d57e04679ca
+Create Date: 2026-10-17 12:04:18.312907
+
+"""
+
+import sqlalchemy as sa  # type: ignore
+from alembic import op  # type: ignore
+
+revision = "5b7c3a9e21d4"
+down_revision = "1d57e04679ca"
+branch_labels = None
+depends_on = None
+
+
+BACKFILL = """
+INSERT INTO balances (kind, entity_id, "user", month, incomes, expenses, rest)
+SELECT
+    '{kind}',
+    monthly.entity_id,
+    monthly.user,
+    monthly.month,
+    monthly.incomes,
+    monthly.expenses,
+    SUM(monthly.incomes - monthly.expenses) OVER (PARTITION BY monthly.entity_id ORDER BY monthly.month)
+FROM (
+    SELECT
+        {column} AS entity_id,
+        "user",
+        date_trunc('month', created_on)::date AS month,
+        SUM(CASE WHEN type = 'income' THEN amount ELSE 0 END) AS incomes,
+        SUM(CASE WHEN type = 'expense' THEN amount ELSE 0 END) AS expenses
+    FROM operations
+    WHERE enabled = TRUE AND {column} IS NOT NULL
+    GROUP BY {column}, "user", date_trunc('month', created_on)
+) AS monthly
+"""
+
+
+def upgrade():
+    op.create_table(
+        "balances",
+        sa.Column("kind", sa.Enum("account", "category", name="balancekind"), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("user", sa.Integer(), nullable=True),
+        sa.Column("incomes", sa.Numeric(precision=20, scale=2), nullable=False),
+        sa.Column("expenses", sa.Numeric(precision=20, scale=2), nullable=False),
+        sa.Column("rest", sa.Numeric(precision=20, scale=2), nullable=False),
+        sa.PrimaryKeyConstraint("kind", "entity_id", "month"),
+    )
+
+    op.execute(BACKFILL.format(kind="account", column="account_id"))
+    op.execute(BACKFILL.format(kind="category", column="category_id"))
+
+
+def downgrade():
+    op.drop_table("balances")
+
+    op.execute("DROP TYPE balancekind;")
@@ -0,0 +1,40 @@
+"""Operations search indexes
+
+Revision ID: 8e2f6c4d0a17
+Revises: 5b7c3a9e21d4
+Create Date: 2026-10-17 15:42:09.118203
+
+"""
+
+import sqlalchemy as sa  # type: ignore
+from alembic import op  # type: ignore
+
+revision = "8e2f6c4d0a17"
+down_revision = "5b7c3a9e21d4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "operations_user_created_idx",
+        "operations",
+        ["user", "enabled", sa.text("created_on DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "operations_account_created_idx", "operations", ["account_id", "created_on"], unique=False,
+    )
+    op.create_index(
+        "operations_category_created_idx", "operations", ["category_id", "created_on"], unique=False,
+    )
+    op.create_index(
+        "category_tags_tag_idx", "category_tags", ["tag_id"], unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index("category_tags_tag_idx", table_name="category_tags")
+    op.drop_index("operations_category_created_idx", table_name="operations")
+    op.drop_index("operations_account_created_idx", table_name="operations")
+    op.drop_index("operations_user_created_idx", table_name="operations")
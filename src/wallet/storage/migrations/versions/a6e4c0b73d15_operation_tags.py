@@ -0,0 +1,41 @@
+"""Operation tags
+
+Revision ID: a6e4c0b73d15
+Revises: f3b8d2a6c914
+Create Date: 2026-10-17 21:05:44.902318
+
+"""
+
+import sqlalchemy as sa  # type: ignore
+from alembic import op  # type: ignore
+
+revision = "a6e4c0b73d15"
+down_revision = "f3b8d2a6c914"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "operation_tags",
+        sa.Column("operation_id", sa.Integer(), nullable=False),
+        sa.Column("tag_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["tag_id"], ["tags.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("operation_id", "tag_id"),
+    )
+    op.create_index(
+        "operation_tags_tag_idx", "operation_tags", ["tag_id"], unique=False,
+    )
+
+    op.drop_index("tags_name_idx", table_name="tags")
+    op.create_index(
+        "tags_name_idx", "tags", ["user", "name"], unique=True, postgresql_where=sa.text("enabled"),
+    )
+
+
+def downgrade():
+    op.drop_index("tags_name_idx", table_name="tags")
+    op.create_index("tags_name_idx", "tags", ["name", "user", "enabled"], unique=True)
+
+    op.drop_index("operation_tags_tag_idx", table_name="operation_tags")
+    op.drop_table("operation_tags")
@@ -0,0 +1,106 @@
+"""Partition operations by month
+
+Revision ID: c41d9b7e5f28
+Revises: 8e2f6c4d0a17
+Create Date: 2026-10-17 18:21:36.540172
+
+"""
+from datetime import date
+
+from alembic import op  # type: ignore
+
+from wallet.core.tools import month_ordinal, ordinal_month
+
+revision = "c41d9b7e5f28"
+down_revision = "8e2f6c4d0a17"
+branch_labels = None
+depends_on = None
+
+
+# Months ahead of current one partitioned right away, later ones are created
+# by `wallet partitions create`.
+AHEAD = 3
+
+COLUMNS = '"id", amount, type, "desc", "user", account_id, category_id, enabled, created_on'
+
+PARTITIONED = """
+CREATE TABLE operations (
+    id INTEGER NOT NULL DEFAULT nextval('operations_id_seq'),
+    amount NUMERIC(20, 2) NOT NULL,
+    type operationtype NOT NULL,
+    "desc" VARCHAR(500),
+    "user" INTEGER,
+    account_id INTEGER NOT NULL REFERENCES accounts (id) ON DELETE CASCADE,
+    category_id INTEGER REFERENCES categories (id) ON DELETE CASCADE,
+    enabled BOOLEAN,
+    created_on TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    PRIMARY KEY (id, created_on)
+) PARTITION BY RANGE (created_on)
+"""
+
+PLAIN = """
+CREATE TABLE operations (
+    id INTEGER NOT NULL DEFAULT nextval('operations_id_seq'),
+    amount NUMERIC(20, 2) NOT NULL,
+    type operationtype NOT NULL,
+    "desc" VARCHAR(500),
+    "user" INTEGER,
+    account_id INTEGER NOT NULL REFERENCES accounts (id) ON DELETE CASCADE,
+    category_id INTEGER REFERENCES categories (id) ON DELETE CASCADE,
+    enabled BOOLEAN,
+    created_on TIMESTAMP WITHOUT TIME ZONE,
+    PRIMARY KEY (id)
+)
+"""
+
+PARTITION = "CREATE TABLE {name} PARTITION OF operations FOR VALUES FROM ('{start}') TO ('{end}')"
+
+
+def create_indexes():
+    op.execute('CREATE INDEX operations_user_created_idx ON operations ("user", enabled, created_on DESC, id DESC)')
+    op.execute("CREATE INDEX operations_account_created_idx ON operations (account_id, created_on)")
+    op.execute("CREATE INDEX operations_category_created_idx ON operations (category_id, created_on)")
+
+
+def replace_table(create: str) -> None:
+    """Move rows into new operations table created by `create`, keeping keys sequence."""
+    op.execute("DROP INDEX operations_user_created_idx")
+    op.execute("DROP INDEX operations_account_created_idx")
+    op.execute("DROP INDEX operations_category_created_idx")
+    op.execute("ALTER TABLE operations RENAME TO operations_previous")
+    op.execute("ALTER TABLE operations_previous RENAME CONSTRAINT operations_pkey TO operations_previous_pkey")
+    op.execute("ALTER SEQUENCE operations_id_seq OWNED BY NONE")
+
+    op.execute(create)
+    op.execute("ALTER SEQUENCE operations_id_seq OWNED BY operations.id")
+
+
+def copy_rows(values: str) -> None:
+    op.execute(f"INSERT INTO operations ({COLUMNS}) SELECT {values} FROM operations_previous")
+    op.execute("DROP TABLE operations_previous")
+
+
+def upgrade():
+    replace_table(PARTITIONED)
+
+    first = op.get_bind().execute("SELECT min(created_on) FROM operations_previous").scalar() or date.today()
+
+    for ordinal in range(month_ordinal(first), month_ordinal(date.today()) + AHEAD + 1):
+        start = ordinal_month(ordinal)
+        name = f"operations_y{start.year}m{start.month:02d}"
+
+        op.execute(PARTITION.format(name=name, start=start, end=ordinal_month(ordinal + 1)))
+
+    # Catches rows out of created partitions, should stay empty.
+    op.execute("CREATE TABLE operations_default PARTITION OF operations DEFAULT")
+
+    create_indexes()
+
+    # Partition key can't be NULL, rows without creation time never had one.
+    copy_rows(COLUMNS.replace("created_on", "COALESCE(created_on, now())"))
+
+
+def downgrade():
+    replace_table(PLAIN)
+    create_indexes()
+    copy_rows(COLUMNS)
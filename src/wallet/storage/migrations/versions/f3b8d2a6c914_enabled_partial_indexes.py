@@ -0,0 +1,47 @@
+"""Partial indexes on enabled rows
+
+Revision ID: f3b8d2a6c914
+Revises: c41d9b7e5f28
+Create Date: 2026-10-17 19:48:02.317745
+
+"""
+
+import sqlalchemy as sa  # type: ignore
+from alembic import op  # type: ignore
+
+revision = "f3b8d2a6c914"
+down_revision = "c41d9b7e5f28"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for table in ("accounts", "categories"):
+        op.drop_index(f"{table}_name_idx", table_name=table)
+        op.create_index(
+            f"{table}_name_idx", table, ["user", "name"], unique=True, postgresql_where=sa.text("enabled"),
+        )
+
+    op.drop_index("operations_user_created_idx", table_name="operations")
+    op.create_index(
+        "operations_user_created_idx",
+        "operations",
+        ["user", sa.text("created_on DESC"), sa.text("id DESC")],
+        unique=False,
+        postgresql_where=sa.text("enabled"),
+    )
+
+
+def downgrade():
+    op.drop_index("operations_user_created_idx", table_name="operations")
+    op.create_index(
+        "operations_user_created_idx",
+        "operations",
+        ["user", "enabled", sa.text("created_on DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+
+    # Fails if the same name was removed more than once.
+    for table in ("accounts", "categories"):
+        op.drop_index(f"{table}_name_idx", table_name=table)
+        op.create_index(f"{table}_name_idx", table, ["name", "user", "enabled"], unique=True)
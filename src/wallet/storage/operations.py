@@ -1,11 +1,20 @@
-from datetime import datetime
+from collections import defaultdict
+from datetime import date, datetime, time
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
 
 import sqlalchemy  # type: ignore
 from aiohttp_storage.storage import metadata  # type: ignore
+from databases import Database
 from passport.domain import User
 from sqlalchemy.orm import Query  # type: ignore
 
 from wallet.core.entities import (
+    Account,
+    Balance,
+    BalanceFilters,
+    BalanceKind,
+    Category,
+    EntityBalanceStream,
     Operation,
     OperationDependencies,
     OperationFilters,
@@ -13,13 +22,17 @@ from wallet.core.entities import (
     OperationType,
 )
 from wallet.core.storage.operations import OperationRepo
-from wallet.storage.base import DBRepo
+from wallet.core.tools import Cents, month_ordinal, month_start, ordinal_month, to_decimal
+from wallet.storage.accounts import accounts
+from wallet.storage.balances import BalanceDBRepo
+from wallet.storage.base import any_of, cents, DatabaseRouter, DBRepo, Statement
+from wallet.storage.categories import categories
 
 
 operations = sqlalchemy.Table(
     "operations",
     metadata,
-    sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+    sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True, autoincrement=True),
     sqlalchemy.Column("amount", sqlalchemy.Numeric(20, 2), nullable=False),
     sqlalchemy.Column("type", sqlalchemy.Enum(OperationType), nullable=False),
     sqlalchemy.Column("desc", sqlalchemy.String(500)),
@@ -29,17 +42,75 @@ operations = sqlalchemy.Table(
     ),
     sqlalchemy.Column("category_id", sqlalchemy.Integer, sqlalchemy.ForeignKey("categories.id", ondelete="CASCADE"),),
     sqlalchemy.Column("enabled", sqlalchemy.Boolean, default=True),
-    sqlalchemy.Column("created_on", sqlalchemy.DateTime, default=datetime.utcnow),
+    # Partition key has to be part of primary key.
+    sqlalchemy.Column("created_on", sqlalchemy.DateTime, primary_key=True, default=datetime.utcnow),
+    sqlalchemy.Index(
+        "operations_user_created_idx",
+        "user",
+        sqlalchemy.text("created_on DESC"),
+        sqlalchemy.text("id DESC"),
+        postgresql_where=sqlalchemy.text("enabled"),
+    ),
+    sqlalchemy.Index("operations_account_created_idx", "account_id", "created_on"),
+    sqlalchemy.Index("operations_category_created_idx", "category_id", "created_on"),
+    postgresql_partition_by="RANGE (created_on)",
+)
+
+
+# Primary key of partitioned operations includes creation time, so operation
+# can't be referenced by foreign key.
+operation_tags = sqlalchemy.Table(
+    "operation_tags",
+    metadata,
+    sqlalchemy.Column("operation_id", sqlalchemy.Integer, nullable=False, primary_key=True),
+    sqlalchemy.Column(
+        "tag_id",
+        sqlalchemy.Integer,
+        sqlalchemy.ForeignKey("tags.id", ondelete="CASCADE"),
+        nullable=False,
+        primary_key=True,
+    ),
+    sqlalchemy.Index("operation_tags_tag_idx", "tag_id"),
 )
 
 
+# Staging rows get keys from operations sequence while being copied, so keys
+# follow input order and are known before rows reach operations table.
+STAGING_TABLE = """
+CREATE TEMPORARY TABLE operations_staging (
+    id INTEGER NOT NULL DEFAULT nextval('operations_id_seq'),
+    amount NUMERIC(20, 2) NOT NULL,
+    type TEXT NOT NULL,
+    "desc" VARCHAR(500),
+    "user" INTEGER,
+    account_id INTEGER NOT NULL,
+    category_id INTEGER,
+    created_on TIMESTAMP
+) ON COMMIT DROP
+"""
+
+STAGING_COLUMNS = ("amount", "type", "desc", "user", "account_id", "category_id", "created_on")
+
+
+BalanceChanges = Dict[Tuple[BalanceKind, int, date], Tuple[Cents, Cents]]
+
+OPERATION_TYPES = {item.value: item for item in OperationType}
+
+
 class OperationDBRepo(DBRepo, OperationRepo):
-    def _get_query(self, *, user: User) -> Query:
+    def __init__(self, database: Database, router: Optional[DatabaseRouter] = None, raw_records: bool = False) -> None:
+        super().__init__(database=database, router=router)
+
+        self._balances = BalanceDBRepo(database=database, router=self._router)
+        self._raw_records = raw_records
+
+    def _get_query(self) -> Query:
+        # Raw records are read by position, keep `_process_record` in sync with columns order.
         query = (
             sqlalchemy.select(
                 [
                     operations.c.id,
-                    operations.c.amount,
+                    cents(operations.c.amount).label("amount"),
                     operations.c.type,
                     operations.c.desc,
                     operations.c.account_id,
@@ -47,12 +118,28 @@ class OperationDBRepo(DBRepo, OperationRepo):
                     operations.c.created_on,
                 ]
             )
-            .where(sqlalchemy.and_(operations.c.user == user.key, operations.c.enabled == True,))  # noqa:E712
-            .order_by(operations.c.created_on.desc())
+            .where(
+                sqlalchemy.and_(
+                    operations.c.user == sqlalchemy.bindparam("user"), operations.c.enabled == True,  # noqa:E712
+                )
+            )
+            .order_by(operations.c.created_on.desc(), operations.c.id.desc())
         )
 
         return query
 
+    def _get_values(self, entity: Operation) -> Dict[str, Any]:
+        return {
+            "amount": to_decimal(entity.amount),
+            "type": entity.operation_type.value,
+            "desc": entity.description,
+            "user": entity.user.key,
+            "account_id": entity.account.key,
+            "category_id": entity.category.key if entity.category else None,
+            "enabled": True,
+            "created_on": entity.created_on,
+        }
+
     def _process_row(self, row, *, user: User) -> Operation:
         operation = Operation(amount=row["amount"], description=row["desc"], operation_type=row["type"], user=user,)
         operation.key = row["id"]
@@ -60,35 +147,437 @@ class OperationDBRepo(DBRepo, OperationRepo):
 
         return operation
 
+    def _process_record(self, record, *, user: User) -> Operation:
+        """Build operation from raw record by position of `_get_query` columns, skipping result processing."""
+        operation = Operation(
+            amount=record[1], description=record[3], operation_type=OPERATION_TYPES[record[2]], user=user
+        )
+        operation.key = record[0]
+        operation.created_on = record[6]
+
+        return operation
+
+    def _get_filter_values(self, filters: OperationFilters) -> Dict[str, Any]:
+        values: Dict[str, Any] = {"user": filters.user.key}
+
+        if filters.keys:
+            values["keys"] = list(filters.keys)
+
+        if filters.month:
+            start = month_ordinal(filters.month)
+            values["month_start"] = datetime.combine(ordinal_month(start), time.min)
+            values["month_end"] = datetime.combine(ordinal_month(start + 1), time.min)
+
+        if filters.account:
+            values["account"] = filters.account
+
+        if filters.category:
+            values["category"] = filters.category
+
+        if filters.tags:
+            values["tags"] = [tag.key for tag in filters.tags]
+
+        if filters.cursor:
+            values["cursor_created_on"] = filters.cursor.created_on
+            values["cursor_key"] = filters.cursor.key
+
+        if filters.limit:
+            values["limit"] = filters.limit
+
+        return values
+
+    def _apply_filters(self, query: Query, values: Dict[str, Any]) -> Query:
+        """Add conditions for filters present in values, leaving values itself to execution."""
+        if "keys" in values:
+            query = query.where(any_of(operations.c.id, "keys"))
+
+        if "month_start" in values:
+            query = query.where(
+                sqlalchemy.and_(
+                    operations.c.created_on >= sqlalchemy.bindparam("month_start"),
+                    operations.c.created_on < sqlalchemy.bindparam("month_end"),
+                )
+            )
+
+        if "account" in values:
+            query = query.where(operations.c.account_id == sqlalchemy.bindparam("account"))
+
+        if "category" in values:
+            query = query.where(operations.c.category_id == sqlalchemy.bindparam("category"))
+
+        if "tags" in values:
+            tagged = sqlalchemy.select([operation_tags.c.operation_id]).where(any_of(operation_tags.c.tag_id, "tags"))
+            query = query.where(operations.c.id.in_(tagged))
+
+        if "cursor_key" in values:
+            # Row comparison keeps pagination on the index, so every page costs the same.
+            query = query.where(
+                sqlalchemy.tuple_(operations.c.created_on, operations.c.id)
+                < sqlalchemy.tuple_(sqlalchemy.bindparam("cursor_created_on"), sqlalchemy.bindparam("cursor_key"))
+            )
+
+        if "limit" in values:
+            query = query.limit(sqlalchemy.bindparam("limit", type_=sqlalchemy.Integer))
+
+        return query
+
+    def _get_detailed_query(self) -> Query:
+        return (
+            self._get_query()
+            .column(accounts.c.name.label("account_name"))
+            .column(categories.c.name.label("category_name"))
+            .select_from(
+                operations.join(accounts, operations.c.account_id == accounts.c.id).outerjoin(
+                    categories, operations.c.category_id == categories.c.id
+                )
+            )
+        )
+
     async def fetch(self, filters: OperationFilters) -> OperationStream:
-        query = self._get_query(user=filters.user)
+        values = self._get_filter_values(filters)
+        statement = self._prepare(
+            ("fetch", *sorted(values)), lambda: self._apply_filters(self._get_query(), values)
+        )
 
-        async for row in self._database.iterate(query=query):
-            dependencies = OperationDependencies(account=row["account_id"], category=row["category_id"])
+        if self._raw_records:
+            async for record in self._iterate_records(statement, values):
+                yield self._process_record(record, user=filters.user), OperationDependencies(record[4], record[5])
+        else:
+            async for row in self._iterate(statement, values):
+                dependencies = OperationDependencies(account=row["account_id"], category=row["category_id"])
 
-            yield self._process_row(row, user=filters.user), dependencies
+                yield self._process_row(row, user=filters.user), dependencies
+
+    async def fetch_detailed(self, filters: OperationFilters) -> AsyncGenerator[Operation, None]:
+        """Stream operations joined with their accounts and categories in one query."""
+        values = self._get_filter_values(filters)
+        statement = self._prepare(
+            ("fetch_detailed", *sorted(values)), lambda: self._apply_filters(self._get_detailed_query(), values)
+        )
+
+        account_by_key: Dict[int, Account] = {}
+        category_by_key: Dict[int, Category] = {}
+
+        async for operation, account_key, account_name, category_key, category_name in self._iterate_detailed(
+            statement, values, user=filters.user
+        ):
+            account = account_by_key.get(account_key)
+            if account is None:
+                account = Account(name=account_name, user=filters.user)
+                account.key = account_key
+                account_by_key[account_key] = account
+            operation.account = account
+
+            if category_key is not None:
+                category = category_by_key.get(category_key)
+                if category is None:
+                    category = Category(name=category_name, user=filters.user)
+                    category.key = category_key
+                    category_by_key[category_key] = category
+                operation.category = category
+
+            yield operation
+
+    async def _iterate_detailed(
+        self, statement: Statement, values: Dict[str, Any], *, user: User
+    ) -> AsyncGenerator[Tuple[Operation, int, str, Optional[int], Optional[str]], None]:
+        if self._raw_records:
+            async for record in self._iterate_records(statement, values):
+                yield self._process_record(record, user=user), record[4], record[7], record[5], record[8]
+        else:
+            async for row in self._iterate(statement, values):
+                operation = self._process_row(row, user=user)
+
+                yield operation, row["account_id"], row["account_name"], row["category_id"], row["category_name"]
+
+    def _get_balance_query(self, filters: BalanceFilters) -> Query:
+        column = operations.c.account_id
+        if filters.kind == BalanceKind.category:
+            column = operations.c.category_id
+
+        month = sqlalchemy.cast(
+            sqlalchemy.func.date_trunc(sqlalchemy.literal_column("'month'"), operations.c.created_on), sqlalchemy.Date
+        )
+
+        monthly = (
+            sqlalchemy.select(
+                [
+                    column.label("entity_id"),
+                    month.label("month"),
+                    sqlalchemy.func.sum(
+                        sqlalchemy.case([(operations.c.type == OperationType.income, operations.c.amount)], else_=0)
+                    ).label("incomes"),
+                    sqlalchemy.func.sum(
+                        sqlalchemy.case([(operations.c.type == OperationType.expense, operations.c.amount)], else_=0)
+                    ).label("expenses"),
+                ]
+            )
+            .where(
+                sqlalchemy.and_(
+                    operations.c.user == filters.user.key,
+                    operations.c.enabled == True,  # noqa:E712
+                    column.in_(filters.keys),
+                )
+            )
+            .group_by(column, month)
+        )
+
+        if filters.end:
+            next_month = ordinal_month(month_ordinal(filters.end) + 1)
+            monthly = monthly.where(operations.c.created_on < next_month)
+
+        monthly = monthly.alias("monthly")
+
+        rest = sqlalchemy.func.sum(monthly.c.incomes - monthly.c.expenses).over(
+            partition_by=monthly.c.entity_id, order_by=monthly.c.month
+        )
+
+        return sqlalchemy.select(
+            [
+                monthly.c.entity_id,
+                monthly.c.month,
+                cents(monthly.c.incomes).label("incomes"),
+                cents(monthly.c.expenses).label("expenses"),
+                cents(rest).label("rest"),
+            ]
+        ).order_by(monthly.c.entity_id, monthly.c.month)
+
+    async def fetch_balance(self, filters: BalanceFilters) -> EntityBalanceStream:
+        """Aggregate monthly balance of accounts or categories on database side.
+
+        Only one row per entity and month goes over the wire, months without
+        operations are filled with the rest carried from previous month.
+        """
+        rows: Dict[int, List] = defaultdict(list)
+        async for row in self._reader.iterate(query=self._get_balance_query(filters)):
+            rows[row["entity_id"]].append(row)
+
+        end = month_ordinal(filters.end or date.today())
+
+        for key in filters.keys:
+            items = rows.get(key, [])
+
+            start = end
+            if filters.start:
+                start = month_ordinal(filters.start)
+            elif items:
+                start = month_ordinal(items[0]["month"])
+
+            rest = 0
+            by_month = {}
+            for row in items:
+                if month_ordinal(row["month"]) < start:
+                    rest = row["rest"]
+                else:
+                    by_month[month_ordinal(row["month"])] = row
+
+            for ordinal in range(start, end + 1):
+                month = ordinal_month(ordinal)
+
+                if ordinal in by_month:
+                    row = by_month[ordinal]
+                    rest = row["rest"]
+
+                    yield key, Balance(month=month, incomes=row["incomes"], expenses=row["expenses"], rest=rest)
+                else:
+                    yield key, Balance(month=month, rest=rest)
 
     async def fetch_by_key(self, user: User, key: int) -> Operation:
-        row = await self._database.fetch_one(query=self._get_query(user=user).where(operations.c.id == key))
+        statement = self._prepare(
+            "fetch_by_key", lambda: self._get_query().where(operations.c.id == sqlalchemy.bindparam("key"))
+        )
+        row = await self._fetch_one(statement, {"user": user.key, "key": key})
 
         return self._process_row(row, user=user)
 
-    async def save(self, entity: Operation) -> int:
-        key = await self._database.execute(
-            operations.insert().returning(operations.c.id),
-            values={
-                "amount": entity.amount,
-                "type": entity.operation_type.value,
-                "desc": entity.description,
-                "user": entity.user.key,
-                "account_id": entity.account.key,
-                "category_id": entity.category.key,
-                "enabled": True,
-                "created_on": entity.created_on,
-            },
+    async def exists(self, filters: OperationFilters) -> bool:
+        values = {**self._get_filter_values(filters), "limit": 1}
+        statement = self._prepare(
+            ("exists", *sorted(values)),
+            lambda: self._apply_filters(
+                sqlalchemy.select([sqlalchemy.literal_column("1")]).where(
+                    sqlalchemy.and_(
+                        operations.c.user == sqlalchemy.bindparam("user"),
+                        operations.c.enabled == True,  # noqa:E712
+                    )
+                ),
+                values,
+            ),
         )
 
+        return await self._fetch_one(statement, values) is not None
+
+    def _track_balance(
+        self,
+        changes: BalanceChanges,
+        amount: Cents,
+        operation_type: OperationType,
+        account_key: int,
+        category_key: Optional[int],
+        created_on: datetime,
+    ) -> None:
+        month = month_start(created_on)
+
+        incomes, expenses = 0, 0
+        if operation_type == OperationType.income:
+            incomes = amount
+        elif operation_type == OperationType.expense:
+            expenses = amount
+
+        for kind, key in ((BalanceKind.account, account_key), (BalanceKind.category, category_key)):
+            if not key:
+                continue
+
+            previous_incomes, previous_expenses = changes.get((kind, key, month), (0, 0))
+            changes[(kind, key, month)] = (previous_incomes + incomes, previous_expenses + expenses)
+
+    async def _register_balances(self, user: User, changes: BalanceChanges) -> None:
+        for (kind, key, month), (incomes, expenses) in changes.items():
+            await self._balances.register(user, kind, key, month, incomes, expenses)
+
+    async def _register_many_balances(self, entities: List[Operation]) -> None:
+        users: Dict[int, User] = {}
+        changes: Dict[int, BalanceChanges] = defaultdict(dict)
+
+        for entity in entities:
+            users[entity.user.key] = entity.user
+            self._track_balance(
+                changes[entity.user.key],
+                entity.amount,
+                entity.operation_type,
+                entity.account.key,
+                entity.category.key if entity.category else None,
+                entity.created_on,
+            )
+
+        for user_key, user_changes in changes.items():
+            await self._register_balances(users[user_key], user_changes)
+
+    async def _save_tags(self, keys: List[int], entities: List[Operation]) -> None:
+        """Link operations to their tags with one statement."""
+        values = [
+            {"operation_id": key, "tag_id": tag.key} for key, entity in zip(keys, entities) for tag in entity.tags
+        ]
+
+        if values:
+            await self._writer().execute(operation_tags.insert().values(values))
+
+    async def save(self, entity: Operation) -> int:
+        async with self._writer().transaction():
+            key = await self._writer().execute(
+                operations.insert().returning(operations.c.id), values=self._get_values(entity),
+            )
+            await self._save_tags([key], [entity])
+
+            changes: BalanceChanges = {}
+            self._track_balance(
+                changes,
+                entity.amount,
+                entity.operation_type,
+                entity.account.key,
+                entity.category.key if entity.category else None,
+                entity.created_on,
+            )
+            await self._register_balances(entity.user, changes)
+
         return key
 
+    async def save_many(self, entities: List[Operation], chunk_size: int = 1000) -> List[int]:
+        """Insert operations with one multi-row statement per chunk.
+
+        Balances are updated once per entity and month instead of once per
+        operation.
+        """
+        keys: List[int] = []
+
+        async with self._writer().transaction():
+            for offset in range(0, len(entities), chunk_size):
+                chunk = entities[offset:offset + chunk_size]
+
+                # Postgres returns rows of multi-row INSERT in order of VALUES.
+                rows = await self._writer().fetch_all(
+                    operations.insert()
+                    .values([self._get_values(entity) for entity in chunk])
+                    .returning(operations.c.id)
+                )
+                keys.extend(row["id"] for row in rows)
+
+            await self._save_tags(keys, entities)
+            await self._register_many_balances(entities)
+
+        return keys
+
+    async def copy_many(self, entities: List[Operation]) -> List[int]:
+        """Load operations through binary COPY into temporary staging table.
+
+        Rows are moved to operations with single INSERT ... SELECT, which is
+        much cheaper than multi-row INSERT statements for large imports.
+        """
+        async with self._writer().transaction():
+            connection = self._writer().connection().raw_connection
+
+            await connection.execute(STAGING_TABLE)
+            await connection.copy_records_to_table(
+                "operations_staging",
+                columns=STAGING_COLUMNS,
+                records=(
+                    (
+                        to_decimal(entity.amount),
+                        entity.operation_type.value,
+                        entity.description,
+                        entity.user.key,
+                        entity.account.key,
+                        entity.category.key if entity.category else None,
+                        entity.created_on,
+                    )
+                    for entity in entities
+                ),
+            )
+
+            rows = await connection.fetch(
+                """
+                INSERT INTO operations (id, amount, type, "desc", "user", account_id, category_id, enabled, created_on)
+                SELECT id, amount, type::operationtype, "desc", "user", account_id, category_id, TRUE, created_on
+                FROM operations_staging
+                ORDER BY id
+                RETURNING id
+                """
+            )
+            keys = sorted(row["id"] for row in rows)
+
+            await self._save_tags(keys, entities)
+            await self._register_many_balances(entities)
+
+        return keys
+
     async def remove(self, entity: Operation) -> bool:
-        pass
+        async with self._writer().transaction():
+            row = await self._writer().fetch_one(
+                operations.update()
+                .where(
+                    sqlalchemy.and_(
+                        operations.c.id == entity.key,
+                        operations.c.user == entity.user.key,
+                        operations.c.enabled == True,  # noqa:E712
+                    )
+                )
+                .values(enabled=False)
+                .returning(
+                    cents(operations.c.amount).label("amount"),
+                    operations.c.type,
+                    operations.c.account_id,
+                    operations.c.category_id,
+                    operations.c.created_on,
+                )
+            )
+
+            if not row:
+                return False
+
+            changes: BalanceChanges = {}
+            self._track_balance(
+                changes, -row["amount"], row["type"], row["account_id"], row["category_id"], row["created_on"],
+            )
+            await self._register_balances(entity.user, changes)
+
+        return True
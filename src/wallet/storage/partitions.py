@@ -0,0 +1,63 @@
+from datetime import date
+from typing import List
+
+from databases import Database
+
+from wallet.core.tools import month_ordinal, month_start, ordinal_month
+
+
+PARTITION = "CREATE TABLE IF NOT EXISTS {name} PARTITION OF operations FOR VALUES FROM ('{start}') TO ('{end}')"
+
+DEFAULT_PARTITION = "CREATE TABLE IF NOT EXISTS operations_default PARTITION OF operations DEFAULT"
+
+# Links have no foreign key to partitioned operations, so they are removed with partition.
+PARTITION_TAGS = "DELETE FROM operation_tags USING {name} WHERE operation_tags.operation_id = {name}.id"
+
+
+def partition_name(month: date) -> str:
+    return f"operations_y{month.year}m{month.month:02d}"
+
+
+async def create_partitions(database: Database, start: date, end: date) -> List[str]:
+    """Create monthly partitions of operations for months from `start` to `end` inclusive.
+
+    Existing partitions are kept as is. Creating partition scans default one
+    for rows of its month, so partitions should be created ahead of time
+    while default partition is empty.
+    """
+    names = []
+
+    for ordinal in range(month_ordinal(start), month_ordinal(end) + 1):
+        month = ordinal_month(ordinal)
+        name = partition_name(month)
+
+        await database.execute(PARTITION.format(name=name, start=month, end=ordinal_month(ordinal + 1)))
+        names.append(name)
+
+    return names
+
+
+async def drop_partitions(database: Database, before: date) -> List[str]:
+    """Drop monthly partitions of operations older than month of `before`.
+
+    Removes whole months without scanning rows, balances stored for them
+    are kept. Tag links of dropped operations are deleted together with
+    partition.
+    """
+    query = """
+    SELECT child.relname AS name
+    FROM pg_inherits
+    JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    WHERE parent.relname = 'operations'
+    """
+
+    names = []
+    for row in await database.fetch_all(query):
+        if row["name"] != "operations_default" and row["name"] < partition_name(month_start(before)):
+            async with database.transaction():
+                await database.execute(PARTITION_TAGS.format(name=row["name"]))
+                await database.execute(f"DROP TABLE {row['name']}")
+            names.append(row["name"])
+
+    return sorted(names)
@@ -0,0 +1,139 @@
+import time
+from typing import Any, AsyncGenerator, Dict, Iterable, Tuple
+from urllib.parse import quote
+
+import config  # type: ignore
+from aiohttp import web
+from aiohttp_storage import StorageConfig as BaseStorageConfig  # type: ignore
+from databases import Database
+from prometheus_client import Histogram, REGISTRY  # type: ignore
+from prometheus_client.core import GaugeMetricFamily  # type: ignore
+
+
+class StorageConfig(BaseStorageConfig):
+    min_pool_size = config.IntField(default=2, env="POSTGRES_MIN_POOL_SIZE")
+    max_pool_size = config.IntField(default=10, env="POSTGRES_MAX_POOL_SIZE")
+
+    @property
+    def uri(self) -> str:
+        return f"postgresql://{quote(self.user)}:{quote(self.password)}@{self.host}:{self.port}/{self.database}"
+
+
+class InstrumentedPool:
+    """asyncpg pool wrapper measuring how long connections are waited for.
+
+    `databases` only calls `acquire` and `release`, everything else is passed
+    to the pool as is.
+    """
+
+    def __init__(self, pool, acquire_seconds: Histogram) -> None:
+        self._pool = pool
+        self._acquire_seconds = acquire_seconds
+
+        self.waiting = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._pool, name)
+
+    async def acquire(self, *, timeout=None):
+        self.waiting += 1
+        started = time.perf_counter()
+
+        try:
+            return await self._pool.acquire(timeout=timeout)
+        finally:
+            self.waiting -= 1
+            self._acquire_seconds.observe(time.perf_counter() - started)
+
+    async def release(self, connection, *, timeout=None) -> None:
+        await self._pool.release(connection, timeout=timeout)
+
+    def stats(self) -> Tuple[int, int, int]:
+        """Connections opened, in use and idle."""
+        if hasattr(self._pool, "get_idle_size"):
+            size, idle = self._pool.get_size(), self._pool.get_idle_size()
+        else:
+            # asyncpg before 0.25 has no public accessors.
+            holders = [holder for holder in self._pool._holders if holder._con is not None]
+            size, idle = len(holders), sum(holder._in_use is None for holder in holders)
+
+        return size, size - idle, idle
+
+
+class PoolCollector:
+    """Collect state of pools on scrape, so requests pay nothing for gauges."""
+
+    def __init__(self, pools: Dict[str, InstrumentedPool]) -> None:
+        self._pools = pools
+
+    def collect(self) -> Iterable[GaugeMetricFamily]:
+        families = {
+            name: GaugeMetricFamily(f"wallet_db_pool_{name}", description, labels=["database"])
+            for name, description in (
+                ("size", "Open connections of pool"),
+                ("in_use", "Connections taken from pool"),
+                ("idle", "Connections ready in pool"),
+                ("waiters", "Coroutines waiting for connection"),
+            )
+        }
+
+        for database, pool in self._pools.items():
+            size, in_use, idle = pool.stats()
+
+            families["size"].add_metric([database], size)
+            families["in_use"].add_metric([database], in_use)
+            families["idle"].add_metric([database], idle)
+            families["waiters"].add_metric([database], pool.waiting)
+
+        return families.values()
+
+
+# Registered once per process, so the application could be set up several times.
+ACQUIRE_SECONDS = Histogram(
+    "wallet_db_pool_acquire_seconds",
+    "Time spent waiting for connection from pool",
+    ["database"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+POOLS: Dict[str, InstrumentedPool] = {}
+REGISTRY.register(PoolCollector(POOLS))
+
+
+def instrument(name: str, database: Database) -> InstrumentedPool:
+    # `databases` has no hook around acquire, so connected backend pool is wrapped.
+    raw_pool = getattr(database._backend, "_pool", None)
+    if raw_pool is None:
+        raise RuntimeError(f"Pool of {name} database is not connected or not supported by databases backend")
+
+    pool = InstrumentedPool(raw_pool, ACQUIRE_SECONDS.labels(database=name))
+    database._backend._pool = pool
+
+    return pool
+
+
+def setup(app: web.Application, config: StorageConfig) -> None:
+    """Connect primary database as `app["db"]` and export metrics of all pools.
+
+    This is the only place primary database is created, so its pool is
+    always bounded by config. Should be called after replica is set up.
+    """
+
+    async def primary(app: web.Application) -> AsyncGenerator[None, None]:
+        app["db"] = Database(config.uri, min_size=config.min_pool_size, max_size=config.max_pool_size)
+        await app["db"].connect()
+
+        yield
+
+        await app["db"].disconnect()
+
+    async def start(app: web.Application) -> None:
+        for name, key in (("primary", "db"), ("replica", "db_replica")):
+            if key in app:
+                POOLS[name] = instrument(name, app[key])
+
+    async def stop(app: web.Application) -> None:
+        POOLS.clear()
+
+    app.cleanup_ctx.append(primary)
+    app.on_startup.append(start)
+    app.on_shutdown.append(stop)
@@ -0,0 +1,27 @@
+from typing import AsyncGenerator
+
+import config  # type: ignore
+from aiohttp import web
+from databases import Database
+
+
+class ReplicaConfig(config.Config):
+    dsn = config.StrField(default="", env="DB_REPLICA_DSN")
+    min_pool_size = config.IntField(default=2, env="DB_REPLICA_MIN_POOL_SIZE")
+    max_pool_size = config.IntField(default=10, env="DB_REPLICA_MAX_POOL_SIZE")
+
+
+def setup(app: web.Application, config: ReplicaConfig) -> None:
+    """Connect read replica as `app["db_replica"]` when its DSN is configured."""
+    if not config.dsn:
+        return
+
+    async def replica(app: web.Application) -> AsyncGenerator[None, None]:
+        app["db_replica"] = Database(config.dsn, min_size=config.min_pool_size, max_size=config.max_pool_size)
+        await app["db_replica"].connect()
+
+        yield
+
+        await app["db_replica"].disconnect()
+
+    app.cleanup_ctx.append(replica)
@@ -1,7 +1,20 @@
+from collections import defaultdict
 from datetime import datetime
+from typing import AsyncGenerator, Dict, List, Optional
 
 import sqlalchemy  # type: ignore
 from aiohttp_storage.storage import metadata  # type: ignore
+from databases import Database
+from passport.domain import User
+from sqlalchemy.orm import Query  # type: ignore
+from sqlalchemy.sql import ColumnElement  # type: ignore
+
+from wallet.core.entities import Tag, TagFilters
+from wallet.core.storage.tags import TagRepo
+from wallet.storage.base import any_of, DatabaseRouter, DBRepo
+from wallet.storage.categories import category_tags
+from wallet.storage.loader import Loader
+from wallet.storage.operations import operation_tags
 
 
 tags = sqlalchemy.Table(
@@ -12,4 +25,139 @@ tags = sqlalchemy.Table(
     sqlalchemy.Column("user", sqlalchemy.Integer),
     sqlalchemy.Column("enabled", sqlalchemy.Boolean, default=True),
     sqlalchemy.Column("created_on", sqlalchemy.DateTime, default=datetime.utcnow),
+    sqlalchemy.Index("tags_name_idx", "user", "name", unique=True, postgresql_where=sqlalchemy.text("enabled")),
 )
+
+
+class TagDBRepo(DBRepo, TagRepo):
+    def __init__(self, database: Database, router: Optional[DatabaseRouter] = None) -> None:
+        super().__init__(database=database, router=router)
+        self._loader: Loader[Tag] = Loader(self._fetch_many)
+
+    def _get_query(self, *, user: User) -> Query:
+        query = sqlalchemy.select([tags.c.id, tags.c.name]).where(
+            sqlalchemy.and_(tags.c.user == user.key, tags.c.enabled == True)  # noqa:E712
+        )
+
+        return query
+
+    def _process_row(self, row, *, user: User) -> Tag:
+        tag = Tag(name=row["name"], user=user)
+        tag.key = row["id"]
+
+        return tag
+
+    async def fetch(self, filters: TagFilters) -> AsyncGenerator[Tag, None]:
+        query = self._get_query(user=filters.user)
+
+        if filters.keys:
+            query = query.where(tags.c.id.in_(filters.keys))
+
+        if filters.name:
+            query = query.where(tags.c.name == filters.name)
+
+        async for row in self._reader.iterate(query=query):
+            yield self._loader.prime(filters.user, self._process_row(row, user=filters.user))
+
+    async def _fetch_many(self, user: User, keys: List[int]) -> List[Tag]:
+        statement = self._prepare(
+            "fetch_many",
+            lambda: sqlalchemy.select([tags.c.id, tags.c.name]).where(
+                sqlalchemy.and_(
+                    tags.c.user == sqlalchemy.bindparam("user"),
+                    tags.c.enabled == True,  # noqa:E712
+                    any_of(tags.c.id, "keys"),
+                )
+            ),
+        )
+
+        rows = await self._fetch_all(statement, {"user": user.key, "keys": keys})
+
+        return [self._process_row(row, user=user) for row in rows]
+
+    async def fetch_by_key(self, user: User, key: int) -> Tag:
+        return await self._loader.load(user, key)
+
+    async def fetch_by_name(self, user: User, name: str) -> Tag:
+        row = await self._reader.fetch_one(query=self._get_query(user=user).where(tags.c.name == name))
+
+        return self._process_row(row, user=user)
+
+    async def _fetch_owned(
+        self, shape: str, owner: ColumnElement, tag: ColumnElement, user: User, keys: List[int]
+    ) -> Dict[int, List[Tag]]:
+        """Tags of all owners with one query, instances are shared between owners with the same tag."""
+        result: Dict[int, List[Tag]] = defaultdict(list)
+        if not keys:
+            return result
+
+        statement = self._prepare(
+            shape,
+            lambda: sqlalchemy.select([owner.label("owner_id"), tags.c.id, tags.c.name])
+            .select_from(owner.table.join(tags, tag == tags.c.id))
+            .where(
+                sqlalchemy.and_(
+                    any_of(owner, "keys"),
+                    tags.c.user == sqlalchemy.bindparam("user"),
+                    tags.c.enabled == True,  # noqa:E712
+                )
+            )
+            .order_by(owner, tags.c.name),
+        )
+
+        for row in await self._fetch_all(statement, {"user": user.key, "keys": keys}):
+            result[row["owner_id"]].append(self._loader.prime(user, self._process_row(row, user=user)))
+
+        return result
+
+    async def fetch_for_operations(self, user: User, keys: List[int]) -> Dict[int, List[Tag]]:
+        return await self._fetch_owned(
+            "fetch_for_operations", operation_tags.c.operation_id, operation_tags.c.tag_id, user, keys
+        )
+
+    async def fetch_for_categories(self, user: User, keys: List[int]) -> Dict[int, List[Tag]]:
+        return await self._fetch_owned(
+            "fetch_for_categories", category_tags.c.category_id, category_tags.c.tag_id, user, keys
+        )
+
+    async def exists(self, filters: TagFilters) -> bool:
+        query = (
+            sqlalchemy.select([sqlalchemy.func.count(tags.c.id)])
+            .select_from(tags)
+            .where(
+                sqlalchemy.and_(
+                    tags.c.user == filters.user.key,
+                    tags.c.name == filters.name,
+                    tags.c.enabled == True,  # noqa:E712
+                )
+            )
+        )
+
+        exists = await self._reader.fetch_val(query=query)
+
+        return exists > 0
+
+    async def save(self, entity: Tag) -> int:
+        key = await self._writer().execute(
+            tags.insert().returning(tags.c.id),
+            values={"name": entity.name, "user": entity.user.key, "enabled": True, "created_on": datetime.now()},
+        )
+
+        return key
+
+    async def remove(self, entity: Tag) -> bool:
+        key = await self._writer().fetch_val(
+            tags.update()
+            .where(
+                sqlalchemy.and_(
+                    tags.c.id == entity.key,
+                    tags.c.user == entity.user.key,
+                    tags.c.enabled == True,  # noqa:E712
+                )
+            )
+            .values(enabled=False)
+            .returning(tags.c.id)
+        )
+        self._loader.forget(entity.user, entity.key)
+
+        return key is not None
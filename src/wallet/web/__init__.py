@@ -8,6 +8,8 @@ from aiohttp_micro.web.handlers.openapi import ParameterIn, ParametersSchema
 from marshmallow import fields, post_load, Schema, ValidationError
 
 from wallet.core.entities import Payload  # noqa: F401
+from wallet.core.tools import to_cents, to_decimal
+from wallet.storage import DBStorage
 
 
 PT = TypeVar("PT", bound="Payload")
@@ -29,6 +31,28 @@ class CollectionFiltersSchema(ParametersSchema):
     limit = fields.Int(default=10, missing=10, description="Number of items per page")
 
 
+def get_storage(request: web.Request) -> DBStorage:
+    return DBStorage(
+        request.app["db"],
+        cache=request.app.get("storage_cache"),
+        raw_records=request.app["config"].raw_records,
+        replica=request.app.get("db_replica"),
+    )
+
+
+class MoneyField(fields.Decimal):
+    """Amount kept in cents inside the service and shown as decimal number."""
+
+    def _serialize(self, value, attr, obj, **kwargs):
+        if value is None:
+            return None
+
+        return super()._serialize(to_decimal(value), attr, obj, **kwargs)
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        return to_cents(super()._deserialize(value, attr, data, **kwargs))
+
+
 class PayloadSchema(Schema, Generic[PT]):
     payload_cls: Type[PT]
 
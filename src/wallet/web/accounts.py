@@ -1,21 +1,31 @@
+from datetime import date
 from http import HTTPStatus
 from typing import Dict
 
 from aiohttp import web
 from aiohttp_micro.web.handlers import json_response
-from aiohttp_micro.web.handlers.openapi import OpenAPISpec, PayloadSchema, ResponseSchema
-from marshmallow import fields, Schema
+from aiohttp_micro.web.handlers.openapi import (
+    OpenAPISpec,
+    ParameterIn,
+    ParametersSchema,
+    PayloadSchema,
+    ResponseSchema,
+)
+from marshmallow import fields, Schema, validates_schema, ValidationError
 from passport.client import user_required
 
 from wallet.core.entities import AccountFilters, AccountPayload
 from wallet.core.exceptions import AccountAlreadyExist
-from wallet.core.use_cases.accounts import AddUseCase, SearchUseCase
-from wallet.storage import DBStorage
-from wallet.web import CollectionFiltersSchema, CommonParameters, serialize, validate_payload
+from wallet.core.tools import month_ordinal, ordinal_month
+from wallet.core.use_cases.accounts import AddUseCase, BalanceUseCase, SearchUseCase
+from wallet.web import CollectionFiltersSchema, CommonParameters, get_storage, MoneyField, serialize, validate_payload
 
 
 class BalanceSchema(Schema):
-    pass
+    month = fields.Date(required=True, description="Month")
+    incomes = MoneyField(places=2, as_string=True, required=True, description="Incomes")
+    expenses = MoneyField(places=2, as_string=True, required=True, description="Expenses")
+    rest = MoneyField(places=2, as_string=True, required=True, description="Rest at the end of month")
 
 
 class AccountSchema(Schema):
@@ -38,7 +48,7 @@ class AccountsFilterSchema(CollectionFiltersSchema):
 async def search(request: web.Request) -> web.Response:
     """Get accounts list."""
 
-    search_accounts = SearchUseCase(DBStorage(request.app["db"]), logger=request.app["logger"])
+    search_accounts = SearchUseCase(get_storage(request), logger=request.app["logger"])
     accounts_stream = search_accounts.execute(filters=AccountFilters(user=request["user"]))
 
     return {"accounts": [account async for account in accounts_stream]}
@@ -75,7 +85,7 @@ class AccountResponseSchema(ResponseSchema):
 async def add(payload: Dict[str, str], request: web.Request) -> web.Response:
     """Add new account."""
 
-    storage = DBStorage(request.app["db"])
+    storage = get_storage(request)
 
     try:
         add_account = AddUseCase(storage, logger=request.app["logger"])
@@ -108,9 +118,57 @@ async def remove(request: web.Request) -> web.Response:
     raise NotImplementedError()
 
 
-class BalanceResponseSchema(Schema):
-    balance = fields.List(fields.Nested(BalanceSchema), required=True)
+class BalanceResponseSchema(ResponseSchema):
+    """Account balance."""
+
+    balance = fields.List(fields.Nested(BalanceSchema), required=True, description="Balance by months")
+
+
+class BalanceFilterSchema(ParametersSchema):
+    """Filter account balance."""
+
+    in_ = ParameterIn.query
+
+    start = fields.Date(description="First month of period")
+    end = fields.Date(description="Last month of period, current month by default")
 
+    @validates_schema
+    def validate_period(self, data, **kwargs) -> None:
+        end = data.get("end", date.today())
 
+        if "start" in data and month_ordinal(data["start"]) > month_ordinal(end):
+            raise ValidationError("First month of period should not be after the last one", field_name="start")
+
+
+@user_required()
+@serialize(BalanceResponseSchema)
 async def balance(request: web.Request) -> web.Response:
-    raise NotImplementedError()
+    """Get account balance."""
+
+    try:
+        filters = BalanceFilterSchema().load(dict(request.query))
+    except ValidationError as exc:
+        return json_response({"errors": exc.messages}, status=422)
+
+    end = filters.get("end", date.today())
+    start = filters.get("start", ordinal_month(month_ordinal(end) - 11))
+
+    get_balance = BalanceUseCase(get_storage(request), logger=request.app["logger"])
+    balance_stream = get_balance.execute(
+        user=request["user"], key=int(request.match_info["account_key"]), start=start, end=end,
+    )
+
+    return {"balance": [item async for item in balance_stream]}
+
+
+balance.spec = OpenAPISpec(
+    operation="getAccountBalance",
+    parameters=[CommonParameters, BalanceFilterSchema],
+    responses={
+        HTTPStatus.OK: BalanceResponseSchema,
+        # HTTPStatus.UNAUTHORIZED: ErrorSchema,
+        # HTTPStatus.FORBIDDEN: ErrorSchema,
+    },
+    security="TokenAuth",
+    tags=["accounts"],
+)
@@ -10,13 +10,14 @@ from passport.client import user_required
 from wallet.core.entities import CategoryFilters, CategoryPayload
 from wallet.core.exceptions import CategoryAlreadyExist
 from wallet.core.use_cases.categories import AddUseCase, SearchUseCase
-from wallet.storage import DBStorage
-from wallet.web import CollectionFiltersSchema, CommonParameters, serialize, validate_payload
+from wallet.web import CollectionFiltersSchema, CommonParameters, get_storage, serialize, validate_payload
+from wallet.web.tags import TagSchema
 
 
 class CategorySchema(Schema):
     key = fields.Int(required=True, data_key="id", description="Category id")
     name = fields.Str(required=True, description="Category name")
+    tags = fields.List(fields.Nested(TagSchema), description="Category tags")
 
 
 class CategoriesResponseSchema(ResponseSchema):
@@ -34,11 +35,14 @@ class CategoriesFilterSchema(CollectionFiltersSchema):
 async def search(request: web.Request) -> web.Response:
     """Get categories list."""
 
-    search_categories = SearchUseCase(storage=DBStorage(request.app["db"]), logger=request.app["logger"])
+    search_categories = SearchUseCase(storage=get_storage(request), logger=request.app["logger"])
 
     return {
         "categories": [
-            category async for category in search_categories.execute(filters=CategoryFilters(user=request["user"]))
+            category
+            async for category in search_categories.execute(
+                filters=CategoryFilters(user=request["user"]), with_tags=True
+            )
         ]
     }
 
@@ -74,7 +78,7 @@ class CategoryResponseSchema(ResponseSchema):
 async def add(payload: Dict[str, str], request: web.Request) -> web.Response:
     """Add new category."""
 
-    storage = DBStorage(request.app["db"])
+    storage = get_storage(request)
 
     try:
         add_category = AddUseCase(storage=storage, logger=request.app["logger"])
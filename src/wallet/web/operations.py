@@ -1,3 +1,4 @@
+import base64
 import csv
 import decimal
 import io
@@ -7,41 +8,78 @@ from typing import Optional, Tuple
 
 from aiohttp import web
 from aiohttp_micro.core.schemas import EnumField
+from aiohttp_micro.web.handlers import json_response
 from aiohttp_micro.web.handlers.openapi import OpenAPISpec, PayloadSchema, ResponseSchema
-from marshmallow import fields, post_load, Schema
+from marshmallow import fields, post_load, Schema, validate, ValidationError
 from passport.client import user_required
 
-from wallet.core.entities import BulkOperationsPayload, OperationFilters, OperationPayload, OperationType
+from wallet.core.entities import (
+    BulkOperationsPayload,
+    OperationCursor,
+    OperationFilters,
+    OperationPayload,
+    OperationType,
+)
+from wallet.core.tools import to_cents
 from wallet.core.use_cases.operations import AddBulkUseCase, AddUseCase, SearchUseCase
-from wallet.storage import DBStorage
-from wallet.web import CollectionFiltersSchema, CommonParameters, serialize, validate_payload
+from wallet.web import CollectionFiltersSchema, CommonParameters, get_storage, MoneyField, serialize, validate_payload
 from wallet.web.accounts import AccountSchema
 from wallet.web.categories import CategorySchema
+from wallet.web.tags import TagSchema
 
 
 class OperationSchema(Schema):
     """Operation info."""
 
     key = fields.Int(required=True, data_key="id", description="Operation ID")
-    amount = fields.Str(places=2, required=True, description="Amount")
+    amount = MoneyField(places=2, as_string=True, required=True, description="Amount")
     description = fields.Str(required=True, data_key="desc", description="Description")
     account = fields.Nested(AccountSchema, required=True, description="Account",)
-    category = fields.Nested(CategorySchema, required=True, description="Category",)
+    category = fields.Nested(CategorySchema, exclude=("tags",), required=True, description="Category",)
     operation_type = EnumField(OperationType, data_key="type", required=True, description="Operation type",)
+    tags = fields.List(fields.Nested(TagSchema), description="Operation tags")
     created_on = fields.DateTime(required=True, data_key="created", description="Created date")
 
 
+class CursorField(fields.Field):
+    """Opaque position in operations list."""
+
+    def _serialize(self, value: Optional[OperationCursor], attr, obj, **kwargs) -> Optional[str]:
+        if value is None:
+            return None
+
+        raw = f"{value.created_on.isoformat()}|{value.key}"
+
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+    def _deserialize(self, value, attr, data, **kwargs) -> OperationCursor:
+        try:
+            raw_created, raw_key = base64.urlsafe_b64decode(value.encode("ascii")).decode("utf-8").split("|")
+
+            return OperationCursor(created_on=datetime.fromisoformat(raw_created), key=int(raw_key))
+        except ValueError:
+            raise ValidationError("Invalid cursor")
+
+
 class OperationsResponseSchema(ResponseSchema):
     """Operations list."""
 
     operations = fields.List(fields.Nested(OperationSchema), required=True, description="Operation list",)
+    next = CursorField(description="Cursor of the next page, absent on the last page")
 
 
 class OperationsFilterSchema(CollectionFiltersSchema):
     """Filter operations list."""
 
+    # Kept for clients of offset pagination, ignored since cursors replaced it.
+    offset = fields.Int(description="Deprecated, ignored: use cursor", deprecated=True)
     account_key = fields.Int(data_key="account", description="Account")
-    category_key = fields.Int(data_key="category", description="Account")
+    category_key = fields.Int(data_key="category", description="Category")
+    month = fields.Date(description="Any day of month to get operations for")
+    cursor = CursorField(description="Cursor returned with previous page")
+    limit = fields.Int(
+        default=10, missing=10, validate=validate.Range(min=1, max=1000), description="Number of items per page",
+    )
 
 
 @user_required()
@@ -49,13 +87,33 @@ class OperationsFilterSchema(CollectionFiltersSchema):
 async def search(request: web.Request) -> web.Response:
     """Get operations list."""
 
-    search_operations = SearchUseCase(storage=DBStorage(request.app["db"]), logger=request.app["logger"])
+    try:
+        params = OperationsFilterSchema().load(dict(request.query))
+    except ValidationError as exc:
+        return json_response({"errors": exc.messages}, status=422)
+
+    limit = params["limit"]
+
+    # One extra row tells whether next page exists.
+    filters = OperationFilters(
+        user=request["user"],
+        month=params.get("month"),
+        account=params.get("account_key"),
+        category=params.get("category_key"),
+        cursor=params.get("cursor"),
+        limit=limit + 1,
+    )
+
+    search_operations = SearchUseCase(storage=get_storage(request), logger=request.app["logger"])
+    operations_stream = search_operations.execute(filters=filters, with_tags=True)
+    operations = [operation async for operation in operations_stream]
+
+    response = {"operations": operations[:limit]}
+    if len(operations) > limit:
+        last = operations[limit - 1]
+        response["next"] = OperationCursor(created_on=last.created_on, key=last.key)
 
-    return {
-        "operations": [
-            operation async for operation in search_operations.execute(filters=OperationFilters(user=request["user"]))
-        ]
-    }
+    return response
 
 
 search.spec = OpenAPISpec(
@@ -74,7 +132,7 @@ search.spec = OpenAPISpec(
 class AddOperationPayloadSchema(PayloadSchema):
     """Add new operation."""
 
-    amount = fields.Decimal(places=2, rounding=decimal.ROUND_UP, required=True)
+    amount = MoneyField(places=2, rounding=decimal.ROUND_UP, required=True)
     description = fields.Str()
     account = fields.Int(required=True)
     category = fields.Int(required=True)
@@ -82,6 +140,7 @@ class AddOperationPayloadSchema(PayloadSchema):
         OperationType, missing=OperationType.expense, default=OperationType.expense, data_key="type",
     )
     created_on = fields.DateTime(required=True)
+    tags = fields.List(fields.Int(), description="Tag ids")
 
     @post_load
     def make_payload(self, data, **kwargs) -> OperationPayload:
@@ -102,7 +161,7 @@ class OperationResponseSchema(ResponseSchema):
 async def add(payload: OperationPayload, request: web.Request) -> web.Response:
     """Add new operation."""
 
-    add_operation = AddUseCase(storage=DBStorage(request.app["db"]), logger=request.app["logger"])
+    add_operation = AddUseCase(storage=get_storage(request), logger=request.app["logger"])
     operation = await add_operation.execute(payload=payload)
 
     return {"operation": operation}
@@ -155,7 +214,7 @@ class BulkOperationPayloadSchema(PayloadSchema):
 
         return OperationPayload(
             user=self.context["user"],
-            amount=amount,
+            amount=to_cents(amount),
             account=account,
             category=category,
             description=description,
@@ -197,7 +256,7 @@ class BulkOperationPayloadSchema(PayloadSchema):
 async def add_bulk(payload: BulkOperationsPayload, request: web.Request) -> web.Response:
     """Add multiple operations."""
 
-    add_operations = AddBulkUseCase(storage=DBStorage(request.app["db"]), logger=request.app["logger"])
+    add_operations = AddBulkUseCase(storage=get_storage(request), logger=request.app["logger"])
     operations_stream = add_operations.execute(payload=payload)
 
     return {"operations": [operation async for operation in operations_stream]}
@@ -0,0 +1,6 @@
+from marshmallow import fields, Schema
+
+
+class TagSchema(Schema):
+    key = fields.Int(required=True, data_key="id", description="Tag id")
+    name = fields.Str(required=True, description="Tag name")
@@ -1,3 +1,4 @@
+from logging import Logger
 from pathlib import Path
 
 import orjson
@@ -15,6 +16,17 @@ def user(faker) -> User:
     return User(key=1, email=faker.free_email())
 
 
+@pytest.fixture(scope="function")
+def logger(mocker) -> Logger:
+    fake_logger = mocker.MagicMock()
+
+    fake_logger.debug = mocker.MagicMock()
+    fake_logger.info = mocker.MagicMock()
+    fake_logger.error = mocker.MagicMock()
+
+    return fake_logger
+
+
 @pytest.fixture(scope="session")
 def config():
     return AppConfig()
@@ -1,5 +1,4 @@
 import asyncio
-from logging import Logger
 
 import pytest
 
@@ -7,17 +6,6 @@ from wallet.core.entities import Account, Category
 from wallet.core.storage import Storage
 
 
-@pytest.fixture(scope="function")
-def logger(mocker) -> Logger:
-    fake_logger = mocker.MagicMock()
-
-    fake_logger.debug = mocker.MagicMock()
-    fake_logger.info = mocker.MagicMock()
-    fake_logger.error = mocker.MagicMock()
-
-    return fake_logger
-
-
 @pytest.fixture(scope="function")
 def fake_storage(mocker) -> Storage:
     storage = mocker.MagicMock()
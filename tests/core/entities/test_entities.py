@@ -4,6 +4,7 @@ import pytest
 
 from tests.conftest import load_test_cases
 from wallet.core.entities import Balance, EntityWithBalance, OperationType
+from wallet.core.tools import to_cents
 
 
 def load_test_case(request, today, month):
@@ -13,13 +14,13 @@ def load_test_case(request, today, month):
 
             yield key, Balance(
                 month=key,
-                rest=Decimal(item.get("rest", "0.0")),
-                expenses=Decimal(item.get("expenses", "0.0")),
-                incomes=Decimal(item.get("incomes", "0.0")),
+                rest=to_cents(Decimal(item.get("rest", "0.0"))),
+                expenses=to_cents(Decimal(item.get("expenses", "0.0"))),
+                incomes=to_cents(Decimal(item.get("incomes", "0.0"))),
             )
 
     return {
-        "amount": Decimal(request.param.get("amount")),
+        "amount": to_cents(Decimal(request.param.get("amount"))),
         "operation_type": OperationType(request.param.get("operation_type")),
         "created_on": today.add(months=request.param.get("month_offset", 0)),
         "balance": {key: value for key, value in load_balance(request.param.get("balance", []))},
@@ -66,3 +67,37 @@ def test_update_balance_after_drop_operation(drop_operation_test_case):
     )
 
     assert entity.balance == drop_operation_test_case.get("expected")
+
+
+@pytest.mark.unit
+def test_apply_operations_matches_sequential_add(today):
+    operations = [
+        (10000, OperationType.expense, today.subtract(months=3)),
+        (25000, OperationType.income, today.subtract(months=1)),
+        (5000, OperationType.expense, today.subtract(months=3)),
+        (2000, OperationType.expense, today),
+    ]
+
+    expected = EntityWithBalance()
+    for amount, operation_type, created_on in operations:
+        expected.add_operation(amount=amount, operation_type=operation_type, created_on=created_on)
+
+    entity = EntityWithBalance()
+    entity.apply_operations(operations)
+
+    assert entity.balance == expected.balance
+
+
+@pytest.mark.unit
+def test_ledger_allocated_on_first_operation(today, month):
+    entity = EntityWithBalance()
+
+    assert entity == EntityWithBalance()
+    assert entity.balance == {month: Balance(month=month)}
+    assert entity.rest(month) == 0
+    assert entity._ledger is None
+
+    entity.add_operation(amount=1000, operation_type=OperationType.income, created_on=today)
+
+    assert entity._ledger is not None
+    assert entity.balance[month].rest == 1000
@@ -0,0 +1,56 @@
+from logging import Logger
+
+import pytest
+from passport.domain import User
+
+from wallet.core.entities import Category, CategoryFilters
+from wallet.core.exceptions import CategoriesNotFound
+from wallet.core.services.categories import CategoryService
+from wallet.core.storage import Storage
+
+
+async def category_stream(*categories: Category):
+    for category in categories:
+        yield category
+
+
+@pytest.fixture(scope="function")
+def created(user: User) -> Category:
+    category = Category(name="Groceries", user=user)
+    category.key = 2
+
+    return category
+
+
+@pytest.fixture(scope="function")
+def prepare_storage(fake_storage: Storage, mocker, category: Category, created: Category) -> Storage:
+    fake_storage.categories.fetch = mocker.MagicMock(return_value=category_stream(category))
+    fake_storage.categories.save_many_by_name = mocker.MagicMock(return_value=category_stream(created))
+
+    return fake_storage
+
+
+@pytest.mark.unit
+async def test_create_missing_names(
+    prepare_storage: Storage, logger: Logger, user: User, category: Category, created: Category
+) -> None:
+    filters = CategoryFilters(user=user, keys=[category.key], names=[category.name, created.name])
+
+    service = CategoryService(prepare_storage, logger)
+    result = [item async for item in service.get_or_create(filters)]
+
+    assert result == [category, created]
+    prepare_storage.categories.save_many_by_name.assert_called_once_with(user, {created.name})
+    prepare_storage.categories.save.assert_not_called()
+
+
+@pytest.mark.unit
+async def test_missing_keys(prepare_storage: Storage, logger: Logger, user: User, category: Category) -> None:
+    filters = CategoryFilters(user=user, keys=[category.key, 42])
+
+    service = CategoryService(prepare_storage, logger)
+
+    with pytest.raises(CategoriesNotFound):
+        [item async for item in service.get_or_create(filters)]
+
+    prepare_storage.categories.save_many_by_name.assert_not_called()
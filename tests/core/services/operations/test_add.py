@@ -1,5 +1,4 @@
 from datetime import datetime
-from decimal import Decimal
 from logging import Logger
 from typing import Callable
 
@@ -7,7 +6,8 @@ import pytest
 from faker import Faker
 from passport.domain import User
 
-from wallet.core.entities import Account, Category, Operation, OperationPayload, OperationType
+from wallet.core.entities import Account, Category, Operation, OperationPayload, OperationType, Tag
+from wallet.core.exceptions import TagsNotFound
 from wallet.core.services.operations import OperationService
 from wallet.core.storage import Storage
 
@@ -35,7 +35,7 @@ def payload_builder(user: User):
     def builder(account: Account, category: Category, created_on: datetime) -> OperationPayload:
         return OperationPayload(
             user=user,
-            amount=Decimal("199.90"),
+            amount=19990,
             account=account.key,
             category=category.key,
             operation_type=OperationType.expense,
@@ -61,7 +61,7 @@ async def test_success(
     operation = await service.add(payload=payload_builder(account, category, created_on))
 
     expected = Operation(
-        amount=Decimal("199.90"),
+        amount=19990,
         description="",
         user=user,
         account=account,
@@ -72,3 +72,34 @@ async def test_success(
     expected.created_on = created_on
 
     assert operation == expected
+
+
+async def tag_stream(*tags: Tag):
+    for tag in tags:
+        yield tag
+
+
+@pytest.mark.unit
+async def test_missing_tags(
+    faker: Faker,
+    prepare_storage: StorageBuilder,
+    logger: Logger,
+    payload_builder: PayloadBuilder,
+    user: User,
+    account: Account,
+    category: Category,
+) -> None:
+    tag = Tag(name="Trip", user=user)
+    tag.key = 1
+
+    storage = prepare_storage(account, category)
+    storage.tags.fetch = lambda filters: tag_stream(tag)
+    service = OperationService(storage, logger)
+
+    payload = payload_builder(account, category, faker.date_time_between())
+    payload.tags = [1, 2]
+
+    with pytest.raises(TagsNotFound):
+        await service.add(payload=payload)
+
+    storage.operations.save.assert_not_called()
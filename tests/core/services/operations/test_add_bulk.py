@@ -0,0 +1,122 @@
+from logging import Logger
+
+import pytest
+from passport.domain import User
+
+from wallet.core.entities import (
+    Account,
+    AccountStream,
+    BulkOperationsPayload,
+    Category,
+    CategoryStream,
+    OperationPayload,
+    OperationType,
+)
+from wallet.core.services.operations import OperationService
+from wallet.core.storage import Storage
+
+
+async def account_stream(account: Account) -> AccountStream:
+    yield account
+
+
+async def category_stream(category: Category) -> CategoryStream:
+    yield category
+
+
+@pytest.fixture(scope="function")
+def prepare_storage(fake_storage: Storage, mocker) -> Storage:
+    async def save_many(operations):
+        return list(range(1, len(operations) + 1))
+
+    fake_storage.operations.save_many = mocker.MagicMock(side_effect=save_many)
+    fake_storage.operations.copy_many = mocker.MagicMock(side_effect=save_many)
+
+    return fake_storage
+
+
+@pytest.mark.unit
+async def test_update_balance(
+    prepare_storage: Storage, logger: Logger, user: User, account: Account, category: Category, today, month,
+) -> None:
+    operations = [
+        OperationPayload(
+            user=user,
+            amount=10000,
+            account=account.key,
+            category=category.key,
+            operation_type=OperationType.expense,
+            created_on=today.subtract(months=1),
+        ),
+        OperationPayload(
+            user=user,
+            amount=30000,
+            account=account.key,
+            category=category.name,
+            operation_type=OperationType.income,
+            created_on=today,
+        ),
+        OperationPayload(
+            user=user,
+            amount=5000,
+            account=account.key,
+            category=category.key,
+            operation_type=OperationType.expense,
+            created_on=today,
+        ),
+    ]
+    payload = BulkOperationsPayload(
+        user=user,
+        account_keys={account.key},
+        category_keys={category.key},
+        category_names={category.name},
+        operations=operations,
+    )
+
+    service = OperationService(prepare_storage, logger)
+    stream = service.add_bulk(payload, account_stream(account), category_stream(category))
+    result = [operation async for operation in stream]
+
+    assert [operation.key for operation in result] == [1, 2, 3]
+    prepare_storage.operations.save_many.assert_called_once()
+    prepare_storage.operations.save.assert_not_called()
+
+    for entity in (account, category):
+        assert entity.balance[month.subtract(months=1)].expenses == 10000
+        assert entity.balance[month].incomes == 30000
+        assert entity.balance[month].expenses == 5000
+        assert entity.balance[month].rest == 15000
+
+
+@pytest.mark.unit
+async def test_large_import_uses_copy(
+    prepare_storage: Storage, logger: Logger, user: User, account: Account, category: Category, today,
+) -> None:
+    operations = [
+        OperationPayload(
+            user=user,
+            amount=100,
+            account=account.key,
+            category=category.key,
+            operation_type=OperationType.expense,
+            created_on=today,
+        )
+        for _ in range(3)
+    ]
+    payload = BulkOperationsPayload(
+        user=user,
+        account_keys={account.key},
+        category_keys={category.key},
+        category_names=set(),
+        operations=operations,
+    )
+
+    service = OperationService(prepare_storage, logger)
+    service.copy_threshold = 3
+
+    stream = service.add_bulk(payload, account_stream(account), category_stream(category))
+    result = [operation async for operation in stream]
+
+    assert [operation.key for operation in result] == [1, 2, 3]
+    prepare_storage.operations.copy_many.assert_called_once()
+    prepare_storage.operations.save_many.assert_not_called()
@@ -0,0 +1,74 @@
+from logging import Logger
+
+import pytest
+from passport.domain import User
+
+from wallet.core.entities import Account, Category, Operation, OperationDependencies, OperationFilters, Tag
+from wallet.core.services.operations import OperationService
+from wallet.core.storage import Storage
+
+
+async def stream(*items):
+    for item in items:
+        yield item
+
+
+@pytest.fixture(scope="function")
+def operation(user: User, account: Account, category: Category, today) -> Operation:
+    operation = Operation(amount=19990, description="", user=user, account=account, category=category)
+    operation.key = 1
+    operation.created_on = today
+
+    return operation
+
+
+@pytest.mark.unit
+async def test_find(fake_storage: Storage, logger: Logger, user: User, operation: Operation) -> None:
+    fake_storage.operations.fetch_detailed = lambda filters: stream(operation)
+
+    service = OperationService(fake_storage, logger)
+    result = [item async for item in service.find(OperationFilters(user=user))]
+
+    assert result == [operation]
+    fake_storage.operations.fetch.assert_not_called()
+
+
+@pytest.mark.unit
+async def test_find_with_tags(
+    fake_storage: Storage, fake_coroutine, logger: Logger, user: User, operation: Operation
+) -> None:
+    tag = Tag(name="Travel", user=user)
+    tag.key = 1
+
+    untagged = Operation(amount=100, description="", user=user)
+    untagged.key = 2
+    untagged.created_on = operation.created_on
+
+    fake_storage.operations.fetch_detailed = lambda filters: stream(operation, untagged)
+    fake_storage.tags.fetch_for_operations = fake_coroutine({operation.key: [tag]})
+
+    service = OperationService(fake_storage, logger)
+    service.tags_page_size = 10
+    result = [item async for item in service.find(OperationFilters(user=user), with_tags=True)]
+
+    assert [item.tags for item in result] == [[tag], []]
+    fake_storage.tags.fetch_for_operations.assert_called_once_with(user, [operation.key, untagged.key])
+
+
+@pytest.mark.unit
+async def test_find_with_lookups(
+    fake_storage: Storage, logger: Logger, user: User, account: Account, category: Category, operation: Operation,
+) -> None:
+    detached = Operation(amount=operation.amount, description="", user=user)
+    detached.key = operation.key
+    detached.created_on = operation.created_on
+
+    dependencies = OperationDependencies(account=account.key, category=category.key)
+    fake_storage.operations.fetch = lambda filters: stream((detached, dependencies))
+    fake_storage.accounts.fetch = lambda filters: stream(account)
+    fake_storage.categories.fetch = lambda filters: stream(category)
+
+    service = OperationService(fake_storage, logger)
+    result = [item async for item in service.find_with_lookups(OperationFilters(user=user))]
+
+    assert result == [operation]
@@ -0,0 +1,87 @@
+import pytest
+
+from wallet.core.analytics import BalanceEngine
+from wallet.core.entities import Category, EntityWithBalance, Operation, OperationType, Tag
+
+
+@pytest.fixture
+def tag(faker, user) -> Tag:
+    tag = Tag(name=faker.word(), user=user)
+    tag.key = 7
+
+    return tag
+
+
+@pytest.fixture
+def operations(faker, today, user, account, category, tag):
+    other = Category(name=faker.job(), user=user)
+    other.key = 2
+
+    result = []
+    for month_offset, amount, operation_type, operation_category, tags in (
+        (-14, 15050, OperationType.income, category, []),
+        (-3, 2010, OperationType.expense, other, [tag]),
+        (-3, 9999, OperationType.expense, category, [tag]),
+        (0, 100000, OperationType.income, other, []),
+    ):
+        operation = Operation(
+            amount=amount,
+            description="",
+            user=user,
+            account=account,
+            category=operation_category,
+            operation_type=operation_type,
+            tags=tags,
+        )
+        operation.created_on = today.add(months=month_offset)
+
+        result.append(operation)
+
+    return result
+
+
+def expected_balance(operations, key, attr):
+    expected = EntityWithBalance()
+    expected.apply_operations(
+        (operation.amount, operation.operation_type, operation.created_on)
+        for operation in operations
+        if any(item.key == key for item in attr(operation))
+    )
+
+    return expected.balance
+
+
+@pytest.mark.unit
+def test_accounts_balance(operations, account):
+    matrix = BalanceEngine(operations).accounts_balance()
+
+    assert matrix.balance(account.key) == expected_balance(operations, account.key, lambda op: [op.account])
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("key", [1, 2])
+def test_categories_balance(operations, key):
+    matrix = BalanceEngine(operations).categories_balance()
+
+    assert matrix.balance(key) == expected_balance(operations, key, lambda op: [op.category])
+
+
+@pytest.mark.unit
+def test_tags_balance(operations, tag):
+    matrix = BalanceEngine(operations).tags_balance()
+
+    assert matrix.balance(tag.key) == expected_balance(operations, tag.key, lambda op: op.tags)
+
+
+@pytest.mark.unit
+def test_apply_balance(operations, account, month):
+    BalanceEngine(operations).accounts_balance().apply(account)
+
+    assert account.balance[month].rest == 103041
+
+
+@pytest.mark.unit
+def test_empty_engine():
+    matrix = BalanceEngine([]).accounts_balance()
+
+    assert 1 not in matrix
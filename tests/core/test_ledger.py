@@ -0,0 +1,59 @@
+import pytest
+
+from wallet.core.ledger import MonthLedger
+from wallet.core.tools import month_ordinal
+
+
+@pytest.fixture
+def current(month) -> int:
+    return month_ordinal(month)
+
+
+@pytest.mark.unit
+def test_empty_ledger(current):
+    ledger = MonthLedger()
+
+    assert not ledger
+    assert ledger.rest(current) == 0
+    assert list(ledger.months(until=current)) == []
+
+
+@pytest.mark.unit
+def test_rest_on_demand(current):
+    ledger = MonthLedger()
+    ledger.register(current, expenses=20000)
+    ledger.register(current - 1, incomes=50000)
+    ledger.register(current - 3, expenses=10000)
+
+    assert ledger.rest(current - 4) == 0
+    assert ledger.rest(current - 3) == -10000
+    assert ledger.rest(current - 2) == -10000
+    assert ledger.rest(current - 1) == 40000
+    assert ledger.rest(current) == 20000
+    assert ledger.rest(current + 12) == 20000
+
+
+@pytest.mark.unit
+def test_grow_in_both_directions(current):
+    ledger = MonthLedger(opening=5000)
+    ledger.register(current, incomes=1000)
+    ledger.register(current + 24, incomes=1000)
+    ledger.register(current - 120, expenses=3000)
+
+    assert ledger.first == current - 120
+    assert ledger.last == current + 24
+    assert ledger.rest(current - 1) == 2000
+    assert ledger.rest(current + 24) == 4000
+
+
+@pytest.mark.unit
+def test_months_until(current):
+    ledger = MonthLedger()
+    ledger.register(current - 2, incomes=10000)
+    ledger.register(current - 2, expenses=2000)
+
+    assert list(ledger.months(until=current)) == [
+        (current - 2, 10000, 2000, 8000),
+        (current - 1, 0, 0, 8000),
+        (current, 0, 0, 8000),
+    ]
@@ -1,7 +1,19 @@
-import pytest
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
 
+import pytest
 
-from wallet.core.tools import month_range
+from wallet.core.tools import (
+    month_ordinal,
+    month_range,
+    month_start,
+    ordinal_month,
+    paginate,
+    slotted,
+    to_cents,
+    to_decimal,
+)
 
 
 @pytest.fixture
@@ -53,3 +65,80 @@ def test_wrong_month_range(today):
 
     with pytest.raises(ValueError):
         list(month_range(start=start, to=to))
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        (date(2020, 1, 31), date(2020, 1, 1)),
+        (datetime(2019, 12, 31, 23, 59), date(2019, 12, 1)),
+        (date(2020, 2, 29), date(2020, 2, 1)),
+    ],
+)
+def test_month_start(value, expected):
+    assert month_start(value) == expected
+
+
+@pytest.mark.unit
+def test_month_ordinal_roundtrip():
+    start = month_ordinal(date(2019, 11, 15))
+
+    assert [ordinal_month(ordinal) for ordinal in range(start, start + 4)] == [
+        date(2019, 11, 1),
+        date(2019, 12, 1),
+        date(2020, 1, 1),
+        date(2020, 2, 1),
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "value,expected",
+    [(Decimal("199.90"), 19990), (Decimal("-0.05"), -5), (Decimal("10"), 1000), (Decimal("0.005"), 1)],
+)
+def test_to_cents(value, expected):
+    assert to_cents(value) == expected
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("value,expected", [(19990, Decimal("199.90")), (-5, Decimal("-0.05")), (0, Decimal("0"))])
+def test_to_decimal(value, expected):
+    assert to_decimal(value) == expected
+
+
+@slotted
+@dataclass
+class Base:
+    key: int = field(default=0, init=False)
+
+
+@slotted
+@dataclass
+class Child(Base):
+    name: str
+    items: list = field(default_factory=list)
+
+
+@pytest.mark.unit
+def test_slotted():
+    child = Child(name="foo")
+
+    assert not hasattr(child, "__dict__")
+    assert child.key == 0 and child.items == []
+    assert child == Child(name="foo")
+
+    with pytest.raises(AttributeError):
+        child.unknown = 1
+
+
+async def numbers(count: int):
+    for number in range(count):
+        yield number
+
+
+@pytest.mark.unit
+async def test_paginate():
+    pages = [page async for page in paginate(numbers(5), 2)]
+
+    assert pages == [[0, 1], [2, 3], [4]]
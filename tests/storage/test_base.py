@@ -0,0 +1,90 @@
+import pytest
+import sqlalchemy  # type: ignore
+from databases.backends.postgres import PostgresBackend
+
+from wallet.core.entities import OperationType
+from wallet.storage.base import any_of, cents, CompiledQuery, Statement
+from wallet.storage.operations import operations
+
+
+@pytest.fixture(scope="module")
+def dialect():
+    return PostgresBackend("postgresql://localhost/wallet")._dialect
+
+
+@pytest.fixture(scope="module")
+def statement(dialect) -> Statement:
+    query = (
+        sqlalchemy.select([operations.c.id, operations.c.type])
+        .where(
+            sqlalchemy.and_(
+                operations.c.user == sqlalchemy.bindparam("user"),
+                operations.c.type == sqlalchemy.bindparam("type"),
+                any_of(operations.c.account_id, "accounts"),
+            )
+        )
+        .limit(sqlalchemy.bindparam("limit", type_=sqlalchemy.Integer))
+    )
+
+    return Statement(query, dialect)
+
+
+@pytest.mark.unit
+def test_positional_sql(statement: Statement) -> None:
+    assert "%(" not in statement.sql
+    assert "operations.account_id = any($1)" in statement.sql
+
+
+@pytest.mark.unit
+def test_bind_named_values(statement: Statement) -> None:
+    args = statement.args({"user": 1, "accounts": [1, 2], "limit": 10, "type": OperationType.income})
+
+    assert args == [[1, 2], 10, "income", 1]
+
+
+@pytest.mark.unit
+def test_require_named_values(statement: Statement) -> None:
+    with pytest.raises(KeyError):
+        statement.args({"user": 1})
+
+
+@pytest.mark.unit
+def test_process_result_columns(statement: Statement) -> None:
+    row = statement.process({"id": 1, "type": "expense"})
+
+    assert row == {"id": 1, "type": OperationType.expense}
+
+
+@pytest.mark.unit
+def test_reject_anonymous_values(dialect) -> None:
+    query = sqlalchemy.select([operations.c.id]).where(operations.c.type == OperationType.income)
+
+    with pytest.raises(ValueError):
+        Statement(query, dialect)
+
+
+@pytest.mark.unit
+def test_constants_rendered_inline(dialect) -> None:
+    statement = Statement(sqlalchemy.select([cents(operations.c.amount).label("amount")]), dialect)
+
+    assert "* 100" in statement.sql
+    assert statement.args({}) == []
+
+
+@pytest.mark.unit
+def test_compiler_internals(dialect) -> None:
+    """Processors are taken from private compiler API, which is only known to work on SQLAlchemy 1.3."""
+    assert sqlalchemy.__version__.startswith("1.3.")
+
+    query = sqlalchemy.select([operations.c.type]).where(
+        sqlalchemy.and_(operations.c.type == sqlalchemy.bindparam("type"), any_of(operations.c.id, "keys"))
+    )
+    compiled = CompiledQuery(query, dialect)
+
+    binds = {name: processor for name, _, processor in compiled.binds()}
+    assert list(binds) == ["keys", "type"]
+    assert binds["type"](OperationType.income) == "income"
+
+    [(name, processor)] = compiled.columns()
+    assert name == "type"
+    assert processor("expense") == OperationType.expense
@@ -0,0 +1,148 @@
+from datetime import date, datetime
+from typing import Tuple
+
+import pytest
+from passport.domain import User
+from prometheus_client import CollectorRegistry, Counter  # type: ignore
+
+from wallet.core.entities import Account, AccountFilters, Category, OperationType, Tag
+from wallet.storage.cache import CacheConfig, CachedRepo, StorageCache
+from wallet.storage.loader import Loader
+
+
+async def account_stream(*accounts: Account):
+    for account in accounts:
+        yield account
+
+
+@pytest.fixture(scope="function")
+def cache_config() -> CacheConfig:
+    cache_config = CacheConfig()
+    cache_config.size = 2
+    cache_config.ttl = 60
+
+    return cache_config
+
+
+@pytest.fixture(scope="function")
+def registry() -> CollectorRegistry:
+    return CollectorRegistry()
+
+
+@pytest.fixture(scope="function")
+def counters(registry: CollectorRegistry) -> Tuple[Counter, Counter]:
+    return (
+        Counter("wallet_storage_cache_hits", "Hits", ["repo"], registry=registry),
+        Counter("wallet_storage_cache_misses", "Misses", ["repo"], registry=registry),
+    )
+
+
+@pytest.fixture(scope="function")
+def account(user: User) -> Account:
+    account = Account(name="Cash", user=user)
+    account.key = 1
+
+    return account
+
+
+@pytest.fixture(scope="function")
+def fetch_many(account: Account):
+    async def fetch_many(user, keys):
+        return [account]
+
+    return fetch_many
+
+
+@pytest.fixture(scope="function")
+def repo(mocker, fetch_many, account: Account):
+    async def save(entity):
+        return 2
+
+    repo = mocker.MagicMock()
+    # Loader lives as long as repository, which is created for every request.
+    repo._loader = Loader(fetch_many)
+    repo.fetch_by_key = mocker.MagicMock(side_effect=lambda user, key: repo._loader.load(user, key))
+    repo.fetch = mocker.MagicMock(side_effect=lambda filters: account_stream(account))
+    repo.save = mocker.MagicMock(side_effect=save)
+
+    return repo
+
+
+def sample(registry: CollectorRegistry, name: str) -> float:
+    return registry.get_sample_value(f"wallet_storage_cache_{name}_total", {"repo": "accounts"})
+
+
+@pytest.mark.unit
+async def test_read_through(cache_config, registry, counters, fetch_many, repo, user: User, account: Account) -> None:
+    cache = StorageCache(cache_config, *counters).accounts
+
+    first = await CachedRepo(repo, cache, repo._loader).fetch_by_key(user, account.key)
+    second = await CachedRepo(repo, cache, Loader(fetch_many)).fetch_by_key(user, account.key)
+
+    assert first == second == account
+    assert second is not account
+    repo.fetch_by_key.assert_called_once()
+    assert sample(registry, "hits") == 1
+    assert sample(registry, "misses") == 1
+
+
+@pytest.mark.unit
+async def test_fetch_by_keys(cache_config, counters, repo, user: User, account: Account) -> None:
+    cached = CachedRepo(repo, StorageCache(cache_config, *counters).accounts, repo._loader)
+    filters = AccountFilters(user=user, keys=[account.key])
+
+    assert [item async for item in cached.fetch(filters)] == [account]
+    assert [item async for item in cached.fetch(filters)] == [account]
+    repo.fetch.assert_called_once()
+
+
+@pytest.mark.unit
+async def test_invalidate_on_save(cache_config, counters, repo, user: User, account: Account) -> None:
+    cached = CachedRepo(repo, StorageCache(cache_config, *counters).accounts, repo._loader)
+
+    await cached.fetch_by_key(user, account.key)
+    await cached.save(Account(name="Card", user=user))
+    await cached.fetch_by_key(user, account.key)
+
+    assert repo.fetch_by_key.call_count == 2
+
+
+@pytest.mark.unit
+def test_copies_do_not_share_state(cache_config, counters, user: User) -> None:
+    cache = StorageCache(cache_config, *counters).categories
+
+    category = Category(name="Food", user=user, tags=[Tag(name="Trip", user=user)])
+    category.key = 1
+    category.add_operation(1000, OperationType.expense, datetime(2020, 1, 10))
+    cache.put(user, category)
+    category.tags.append(Tag(name="Work", user=user))
+
+    cached = cache.get(user, category.key)
+    cached.tags[0].name = "Home"
+    cached.add_operation(500, OperationType.expense, datetime(2020, 1, 20))
+
+    fresh = cache.get(user, category.key)
+    assert [tag.name for tag in fresh.tags] == ["Trip"]
+    assert fresh.rest(date(2020, 1, 1)) == -1000
+    assert cached.user is user
+
+
+@pytest.mark.unit
+async def test_one_instance_per_storage(cache_config, counters, fetch_many, repo, user: User, account: Account) -> None:
+    cache = StorageCache(cache_config, *counters).accounts
+    await CachedRepo(repo, cache, repo._loader).fetch_by_key(user, account.key)
+
+    # Next request hits cache on every lookup.
+    loader = Loader(fetch_many)
+    cached = CachedRepo(repo, cache, loader)
+
+    first = await cached.fetch_by_key(user, account.key)
+    second = await cached.fetch_by_key(user, account.key)
+    listed = [item async for item in cached.fetch(AccountFilters(user=user, keys=[account.key]))]
+    loaded = await loader.load(user, account.key)
+
+    first.add_operation(1000, OperationType.expense, datetime(2020, 1, 10))
+
+    assert first is second is listed[0] is loaded
+    assert second.rest(date(2020, 1, 1)) == -1000
+    repo.fetch_by_key.assert_called_once()
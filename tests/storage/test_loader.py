@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+from aiohttp_micro.core.exceptions import EntityNotFound
+from passport.domain import User
+
+from wallet.core.entities import Account
+from wallet.storage.loader import Loader
+
+
+@pytest.fixture(scope="function")
+def fetch_many(mocker):
+    async def fetch(user: User, keys):
+        result = []
+        for key in keys:
+            if key < 100:
+                account = Account(name=f"account {key}", user=user)
+                account.key = key
+                result.append(account)
+
+        return result
+
+    return mocker.MagicMock(side_effect=fetch)
+
+
+@pytest.mark.unit
+async def test_coalesce_same_tick(user: User, fetch_many) -> None:
+    loader = Loader(fetch_many)
+
+    first, second, again = await asyncio.gather(loader.load(user, 1), loader.load(user, 2), loader.load(user, 1))
+
+    assert (first.key, second.key) == (1, 2)
+    assert first is again
+    fetch_many.assert_called_once_with(user, [1, 2])
+
+
+@pytest.mark.unit
+async def test_identity_map(user: User, fetch_many) -> None:
+    account = Account(name="account", user=user)
+    account.key = 1
+
+    loader = Loader(fetch_many)
+
+    assert loader.prime(user, account) is account
+    assert await loader.load(user, account.key) is account
+    fetch_many.assert_not_called()
+
+    loader.forget(user, account.key)
+    assert await loader.load(user, account.key) is not account
+
+
+@pytest.mark.unit
+async def test_missing_key(user: User, fetch_many) -> None:
+    loader = Loader(fetch_many)
+
+    with pytest.raises(EntityNotFound):
+        await loader.load(user, 100)
+
+
+@pytest.mark.unit
+async def test_hold_batch_tasks(user: User, fetch_many) -> None:
+    fetched = asyncio.Event()
+
+    async def fetch(user: User, keys):
+        await fetched.wait()
+
+        return await fetch_many(user, keys)
+
+    loader = Loader(fetch)
+
+    load = asyncio.ensure_future(loader.load(user, 1))
+    while not loader._tasks:
+        await asyncio.sleep(0)
+
+    fetched.set()
+    await load
+
+    assert not loader._tasks
+
+
+@pytest.mark.unit
+async def test_cancelled_batch(user: User, mocker) -> None:
+    loader = Loader(mocker.MagicMock(side_effect=asyncio.CancelledError))
+
+    with pytest.raises(asyncio.CancelledError):
+        await loader.load(user, 1)
@@ -0,0 +1,131 @@
+from datetime import date, datetime
+from logging import Logger
+
+import pytest
+from aiohttp_micro.core.exceptions import EntityNotFound
+from passport.domain import User
+
+from wallet.core.entities import (
+    Account,
+    Balance,
+    BalanceFilters,
+    BalanceKind,
+    Category,
+    CategoryFilters,
+    Operation,
+    OperationCursor,
+    OperationFilters,
+    OperationPayload,
+    OperationType,
+    Tag,
+)
+from wallet.core.services.categories import CategoryService
+from wallet.core.services.operations import OperationService
+from wallet.storage.memory import MemoryStorage
+
+
+@pytest.fixture(scope="function")
+async def storage(user: User) -> MemoryStorage:
+    storage = MemoryStorage()
+
+    await storage.accounts.save(Account(name="Cash", user=user))
+    await storage.categories.save(Category(name="Food", user=user))
+    await storage.tags.save(Tag(name="Trip", user=user))
+
+    return storage
+
+
+async def add(
+    storage: MemoryStorage, user: User, amount: int, created_on: datetime, operation_type=OperationType.expense
+) -> int:
+    operation = Operation(
+        amount=amount,
+        description="",
+        user=user,
+        account=await storage.accounts.fetch_by_key(user, 1),
+        category=await storage.categories.fetch_by_key(user, 1),
+        operation_type=operation_type,
+    )
+    operation.created_on = created_on
+
+    return await storage.operations.save(operation)
+
+
+@pytest.mark.unit
+async def test_fetch_pages(storage: MemoryStorage, user: User) -> None:
+    for day in range(1, 6):
+        await add(storage, user, 1000, datetime(2020, 1, day))
+    await add(storage, user, 1000, datetime(2020, 2, 1))
+
+    filters = OperationFilters(user=user, month=date(2020, 1, 10), limit=2)
+    first = [operation.key async for operation in storage.operations.fetch_detailed(filters)]
+
+    filters.cursor = OperationCursor(created_on=datetime(2020, 1, 4), key=first[-1])
+    second = [operation.key async for operation in storage.operations.fetch_detailed(filters)]
+
+    assert first == [5, 4]
+    assert second == [3, 2]
+
+
+@pytest.mark.unit
+async def test_balance_follows_removal(storage: MemoryStorage, user: User) -> None:
+    await add(storage, user, 30000, datetime(2020, 1, 10), OperationType.income)
+    key = await add(storage, user, 5000, datetime(2020, 2, 10))
+    await add(storage, user, 1000, datetime(2020, 3, 10))
+
+    await storage.operations.remove(await storage.operations.fetch_by_key(user, key))
+
+    filters = BalanceFilters(user=user, keys=[1], kind=BalanceKind.category, end=date(2020, 3, 1))
+    balances = [balance async for _, balance in storage.operations.fetch_balance(filters)]
+    stored = [balance async for balance in storage.balances.fetch(BalanceFilters(**{**vars(filters), "start": None}))]
+
+    assert balances == [
+        Balance(month=date(2020, 1, 1), incomes=30000, rest=30000),
+        Balance(month=date(2020, 2, 1), rest=30000),
+        Balance(month=date(2020, 3, 1), expenses=1000, rest=29000),
+    ]
+    assert stored == balances[-1:]
+
+
+@pytest.mark.unit
+async def test_remove_is_soft(storage: MemoryStorage, user: User) -> None:
+    account = await storage.accounts.fetch_by_key(user, 1)
+    await add(storage, user, 1000, datetime(2020, 1, 1))
+
+    assert await storage.accounts.remove(account)
+    assert not await storage.accounts.remove(account)
+
+    with pytest.raises(EntityNotFound):
+        await storage.accounts.fetch_by_key(user, account.key)
+
+    # Operations keep their removed account.
+    operations = [operation async for operation in storage.operations.fetch_detailed(OperationFilters(user=user))]
+    assert operations[0].account.name == "Cash"
+
+
+@pytest.mark.unit
+async def test_services(storage: MemoryStorage, logger: Logger, user: User) -> None:
+    categories = CategoryService(storage, logger)
+    found = [
+        category.name
+        async for category in categories.get_or_create(CategoryFilters(user=user, names=["Food", "Rent"]))
+    ]
+
+    operations = OperationService(storage, logger)
+    await operations.add(
+        OperationPayload(
+            user=user,
+            amount=19990,
+            account=1,
+            category=1,
+            operation_type=OperationType.expense,
+            created_on=datetime(2020, 1, 1),
+            tags=[1],
+        )
+    )
+    operation = [operation async for operation in operations.find(OperationFilters(user=user), with_tags=True)][0]
+
+    assert sorted(found) == ["Food", "Rent"]
+    assert await storage.categories.exists(CategoryFilters(user=user, name="Rent"))
+    assert [tag.name for tag in operation.tags] == ["Trip"]
+    assert operation.category.name == "Food"
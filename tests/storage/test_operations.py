@@ -0,0 +1,172 @@
+from datetime import date, datetime
+
+import pytest
+from databases.backends.postgres import PostgresBackend
+from passport.domain import User
+
+from wallet.core.entities import (
+    Account,
+    Balance,
+    BalanceFilters,
+    BalanceKind,
+    Category,
+    Operation,
+    OperationFilters,
+    OperationType,
+)
+from wallet.storage import DBStorage
+from wallet.storage.operations import OperationDBRepo
+
+
+@pytest.fixture(scope="function")
+def repo(mocker) -> OperationDBRepo:
+    database = mocker.MagicMock()
+    database._backend._dialect = PostgresBackend("postgresql://localhost/wallet")._dialect
+
+    return OperationDBRepo(database=database, raw_records=True)
+
+
+@pytest.mark.unit
+def test_record_matches_row(repo: OperationDBRepo, user: User) -> None:
+    statement = repo._prepare("fetch_detailed", repo._get_detailed_query)
+    record = (1, 12050, "expense", "Coffee", 2, 3, datetime(2020, 1, 15, 10, 30), "Cash", "Food")
+
+    from_record = repo._process_record(record, user=user)
+    from_row = repo._process_row(statement.process(dict(enumerate(record))), user=user)
+
+    assert from_record == from_row
+    assert from_record.operation_type == OperationType.expense
+    assert from_record.amount == 12050
+
+
+@pytest.mark.unit
+def test_record_positions(repo: OperationDBRepo) -> None:
+    statement = repo._prepare("fetch_detailed", repo._get_detailed_query)
+
+    assert [name for name, _ in statement._columns] == [
+        "id",
+        "amount",
+        "type",
+        "desc",
+        "account_id",
+        "category_id",
+        "created_on",
+        "account_name",
+        "category_name",
+    ]
+
+
+@pytest.mark.unit
+async def test_save_without_category(mocker, repo: OperationDBRepo, user: User) -> None:
+    database = repo._writer()
+    database.execute = mocker.AsyncMock(return_value=1)
+    repo._balances.register = mocker.AsyncMock()
+
+    account = Account(name="Cash", user=user)
+    account.key = 2
+
+    operation = Operation(amount=12050, description="Coffee", user=user, account=account)
+    operation.created_on = datetime(2020, 1, 15, 10, 30)
+
+    key = await repo.save(operation)
+
+    assert key == 1
+    repo._balances.register.assert_awaited_once_with(
+        user, BalanceKind.account, 2, date(2020, 1, 1), 0, 12050
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("record, expected", (({"1": 1}, True), (None, False)))
+async def test_exists(mocker, repo: OperationDBRepo, user: User, record, expected: bool) -> None:
+    connection = mocker.MagicMock()
+    connection.raw_connection.fetchrow = mocker.AsyncMock(return_value=record)
+    repo._reader.connection.return_value.__aenter__.return_value = connection
+
+    result = await repo.exists(OperationFilters(user=user, account=2, limit=10))
+
+    sql, *args = connection.raw_connection.fetchrow.await_args.args
+    assert result is expected
+    assert sql == (
+        "SELECT 1 \n"
+        "FROM operations \n"
+        "WHERE operations.\"user\" = $3 AND operations.enabled = true AND operations.account_id = $1 \n"
+        " LIMIT $2"
+    )
+    assert args == [2, 1, user.key]
+
+
+@pytest.mark.unit
+async def test_fetch_balance(mocker, repo: OperationDBRepo, user: User) -> None:
+    # Rows as aggregated by database: category 2 has no operations in February.
+    rows = [
+        {"entity_id": 2, "month": date(2019, 12, 1), "incomes": 30000, "expenses": 0, "rest": 30000},
+        {"entity_id": 2, "month": date(2020, 1, 1), "incomes": 0, "expenses": 5000, "rest": 25000},
+        {"entity_id": 2, "month": date(2020, 3, 1), "incomes": 1000, "expenses": 2000, "rest": 24000},
+    ]
+
+    async def iterate(query):
+        for row in rows:
+            yield row
+
+    repo._reader.iterate = mocker.MagicMock(side_effect=iterate)
+
+    filters = BalanceFilters(
+        user=user, keys=[2, 3], kind=BalanceKind.category, start=date(2020, 1, 1), end=date(2020, 3, 15)
+    )
+    balances = [item async for item in repo.fetch_balance(filters)]
+
+    sql = str(repo._reader.iterate.call_args.kwargs["query"].compile(dialect=repo._dialect))
+    assert "GROUP BY operations.category_id, CAST(date_trunc('month', operations.created_on) AS DATE)" in sql
+    assert "sum(monthly.incomes - monthly.expenses) OVER (PARTITION BY monthly.entity_id ORDER BY monthly.month)" in sql
+    repo._reader.iterate.assert_called_once()
+
+    assert balances == [
+        (2, Balance(month=date(2020, 1, 1), expenses=5000, rest=25000)),
+        (2, Balance(month=date(2020, 2, 1), rest=25000)),
+        (2, Balance(month=date(2020, 3, 1), incomes=1000, expenses=2000, rest=24000)),
+        (3, Balance(month=date(2020, 1, 1))),
+        (3, Balance(month=date(2020, 2, 1))),
+        (3, Balance(month=date(2020, 3, 1))),
+    ]
+
+
+@pytest.mark.integration
+async def test_fetch_balance_matches_stored(prepared_app, user: User) -> None:
+    storage = DBStorage(prepared_app["db"])
+
+    account = Account(name="Cash", user=user)
+    account.key = await storage.accounts.save(account)
+    category = Category(name="Food", user=user)
+    category.key = await storage.categories.save(category)
+
+    for amount, operation_type, created_on in (
+        (30000, OperationType.income, datetime(2019, 12, 5)),
+        (5000, OperationType.expense, datetime(2020, 1, 10)),
+        (2550, OperationType.expense, datetime(2020, 1, 20)),
+        (1000, OperationType.income, datetime(2020, 3, 1)),
+    ):
+        operation = Operation(
+            amount=amount,
+            description="",
+            user=user,
+            account=account,
+            category=category,
+            operation_type=operation_type,
+        )
+        operation.created_on = created_on
+        await storage.operations.save(operation)
+
+    filters = BalanceFilters(
+        user=user, keys=[category.key], kind=BalanceKind.category, start=date(2019, 12, 1), end=date(2020, 3, 1)
+    )
+    aggregated = [balance async for _, balance in storage.operations.fetch_balance(filters)]
+    stored = [balance async for balance in storage.balances.fetch(filters)]
+
+    assert aggregated == [
+        Balance(month=date(2019, 12, 1), incomes=30000, rest=30000),
+        Balance(month=date(2020, 1, 1), expenses=7550, rest=22450),
+        Balance(month=date(2020, 2, 1), rest=22450),
+        Balance(month=date(2020, 3, 1), incomes=1000, rest=23450),
+    ]
+    assert stored == aggregated
@@ -0,0 +1,43 @@
+from datetime import date
+
+import pytest
+
+from wallet.storage.partitions import create_partitions, drop_partitions
+
+
+@pytest.fixture(scope="function")
+def database(mocker):
+    database = mocker.AsyncMock()
+    database.transaction = mocker.MagicMock()
+
+    return database
+
+
+@pytest.mark.unit
+async def test_create_partitions(database) -> None:
+    names = await create_partitions(database, date(2020, 11, 20), date(2021, 1, 5))
+
+    assert names == ["operations_y2020m11", "operations_y2020m12", "operations_y2021m01"]
+    database.execute.assert_any_await(
+        "CREATE TABLE IF NOT EXISTS operations_y2020m12 PARTITION OF operations "
+        "FOR VALUES FROM ('2020-12-01') TO ('2021-01-01')"
+    )
+
+
+@pytest.mark.unit
+async def test_drop_partitions(database) -> None:
+    database.fetch_all.return_value = [
+        {"name": "operations_default"},
+        {"name": "operations_y2021m01"},
+        {"name": "operations_y2020m12"},
+        {"name": "operations_y2020m11"},
+    ]
+
+    names = await drop_partitions(database, date(2021, 1, 15))
+
+    assert names == ["operations_y2020m11", "operations_y2020m12"]
+    assert database.execute.await_count == 4
+    database.execute.assert_any_await(
+        "DELETE FROM operation_tags USING operations_y2020m11 "
+        "WHERE operation_tags.operation_id = operations_y2020m11.id"
+    )
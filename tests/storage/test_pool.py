@@ -0,0 +1,112 @@
+import pytest
+from aiohttp import web
+from databases import Database
+from prometheus_client import CollectorRegistry, Histogram  # type: ignore
+
+from wallet.storage.pool import InstrumentedPool, PoolCollector, POOLS, setup, StorageConfig
+
+
+@pytest.fixture(scope="function")
+def registry() -> CollectorRegistry:
+    return CollectorRegistry()
+
+
+@pytest.fixture(scope="function")
+def acquire_seconds(registry: CollectorRegistry) -> Histogram:
+    return Histogram("acquire_seconds", "Acquire time", ["database"], registry=registry)
+
+
+@pytest.fixture(scope="function")
+def pool(mocker):
+    pool = mocker.MagicMock()
+    pool.acquire = mocker.AsyncMock(return_value="connection")
+    pool.release = mocker.AsyncMock()
+    pool.close = mocker.AsyncMock()
+    pool.get_size.return_value = 5
+    pool.get_idle_size.return_value = 2
+
+    return pool
+
+
+@pytest.mark.unit
+async def test_observe_acquire(pool, acquire_seconds: Histogram, registry: CollectorRegistry) -> None:
+    instrumented = InstrumentedPool(pool, acquire_seconds.labels(database="primary"))
+
+    connection = await instrumented.acquire()
+    await instrumented.release(connection)
+
+    assert connection == "connection"
+    assert instrumented.waiting == 0
+    assert registry.get_sample_value("acquire_seconds_count", {"database": "primary"}) == 1
+    pool.release.assert_awaited_once_with("connection", timeout=None)
+
+
+@pytest.mark.unit
+async def test_pass_through(pool, acquire_seconds: Histogram) -> None:
+    instrumented = InstrumentedPool(pool, acquire_seconds.labels(database="primary"))
+
+    await instrumented.close()
+
+    pool.close.assert_awaited_once()
+
+
+@pytest.mark.unit
+def test_collect(pool, acquire_seconds: Histogram, registry: CollectorRegistry) -> None:
+    registry.register(PoolCollector({"primary": InstrumentedPool(pool, acquire_seconds.labels(database="primary"))}))
+
+    labels = {"database": "primary"}
+    assert registry.get_sample_value("wallet_db_pool_size", labels) == 5
+    assert registry.get_sample_value("wallet_db_pool_in_use", labels) == 3
+    assert registry.get_sample_value("wallet_db_pool_idle", labels) == 2
+    assert registry.get_sample_value("wallet_db_pool_waiters", labels) == 0
+
+
+@pytest.fixture(scope="function")
+def storage_config() -> StorageConfig:
+    storage_config = StorageConfig()
+    storage_config.min_pool_size = 2
+    storage_config.max_pool_size = 10
+
+    return storage_config
+
+
+@pytest.mark.unit
+def test_setup_twice(storage_config: StorageConfig) -> None:
+    for _ in range(2):
+        setup(web.Application(), storage_config)
+
+
+@pytest.mark.unit
+async def test_connect_primary(mocker, pool, storage_config: StorageConfig) -> None:
+    async def connect(database: Database) -> None:
+        database._backend._pool = pool
+
+    mocker.patch.object(Database, "connect", autospec=True, side_effect=connect)
+    disconnect = mocker.patch.object(Database, "disconnect", autospec=True)
+
+    app = web.Application()
+    setup(app, storage_config)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+
+    assert app["db"].options == {"min_size": 2, "max_size": 10}
+    assert POOLS["primary"]._pool is pool
+
+    await runner.cleanup()
+
+    disconnect.assert_awaited_once_with(app["db"])
+    assert POOLS == {}
+
+
+@pytest.mark.integration
+async def test_primary_pool_sized_from_config(prepared_app: web.Application) -> None:
+    storage_config = prepared_app["config"].db
+
+    size, _, _ = POOLS["primary"].stats()
+
+    assert prepared_app["db"].options == {
+        "min_size": storage_config.min_pool_size,
+        "max_size": storage_config.max_pool_size,
+    }
+    assert storage_config.min_pool_size <= size <= storage_config.max_pool_size
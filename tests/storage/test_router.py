@@ -0,0 +1,59 @@
+import pytest
+
+from wallet.storage import DBStorage
+from wallet.storage.base import DatabaseRouter
+
+
+@pytest.fixture(scope="function")
+def primary(mocker):
+    return mocker.MagicMock()
+
+
+@pytest.fixture(scope="function")
+def replica(mocker):
+    return mocker.MagicMock()
+
+
+@pytest.mark.unit
+def test_read_from_replica(primary, replica) -> None:
+    router = DatabaseRouter(primary, replica)
+
+    assert router.for_read() is replica
+    assert router.for_write() is primary
+
+
+@pytest.mark.unit
+def test_read_from_primary_after_write(primary, replica) -> None:
+    router = DatabaseRouter(primary, replica)
+
+    router.for_write()
+
+    assert router.for_read() is primary
+
+
+@pytest.mark.unit
+def test_read_from_primary_without_replica(primary) -> None:
+    router = DatabaseRouter(primary)
+
+    assert router.for_read() is primary
+
+
+@pytest.mark.unit
+def test_storage_repos_share_writes(primary, replica) -> None:
+    storage = DBStorage(primary, replica=replica)
+
+    assert storage.accounts._reader is replica
+
+    storage.operations._writer()
+
+    assert storage.accounts._reader is primary
+    assert storage.categories._reader is primary
+
+
+@pytest.mark.unit
+def test_reads_do_not_mark_writes(primary, replica) -> None:
+    storage = DBStorage(primary, replica=replica)
+
+    storage.operations._reader
+
+    assert storage.accounts._reader is replica